@@ -0,0 +1,715 @@
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+import time
+
+import mortality_analysis
+
+# Submodules that run code when imported and are left out of the import checks.
+IMPORT_CHECK_EXCLUDED = {"mortality_analysis.__main__"}
+
+
+def library_modules():
+    """
+    List the package and every submodule that must be importable without I/O or heavy
+    dependencies. Submodules are discovered with `pkgutil`, so new ones are checked too.
+
+    Returns:
+    - modules (list): Dotted module names, the package first.
+    """
+    names = sorted(
+        module.name
+        for module in pkgutil.iter_modules(
+            mortality_analysis.__path__, "mortality_analysis."
+        )
+        if module.name not in IMPORT_CHECK_EXCLUDED
+    )
+    return ["mortality_analysis"] + names
+
+
+LIBRARY_MODULES = library_modules()
+
+# Stages timed by `benchmark_stages`, in pipeline order.
+PIPELINE_STAGES = ("load", "clean", "population", "merge", "prepare", "trends")
+
+# Stored `benchmark_stages` results that later runs are compared against.
+STAGE_BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "stage_baseline.json"
+)
+
+# Dependencies that should only be loaded when a plotting, modeling or
+# download method is first called.
+LAZY_DEPENDENCIES = ["matplotlib", "seaborn", "sklearn", "scipy", "requests"]
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({lazy!r}))
+print(json.dumps({{"seconds": elapsed, "heavy_modules": heavy}}))
+"""
+
+
+def measure_import_time(module):
+    """
+    Measure the cold import time of a module in a fresh interpreter.
+
+    Parameters:
+    - module (str): Dotted module name to import.
+
+    Returns:
+    - result (dict): 'seconds' spent importing and the 'heavy_modules' that were pulled in.
+    """
+    code = _IMPORT_PROBE.format(module=module, lazy=LAZY_DEPENDENCIES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def check_import_budget(budget_seconds=2.0, modules=None):
+    """
+    Assert that every library module imports within the budget and without heavy dependencies.
+
+    Parameters:
+    - budget_seconds (float): Maximum allowed cold import time per module.
+    - modules (list): Modules to check. Defaults to LIBRARY_MODULES.
+
+    Returns:
+    - results (dict): Import measurements keyed by module name.
+
+    Raises:
+    - AssertionError: If a module exceeds the budget or eagerly imports a heavy dependency.
+    """
+    results = {}
+    for module in modules or LIBRARY_MODULES:
+        result = measure_import_time(module)
+        results[module] = result
+        print(f"{module}: {result['seconds']:.3f}s")
+        assert not result["heavy_modules"], (
+            f"{module} eagerly imports {', '.join(result['heavy_modules'])}"
+        )
+        assert result["seconds"] <= budget_seconds, (
+            f"{module} took {result['seconds']:.3f}s to import "
+            f"(budget {budget_seconds:.3f}s)"
+        )
+    return results
+
+
+def _synthetic_weekly_frame(rows, n_jurisdictions=54, seed=0):
+    """
+    Build a cleaned weekly CDC-shaped frame with roughly `rows` rows.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from mortality_analysis.data_cleaning import CAUSE_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    n_weeks = max(1, rows // n_jurisdictions)
+    ending_dates = pd.date_range("2000-01-01", periods=n_weeks, freq="7D")
+    data = pd.DataFrame(
+        {
+            "Jurisdiction": np.repeat(
+                [f"Jurisdiction {i}" for i in range(n_jurisdictions)], n_weeks
+            ),
+            "Ending Date": np.tile(ending_dates.values, n_jurisdictions),
+        }
+    )
+    counts = rng.integers(0, 1000, size=(len(data), len(CAUSE_COLUMNS)))
+    for i, column in enumerate(CAUSE_COLUMNS):
+        data[column] = counts[:, i].astype("float64")
+    data["Quarter"] = data["Ending Date"].dt.to_period("Q")
+    return data
+
+
+def _best_of(fn, repeat):
+    """
+    Run `fn` `repeat` times and return the fastest wall time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _compare_strategies(strategies, data, repeat, **labels):
+    """
+    Time every strategy on the same data and print one line per strategy.
+
+    Parameters:
+    - strategies (dict): Callables taking `data`, keyed by name.
+    - data (pd.DataFrame): Input shared by every strategy.
+    - repeat (int): Timing repetitions; the best time is reported.
+    - labels: Extra keys stored in every result, e.g. 'columns'.
+
+    Returns:
+    - results (list): One dict per strategy with 'rows', the labels, 'strategy',
+      'seconds' and 'rows_per_second'.
+    """
+    results = []
+    rows = len(data)
+    for name, strategy in strategies.items():
+        seconds = _best_of(lambda: strategy(data), repeat)
+        result = {
+            "rows": rows,
+            **labels,
+            "strategy": name,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds,
+        }
+        results.append(result)
+        size = (
+            f"{labels['columns']:>5} columns"
+            if "columns" in labels
+            else f"{rows:>10,} rows"
+        )
+        print(
+            f"{name:>22} {size}: {seconds:.3f}s "
+            f"({result['rows_per_second']:,.0f} rows/s)"
+        )
+    return results
+
+
+def benchmark_quarterly_rollup(sizes=(100_000, 1_000_000, 3_000_000), repeat=3):
+    """
+    Compare rollup strategies on synthetic weekly inputs of increasing size.
+
+    Parameters:
+    - sizes (tuple): Approximate number of weekly rows per run.
+    - repeat (int): Timing repetitions; the best time is reported.
+
+    Returns:
+    - results (list): One dict per (size, strategy) with 'seconds' and 'rows_per_second'.
+    """
+    from mortality_analysis.quarterly_rollup import rollup_quarters
+
+    strategies = {
+        "drop_duplicates": lambda data: data.drop_duplicates(
+            subset=["Jurisdiction", "Quarter"]
+        ),
+        "pandas_groupby_sum": lambda data: data.groupby(
+            ["Jurisdiction", "Quarter"], sort=False
+        ).sum(numeric_only=True),
+        "rollup_sum": lambda data: rollup_quarters(data, how="sum"),
+        "rollup_mean": lambda data: rollup_quarters(data, how="mean"),
+    }
+    results = []
+    for size in sizes:
+        data = _synthetic_weekly_frame(size)
+        results.extend(_compare_strategies(strategies, data, repeat))
+    return results
+
+
+def benchmark_profile(sizes=(100_000, 1_000_000, 3_000_000), repeat=3):
+    """
+    Compare `profile_frame` with the separate passes of the non-profile `Eda` methods.
+
+    Parameters:
+    - sizes (tuple): Approximate number of weekly rows per run.
+    - repeat (int): Timing repetitions; the best time is reported.
+
+    Returns:
+    - results (list): One dict per (size, strategy) with 'seconds' and 'rows_per_second'.
+    """
+    import numpy as np
+
+    from mortality_analysis.profiling import profile_frame
+
+    def separate_passes(data):
+        data.describe()
+        data.isnull().sum()
+        for column in data.select_dtypes(include=[np.number]).columns:
+            np.histogram(data[column].dropna(), bins=20)
+
+    strategies = {
+        "separate_passes": separate_passes,
+        "profile_frame": profile_frame,
+    }
+    results = []
+    for size in sizes:
+        data = _synthetic_weekly_frame(size)
+        results.extend(_compare_strategies(strategies, data, repeat))
+    return results
+
+
+def benchmark_outlier_filter(widths=(15, 100, 500), rows=100_000, repeat=3):
+    """
+    Compare the per-column IQR loop with `OutlierFilter` on frames of increasing width.
+
+    Parameters:
+    - widths (tuple): Number of numeric columns per run.
+    - rows (int): Number of rows per frame.
+    - repeat (int): Timing repetitions; the best time is reported.
+
+    Returns:
+    - results (list): One dict per (width, strategy) with 'seconds' and 'rows_per_second'.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from mortality_analysis.data_preparation import OutlierFilter
+
+    def column_loop(data):
+        # The original handle_outliers: quantiles per column on the shrinking frame
+        for col in data.columns:
+            q1 = data[col].quantile(0.25)
+            q3 = data[col].quantile(0.75)
+            iqr = q3 - q1
+            data = data[~((data[col] < q1 - 1.5 * iqr) | (data[col] > q3 + 1.5 * iqr))]
+        return data
+
+    fitted = {}
+
+    def apply_fitted(data):
+        return fitted[data.shape[1]].transform(data)
+
+    strategies = {
+        "column_loop": column_loop,
+        "filter_fit_transform": lambda data: OutlierFilter().fit_transform(data),
+        "filter_transform_only": apply_fitted,
+    }
+    rng = np.random.default_rng(0)
+    results = []
+    for width in widths:
+        data = pd.DataFrame(
+            rng.normal(size=(rows, width)), columns=[f"c{i}" for i in range(width)]
+        )
+        fitted[width] = OutlierFilter().fit(data)
+        results.extend(_compare_strategies(strategies, data, repeat, columns=width))
+    return results
+
+
+def benchmark_feature_selection(widths=(20, 200, 1000), rows=20_000, repeat=3):
+    """
+    Compare the full correlation matrix with the target-only selection strategies.
+
+    Parameters:
+    - widths (tuple): Number of features per run.
+    - rows (int): Number of rows per frame.
+    - repeat (int): Timing repetitions; the best time is reported.
+
+    Returns:
+    - results (list): One dict per (width, strategy) with 'seconds' and 'rows_per_second'.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from mortality_analysis.data_preparation import feature_scores
+
+    strategies = {
+        "full_corr_matrix": lambda data: data.corr()["target"],
+        "pearson": lambda data: feature_scores(data, "target", "pearson"),
+        "f_regression": lambda data: feature_scores(data, "target", "f_regression"),
+    }
+    rng = np.random.default_rng(0)
+    results = []
+    for width in widths:
+        data = pd.DataFrame(
+            rng.normal(size=(rows, width)), columns=[f"c{i}" for i in range(width)]
+        )
+        data["target"] = data.sum(axis=1) + rng.normal(size=rows)
+        results.extend(_compare_strategies(strategies, data, repeat, columns=width))
+    return results
+
+
+_SCORING_PROBE = """
+import json, time
+start = time.perf_counter()
+import numpy as np
+{load}
+X = np.load({data_path!r})
+predictions = model.predict(X)
+np.save({output_path!r}, predictions)
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+
+def benchmark_tree_scorer(rows=1_000_000, score_rows=10_000, directory=None):
+    """
+    Compare cold-start scoring with the pickled sklearn tree and `ArrayTreeScorer`.
+
+    Each scorer runs in a fresh interpreter that loads the model and scores `score_rows`
+    rows, as a short-lived scoring job would. In-process throughput is measured on
+    `rows` rows, and every prediction is checked to equal sklearn's exactly.
+
+    Parameters:
+    - rows (int): Rows scored for the throughput measurement.
+    - score_rows (int): Rows scored by each cold-start job.
+    - directory (str): Working directory for the exported models. Defaults to a
+      temporary directory.
+
+    Returns:
+    - results (dict): Cold-start and throughput seconds per scorer.
+    """
+    import os
+    import tempfile
+
+    import joblib
+    import numpy as np
+    from sklearn.tree import DecisionTreeRegressor
+
+    from mortality_analysis.tree_scorer import ArrayTreeScorer, export_tree
+
+    directory = directory or tempfile.mkdtemp(prefix="tree_scorer_")
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(rows, 10)).astype(np.float32)
+    y = X[:, 0] * 3 + np.sin(X[:, 1]) + rng.normal(size=rows)
+    model = DecisionTreeRegressor(max_depth=12, random_state=0)
+    model.fit(X[:100_000], y[:100_000])
+
+    sklearn_path = os.path.join(directory, "model.joblib")
+    arrays_path = os.path.join(directory, "arrays")
+    joblib.dump(model, sklearn_path)
+    export_tree(model, [f"f{i}" for i in range(X.shape[1])], arrays_path)
+    data_path = os.path.join(directory, "rows.npy")
+    np.save(data_path, X[:score_rows])
+
+    loaders = {
+        "sklearn": f"import joblib; model = joblib.load({sklearn_path!r})",
+        "array_scorer": (
+            "from mortality_analysis.tree_scorer import ArrayTreeScorer; "
+            f"model = ArrayTreeScorer({arrays_path!r})"
+        ),
+    }
+    expected = model.predict(X)
+    results = {}
+    for name, load in loaders.items():
+        output_path = os.path.join(directory, f"{name}.npy")
+        code = _SCORING_PROBE.format(
+            load=load, data_path=data_path, output_path=output_path
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        cold = json.loads(output.strip().splitlines()[-1])["seconds"]
+        assert np.array_equal(np.load(output_path), expected[:score_rows])
+        results[name] = {"cold_start_seconds": cold}
+
+    scorers = {"sklearn": model, "array_scorer": ArrayTreeScorer(arrays_path)}
+    for name, scorer in scorers.items():
+        start = time.perf_counter()
+        predictions = scorer.predict(X)
+        results[name]["throughput_seconds"] = time.perf_counter() - start
+        assert np.array_equal(predictions, expected)
+        print(
+            f"{name:>14}: cold start {results[name]['cold_start_seconds']:.3f}s, "
+            f"{rows:,} rows in {results[name]['throughput_seconds']:.3f}s"
+        )
+    return results
+
+
+def scale_up(data, factor, noise=0.01, seed=0):
+    """
+    Build a synthetic copy of `data` with `factor` times the rows.
+
+    Rows are repeated and every numeric value is multiplied by 1 + N(0, noise), so the
+    copies are not exact duplicates.
+
+    Parameters:
+    - data (pd.DataFrame): Source data.
+    - factor (int): Row multiplier.
+    - noise (float): Relative standard deviation of the jitter.
+    - seed (int): Random seed.
+
+    Returns:
+    - scaled (pd.DataFrame): The scaled-up copy.
+    """
+    import numpy as np
+    import pandas as pd
+
+    scaled = pd.concat([data] * factor, ignore_index=True)
+    if factor > 1:
+        rng = np.random.default_rng(seed)
+        numeric = scaled.select_dtypes(include=[np.number]).columns
+        jitter = 1 + rng.normal(0, noise, size=(len(scaled), len(numeric)))
+        scaled[numeric] = scaled[numeric].to_numpy(dtype=np.float64) * jitter
+    return scaled
+
+
+def benchmark_models(data=None, backends=None, scales=(1, 10, 100)):
+    """
+    Compare model backends on fit time, predict throughput, peak memory and accuracy.
+
+    Parameters:
+    - data (pd.DataFrame): Numeric modeling data with a 'Total Deaths' column, e.g. the
+      prepared merged data. Defaults to a synthetic weekly frame.
+    - backends (list): Backends from `MODEL_BACKENDS`. Defaults to all of them.
+    - scales (tuple): Row multipliers; each scale runs on a `scale_up` copy of `data`.
+
+    Returns:
+    - results (list): One dict per (scale, backend) with 'rows', 'fit_seconds',
+      'predict_rows_per_second', 'peak_memory_mb', 'mae', 'mse' and 'r2'. Peak memory is
+      measured with tracemalloc, so it covers Python and NumPy allocations but not
+      memory allocated inside compiled estimator code.
+    """
+    import tracemalloc
+
+    import numpy as np
+
+    from mortality_analysis.predictive_model import (
+        MODEL_BACKENDS,
+        PredictiveModel,
+        make_estimator,
+    )
+
+    if data is None:
+        data = _synthetic_weekly_frame(5_000).select_dtypes(include=[np.number])
+    results = []
+    for scale in scales:
+        scaled = scale_up(data, scale)
+        for backend in backends or list(MODEL_BACKENDS):
+            model = PredictiveModel(scaled, backend=backend)
+            model.load_and_prepare_data()
+            model.split_data()
+            # Import the backend first so its modules do not count towards peak memory
+            make_estimator(backend)
+
+            tracemalloc.start()
+            model.build_and_evaluate()
+            start = time.perf_counter()
+            model.predict(model.X_test)
+            predict_seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            result = {
+                "rows": len(scaled),
+                "backend": backend,
+                "fit_seconds": model.fit_seconds,
+                "predict_rows_per_second": len(model.X_test) / predict_seconds,
+                "peak_memory_mb": peak / 2**20,
+                "mae": model.mae,
+                "mse": model.mse,
+                "r2": model.r2,
+            }
+            results.append(result)
+            print(
+                f"{backend:>22} {len(scaled):>10,} rows: fit {model.fit_seconds:.3f}s, "
+                f"{result['predict_rows_per_second']:,.0f} rows/s, "
+                f"peak {result['peak_memory_mb']:.1f} MB, MAE {model.mae:.2f}, "
+                f"R2 {model.r2:.3f}"
+            )
+    return results
+
+
+def _measure_stage(func):
+    """
+    Time one run of `func`, then run it again under tracemalloc for its peak memory.
+
+    Returns:
+    - value: The result of the timed run.
+    - seconds (float): Wall time of the timed run.
+    - peak_memory_mb (float): Peak traced allocation of the second run.
+    """
+    import tracemalloc
+
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, seconds, peak / 2**20
+
+
+def compare_stage_results(results, baseline, tolerance=1.25, min_seconds=0.05):
+    """
+    Compare `benchmark_stages` results with a stored baseline.
+
+    Parameters:
+    - results (dict): Results of the current run.
+    - baseline (dict): Stored results, e.g. loaded from STAGE_BASELINE_PATH.
+    - tolerance (float): Ratio to the baseline above which a time or peak memory counts
+      as a regression.
+    - min_seconds (float): Times below this on both sides are too noisy to flag.
+
+    Returns:
+    - regressions (list): (rows, stage, metric, current, baseline, ratio) tuples for
+      every measurement that grew beyond the tolerance. Scales or stages missing from
+      the baseline are skipped.
+    """
+    regressions = []
+    for rows, stages in results["scales"].items():
+        baseline_stages = baseline.get("scales", {}).get(rows, {})
+        for stage, measured in stages.items():
+            if stage not in baseline_stages:
+                continue
+            for metric in ("seconds", "peak_memory_mb"):
+                reference = baseline_stages[stage][metric]
+                ratio = measured[metric] / reference if reference else float("inf")
+                print(
+                    f"{int(rows):>12,} rows {stage:>10} {metric:>14}: "
+                    f"{measured[metric]:10.3f} vs {reference:10.3f} ({ratio:.2f}x)"
+                )
+                too_short = metric == "seconds" and max(
+                    measured[metric], reference
+                ) < min_seconds
+                if ratio > tolerance and not too_short:
+                    regressions.append(
+                        (rows, stage, metric, measured[metric], reference, ratio)
+                    )
+    return regressions
+
+
+def benchmark_stages(
+    scales=(10_000, 100_000, 1_000_000),
+    baseline_path=STAGE_BASELINE_PATH,
+    update_baseline=False,
+    work_dir=None,
+    seed=0,
+):
+    """
+    Time every pipeline stage and track its peak memory on synthetic data of each scale.
+
+    For each scale, `SyntheticDataset` writes a weekly CDC CSV with that many rows and
+    a matching BEA file; the stages then run in order, each on the previous stage's
+    output: 'load' (`Loaddata.read_cdc_csv`, no Parquet cache), 'clean'
+    (`CDCDataProcessor`), 'population' (`PopulationProvider`), 'merge' (`DataMerge`),
+    'prepare' (`DataPreparation`) and 'trends' (`MortalityTrends`, rendered
+    off-screen). Nothing is downloaded.
+
+    Parameters:
+    - scales (tuple): Numbers of weekly CDC rows, from thousands to tens of millions.
+    - baseline_path (str): JSON file of stored results. If it exists, the run is
+      compared against it with `compare_stage_results`.
+    - update_baseline (bool): Overwrite the stored results with this run. A missing
+      baseline is always written.
+    - work_dir (str): Directory for the generated files. Defaults to a temporary
+      directory that is removed afterwards.
+    - seed (int): Seed of the synthetic data.
+
+    Returns:
+    - results (dict): 'environment' (versions and CPU count) and 'scales', mapping each
+      number of rows to per-stage 'seconds', 'peak_memory_mb' and 'rows_out', plus
+      'generate_seconds' for writing the input files. Peak memory is measured with
+      tracemalloc and covers Python and NumPy allocations, not memory held inside
+      compiled parsers.
+    """
+    import platform
+    import shutil
+    import tempfile
+    import warnings
+
+    import matplotlib
+    import numpy as np
+    import pandas as pd
+
+    from mortality_analysis.data_cleaning import DISEASE_COLUMNS, CDCDataProcessor
+    from mortality_analysis.data_preparation import DataPreparation
+    from mortality_analysis.load_data import Loaddata
+    from mortality_analysis.merge_data import DataMerge
+    from mortality_analysis.population import PopulationProvider
+    from mortality_analysis.synthetic import SyntheticDataset
+    from mortality_analysis.trends_analysis import MortalityTrends
+
+    matplotlib.use("Agg")
+    warnings.filterwarnings("ignore", message=".*non-interactive.*")
+    # Import the plotting stack up front so it is not timed as part of 'trends'
+    import matplotlib.pyplot  # noqa: F401
+    import seaborn  # noqa: F401
+
+    directory = work_dir or tempfile.mkdtemp(prefix="mortality_benchmark_")
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "scales": {},
+    }
+    try:
+        for rows in scales:
+            start = time.perf_counter()
+            cdc_path, population_path = SyntheticDataset(rows, seed=seed).write(
+                directory
+            )
+            generate_seconds = time.perf_counter() - start
+            figure_path = os.path.join(directory, "trends.png")
+
+            outputs = {}
+            stages = {
+                "load": lambda: Loaddata(None, cache_dir=None).read_cdc_csv(cdc_path),
+                "clean": lambda: CDCDataProcessor(outputs["load"]).preprocess_data(),
+                "population": lambda: PopulationProvider(
+                    population_path, cache_dir=None
+                ).to_long_frame(),
+                "merge": lambda: DataMerge(
+                    outputs["clean"], outputs["population"]
+                ).merge_dataframes(),
+                "prepare": lambda: DataPreparation(
+                    outputs["merge"].copy(), "Total Deaths"
+                ).prepare_data(),
+                "trends": lambda: MortalityTrends(
+                    outputs["merge"].copy()
+                ).explore_mortality_trends(DISEASE_COLUMNS, output_path=figure_path),
+            }
+            measured = {}
+            for stage in PIPELINE_STAGES:
+                value, seconds, peak = _measure_stage(stages[stage])
+                outputs[stage] = value
+                measured[stage] = {
+                    "seconds": seconds,
+                    "peak_memory_mb": peak,
+                    "rows_out": len(value),
+                }
+                print(
+                    f"{rows:>12,} rows {stage:>10}: {seconds:8.3f}s, "
+                    f"peak {peak:9.1f} MB, {len(value):>10,} rows out"
+                )
+            measured["generate_seconds"] = generate_seconds
+            results["scales"][str(rows)] = measured
+            for path in (cdc_path, population_path):
+                os.remove(path)
+    finally:
+        if work_dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    # The generation time is reported but not compared
+    comparable = {
+        "scales": {
+            rows: {k: v for k, v in stages.items() if k != "generate_seconds"}
+            for rows, stages in results["scales"].items()
+        }
+    }
+    if baseline_path is not None and os.path.exists(baseline_path):
+        with open(baseline_path, "r") as file:
+            baseline = json.load(file)
+        regressions = compare_stage_results(comparable, baseline)
+        for rows, stage, metric, current, reference, ratio in regressions:
+            print(
+                f"Regression: {stage} at {int(rows):,} rows, {metric} "
+                f"{current:.3f} vs {reference:.3f} ({ratio:.2f}x)"
+            )
+    if baseline_path is not None and (
+        update_baseline or not os.path.exists(baseline_path)
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        temp_path = f"{baseline_path}.{os.getpid()}.part"
+        with open(temp_path, "w") as file:
+            json.dump(results, file, indent=2)
+        os.replace(temp_path, baseline_path)
+        print(f"Stored stage baseline: {baseline_path}")
+    return results
+
+
+# Run from the repository root with the package installed, e.g. `pip install -e .`
+# followed by `python benchmarks/benchmark.py`.
+if __name__ == "__main__":
+    check_import_budget()
+    benchmark_quarterly_rollup()
+    benchmark_profile()
+    benchmark_outlier_filter()
+    benchmark_feature_selection()
+    benchmark_tree_scorer()
+    benchmark_models()
+    benchmark_stages()
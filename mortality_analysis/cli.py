@@ -0,0 +1,342 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+from mortality_analysis.instrumentation import Tracer, configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def _headless():
+    # Figures are only ever written to files, so no display is needed
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _figure_path(args, name):
+    os.makedirs(args.output_dir, exist_ok=True)
+    return os.path.join(args.output_dir, f"{name}.{args.figure_format}")
+
+
+def _write_frame(data, path):
+    if path.endswith(".parquet"):
+        data.to_parquet(path, index=False)
+    else:
+        data.to_csv(path, index=False)
+    logger.info("Wrote %d rows to %s", len(data), path)
+
+
+def _print_frame(data):
+    print(data.to_string(index=False))
+
+
+def _summarize(data):
+    print(f"Rows: {len(data)}")
+    print(f"Jurisdictions: {data['Jurisdiction'].nunique()}")
+    print(f"Quarters: {data['Quarter'].min()} to {data['Quarter'].max()}")
+
+
+def run_ingest(args, pipeline):
+    """
+    Load and clean the CDC data.
+    """
+    cleaned = pipeline.run("clean")
+    _summarize(cleaned)
+    if args.output:
+        _write_frame(cleaned, args.output)
+
+
+def run_merge(args, pipeline):
+    """
+    Merge the cleaned CDC data with population data.
+    """
+    from mortality_analysis.merge_data import DataMerge
+
+    merged = pipeline.run("merge")
+    _summarize(merged)
+    # The merge drops unmatched rows, so compare against its inputs
+    cleaned = pipeline.run("clean")
+    unmatched = DataMerge(cleaned, pipeline.run("population")).find_unmatched()
+    print(f"Rows without population: {len(cleaned) - len(merged)}")
+    missing = sorted(unmatched["jurisdictions_without_population"])
+    print(f"Jurisdictions without population: {', '.join(missing) or 'none'}")
+    if args.output:
+        _write_frame(merged, args.output)
+
+
+def run_profile(args, pipeline):
+    """
+    Print the summary statistics of the merged data and render the EDA figures.
+    """
+    from mortality_analysis.eda import Eda
+
+    eda = Eda(pipeline.run("merge"), profile=True)
+    print("Basic Statistics:")
+    print(eda.display_basic_statistics())
+    print("\nMissing Values:")
+    print(eda.display_missing_values())
+    print("\nData Types:")
+    print(eda.display_data_types())
+    if args.plots:
+        manifest = eda.render_report(args.output_dir, formats=(args.figure_format,))
+        logger.info("Rendered %d figures to %s", len(manifest), args.output_dir)
+
+
+def run_trends(args, pipeline):
+    """
+    Compute the quarterly mortality rate of each disease and plot their trends.
+    """
+    from mortality_analysis.data_cleaning import DISEASE_COLUMNS
+    from mortality_analysis.trends_analysis import MortalityTrends
+
+    trends = MortalityTrends(pipeline.run("merge").copy())
+    if args.plots:
+        quarterly_data = trends.explore_mortality_trends(
+            DISEASE_COLUMNS, output_path=_figure_path(args, "mortality_trends")
+        )
+    else:
+        quarterly_data = trends.quarterly_mortality_rates(DISEASE_COLUMNS)
+    rate_columns = [f"{disease}_Mortality_Rate" for disease in DISEASE_COLUMNS]
+    _print_frame(quarterly_data[["Year", "Quarter"] + rate_columns])
+
+
+def run_death_rate(args, pipeline):
+    """
+    Find the states with the highest death rates and plot them against population.
+    """
+    from mortality_analysis.investigate_death_rate_analysis import DeathRateAnalyze
+
+    analyzer = DeathRateAnalyze(pipeline.run("merge").copy())
+    if args.plots:
+        top_states = analyzer.analyze_and_visualize_death_rate(
+            output_path=_figure_path(args, "death_rate")
+        )
+    else:
+        top_states = analyzer.top_death_rate_states(10)
+    print("Top 10 States with Highest Death Rates:")
+    print(top_states)
+
+
+def run_influence(args, pipeline):
+    """
+    Correlate each disease with total deaths and plot the coefficients.
+    """
+    from mortality_analysis.diseases_with_significant_influence_analysis import (
+        DiseaseInfluence,
+    )
+
+    influence = DiseaseInfluence(pipeline.run("merge").copy())
+    if args.plots:
+        correlations = influence.analyze_and_visualize(
+            output_path=_figure_path(args, "disease_influence")
+        )
+    else:
+        correlations = influence.disease_correlations()
+    print("Correlation Coefficients:")
+    print(correlations.to_string())
+
+
+def run_train(args, pipeline):
+    """
+    Train and evaluate a model on the prepared data, or one model per jurisdiction.
+    """
+    if args.by_jurisdiction:
+        from mortality_analysis.jurisdiction_trainer import JurisdictionTrainer
+
+        trainer = JurisdictionTrainer(
+            pipeline.run("merge"),
+            target_column=args.target,
+            backend=args.backend,
+            max_workers=args.workers,
+            time_column=args.time_column,
+        )
+        metrics = trainer.train()
+        print(metrics.to_string())
+        if args.model_out:
+            trainer.save(args.model_out)
+            logger.info("Saved %d models to %s", len(trainer.registry), args.model_out)
+        return
+
+    from mortality_analysis.predictive_model import DecisionTreeModel, PredictiveModel
+
+    prepared = pipeline.run("prepare")
+    if args.backend == "decision_tree":
+        model = DecisionTreeModel(prepared)
+    else:
+        model = PredictiveModel(prepared, backend=args.backend)
+    model.load_and_prepare_data()
+    model.split_data(time_column=args.time_column)
+    if args.backend == "decision_tree":
+        model.build_and_evaluate_decision_tree()
+    else:
+        model.build_and_evaluate()
+    print(f"Mean Absolute Error: {model.mae}")
+    print(f"Mean Squared Error: {model.mse}")
+    print(f"Coefficient of Determination (R2 Score): {model.r2}")
+    if args.model_out:
+        model.save_model(args.model_out)
+        logger.info("Saved model to %s", args.model_out)
+    if args.plots and args.backend == "decision_tree":
+        model.visualize_decision_tree(output_path=_figure_path(args, "decision_tree"))
+
+
+COMMANDS = {
+    "ingest": (run_ingest, "Load and clean the CDC data."),
+    "merge": (run_merge, "Merge the CDC data with BEA population data."),
+    "profile": (run_profile, "Profile the merged data and render EDA figures."),
+    "trends": (run_trends, "Quarterly mortality rate trends per disease."),
+    "death-rate": (run_death_rate, "The 10 states with the highest death rates."),
+    "influence": (run_influence, "Correlation of each disease with total deaths."),
+    "train": (run_train, "Train and evaluate a predictive model."),
+}
+
+
+def build_parser():
+    """
+    Build the argument parser of the `mortality-analysis` command.
+
+    Returns:
+    - parser (argparse.ArgumentParser): Parser with one subcommand per entry of
+      `COMMANDS`.
+    """
+    from mortality_analysis.data_cleaning import AGGREGATION_STRATEGIES
+    from mortality_analysis.load_data import CDC_URL
+    from mortality_analysis.predictive_model import MODEL_BACKENDS
+
+    common = argparse.ArgumentParser(add_help=False)
+    data = common.add_argument_group("data")
+    data.add_argument("--cdc-file", help="Local CDC CSV to use instead of downloading.")
+    data.add_argument("--cdc-url", default=CDC_URL, help="CDC export URL.")
+    data.add_argument(
+        "--population-file",
+        help="BEA population CSV. Defaults to the bundled package file.",
+    )
+    data.add_argument(
+        "--cache-dir", default=".mortality_cache", help="Download and stage cache."
+    )
+    data.add_argument(
+        "--aggregation",
+        default="first",
+        choices=AGGREGATION_STRATEGIES,
+        help="How weekly rows are combined per quarter.",
+    )
+    output = common.add_argument_group("output")
+    output.add_argument(
+        "--no-plots",
+        dest="plots",
+        action="store_false",
+        help="Only print results; matplotlib is never imported.",
+    )
+    output.add_argument(
+        "--output-dir", default="figures", help="Directory figures are written to."
+    )
+    output.add_argument(
+        "--figure-format", default="png", help="Figure file format, e.g. png or svg."
+    )
+    output.add_argument("--log-level", default="INFO", help="e.g. DEBUG or WARNING.")
+    output.add_argument("--trace", help="Write a per-stage trace to this file.")
+    output.add_argument(
+        "--trace-format",
+        default="json",
+        choices=("json", "chrome"),
+        help="Trace file format.",
+    )
+    output.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also trace peak memory per stage; slows the run down.",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="mortality-analysis",
+        description="Run one mortality analysis, computing only the stages it needs.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    commands = {}
+    for name, (_, help_text) in COMMANDS.items():
+        commands[name] = subparsers.add_parser(
+            name, parents=[common], help=help_text, description=help_text
+        )
+
+    for name in ("ingest", "merge"):
+        commands[name].add_argument(
+            "--output", help="Also write the table to this CSV or .parquet file."
+        )
+    train = commands["train"]
+    train.add_argument(
+        "--backend",
+        default="decision_tree",
+        choices=list(MODEL_BACKENDS),
+        help="Model backend.",
+    )
+    train.add_argument("--target", default="Total Deaths", help="Column to predict.")
+    train.add_argument(
+        "--time-column",
+        help="Hold out the latest periods of this feature instead of a random sample.",
+    )
+    train.add_argument("--model-out", help="Save the trained model to this file.")
+    train.add_argument(
+        "--by-jurisdiction",
+        action="store_true",
+        help="Train one model per jurisdiction on the merged data.",
+    )
+    train.add_argument(
+        "--workers", type=int, help="Worker processes for --by-jurisdiction."
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the `mortality-analysis` command.
+
+    Parameters:
+    - argv (list): Command-line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+    - status (int): 0 on success, 1 if the analysis failed.
+    """
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+    if args.plots:
+        _headless()
+
+    from mortality_analysis.pipeline import Pipeline
+
+    pipeline = Pipeline(
+        url=args.cdc_url,
+        cdc_file=args.cdc_file,
+        population_file=args.population_file,
+        cache_dir=args.cache_dir,
+        aggregation=args.aggregation,
+        target_column=getattr(args, "target", "Total Deaths"),
+    )
+    command = COMMANDS[args.command][0]
+    tracer = Tracer(memory=args.trace_memory) if args.trace else None
+
+    start = time.perf_counter()
+    try:
+        if tracer is None:
+            command(args, pipeline)
+        else:
+            with tracer:
+                command(args, pipeline)
+    except (OSError, RuntimeError, ValueError, KeyError) as exc:
+        logger.error("%s failed: %s", args.command, exc)
+        return 1
+    finally:
+        if tracer is not None:
+            if args.trace_format == "chrome":
+                tracer.write_chrome_trace(args.trace)
+            else:
+                tracer.write_json(args.trace)
+            logger.info("Wrote trace to %s", args.trace)
+    logger.info("%s finished in %.2fs", args.command, time.perf_counter() - start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
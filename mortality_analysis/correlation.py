@@ -0,0 +1,247 @@
+import hashlib
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from mortality_analysis.instrumentation import traced
+
+# Number of engines kept by `get_correlation_engine`.
+MAX_ENGINES = 8
+
+_engines = []
+
+
+class CorrelationEngine:
+    def __init__(self, columns):
+        """
+        Initialize the CorrelationEngine.
+
+        The engine keeps pairwise-complete sufficient statistics for Pearson correlation:
+        counts, sums, sums of squares and the cross-product matrix, each as a p x p array.
+        `update` folds in new rows in O(rows x columns^2) without rescanning earlier rows,
+        and the matrix from `correlation` is cached until the next update. Missing values
+        are handled pairwise, like `pd.DataFrame.corr`.
+
+        Parameters:
+        - columns (list): Names of the numeric columns tracked by the engine.
+        """
+        self.columns = list(columns)
+        p = len(self.columns)
+        self.counts = np.zeros((p, p))
+        self.sums = np.zeros((p, p))
+        self.sums_sq = np.zeros((p, p))
+        self.cross = np.zeros((p, p))
+        self.n_rows = 0
+        self.shift = None
+        self.hits = 0
+        self.misses = 0
+        self._digests = [hashlib.sha256() for _ in self.columns]
+        self._matrix = None
+
+    def update(self, data):
+        """
+        Add rows to the statistics.
+
+        Parameters:
+        - data (pd.DataFrame): New rows containing every tracked column.
+
+        Returns:
+        - self (CorrelationEngine): The engine, for chaining.
+        """
+        values = data[self.columns].to_numpy(dtype=np.float64)
+        if self.shift is None:
+            # Centre on the first batch's means to limit cancellation in the sums
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0))
+
+        present = ~np.isnan(values)
+        mask = present.astype(np.float64)
+        centred = np.where(present, values - self.shift, 0.0)
+
+        # sums[i, j] is the sum of column i over rows where both i and j are present
+        self.counts += mask.T @ mask
+        self.sums += centred.T @ mask
+        self.sums_sq += (centred * centred).T @ mask
+        self.cross += centred.T @ centred
+        self.n_rows += len(values)
+
+        for digest, column in zip(self._digests, self.columns):
+            digest.update(_row_hashes(data[column]))
+        self._matrix = None
+        return self
+
+    def column_digests(self):
+        """
+        Content digests of the tracked columns, covering every row added so far.
+
+        Returns:
+        - digests (dict): Column name keyed by hex digest.
+        """
+        return {
+            digest.hexdigest(): column
+            for digest, column in zip(self._digests, self.columns)
+        }
+
+    def correlation(self):
+        """
+        Return the Pearson correlation matrix of the tracked columns.
+
+        Returns:
+        - correlation_matrix (pd.DataFrame): Correlation matrix, cached until the next update.
+        """
+        if self._matrix is not None:
+            self.hits += 1
+            return self._matrix.copy()
+        self.misses += 1
+
+        n = self.counts
+        sum_x, sum_y = self.sums, self.sums.T
+        covariance = n * self.cross - sum_x * sum_y
+        variance_x = n * self.sums_sq - sum_x**2
+        variance_y = n * self.sums_sq.T - sum_y**2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = covariance / np.sqrt(variance_x * variance_y)
+        matrix[(n < 2) | (variance_x <= 0) | (variance_y <= 0)] = np.nan
+        matrix = np.clip(matrix, -1.0, 1.0)
+        diagonal = np.diag_indices_from(matrix)
+        matrix[diagonal] = np.where(np.isnan(matrix[diagonal]), np.nan, 1.0)
+
+        self._matrix = pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+        return self._matrix.copy()
+
+
+def _row_hashes(series):
+    return pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes()
+
+
+def _column_digest(series):
+    return hashlib.sha256(_row_hashes(series)).hexdigest()
+
+
+def get_correlation_engine(data, columns=None):
+    """
+    Return a shared engine holding statistics for the given columns.
+
+    Engines are found by per-column content digests, so any consumer asking about the same
+    data, or a subset of its columns, reuses the existing statistics instead of rescanning.
+
+    Parameters:
+    - data (pd.DataFrame): Input data.
+    - columns (list): Columns to correlate. Defaults to the numeric columns.
+
+    Returns:
+    - engine (CorrelationEngine): Engine covering the columns.
+    - names (dict): Requested column name keyed by the engine's column name.
+    """
+    if columns is None:
+        columns = data.select_dtypes(include=[np.number]).columns
+    columns = list(columns)
+    digests = [_column_digest(data[column]) for column in columns]
+
+    # Identical columns would collide on their digest; give them a private engine
+    shareable = len(set(digests)) == len(digests)
+    for engine in _engines if shareable else []:
+        known = engine.column_digests()
+        if all(digest in known for digest in digests):
+            # Move to the end so the least recently used engine is dropped first
+            _engines.remove(engine)
+            _engines.append(engine)
+            return engine, {known[d]: c for d, c in zip(digests, columns)}
+
+    engine = CorrelationEngine(columns).update(data)
+    _engines.append(engine)
+    del _engines[:-MAX_ENGINES]
+    return engine, {column: column for column in columns}
+
+
+@traced(rows_in=lambda data, *args, **kwargs: len(data))
+def compute_correlation(data, columns=None):
+    """
+    Pearson correlation matrix served from the shared correlation engines.
+
+    Parameters:
+    - data (pd.DataFrame): Input data.
+    - columns (list): Columns to correlate. Defaults to the numeric columns.
+
+    Returns:
+    - correlation_matrix (pd.DataFrame): Correlation matrix labelled with the requested
+      column names.
+    """
+    engine, names = get_correlation_engine(data, columns)
+    matrix = engine.correlation().loc[list(names), list(names)]
+    return matrix.rename(index=names, columns=names)
+
+
+def update_correlation(history, new_rows, columns=None):
+    """
+    Fold newly arrived rows into the shared engine for `history`.
+
+    Only `new_rows` are scanned. The engine's digests then describe the concatenation of
+    `history` and `new_rows`, so later `compute_correlation` calls on the combined frame
+    are served without a rescan.
+
+    Parameters:
+    - history (pd.DataFrame): Rows already seen by the engine (scanned once if not).
+    - new_rows (pd.DataFrame): Rows appended after `history`.
+    - columns (list): Columns to correlate. Defaults to the numeric columns.
+
+    Returns:
+    - correlation_matrix (pd.DataFrame): Correlation matrix over all rows.
+    """
+    engine, names = get_correlation_engine(history, columns)
+    if len(names) < len(engine.columns):
+        # Shared engine also tracks columns the caller did not supply; track the subset
+        engine = CorrelationEngine(list(names.values())).update(history)
+        _engines.append(engine)
+        del _engines[:-MAX_ENGINES]
+        names = {column: column for column in engine.columns}
+    requested = {column: name for name, column in names.items()}
+    engine.update(new_rows[list(requested)].rename(columns=requested))
+    return engine.correlation().loc[list(names), list(names)].rename(
+        index=names, columns=names
+    )
+
+
+@traced(rows_in=lambda data, *args, **kwargs: len(data))
+def correlation_with(data, target_column, columns=None):
+    """
+    Pearson correlation of each column with one target column, in O(rows x columns).
+
+    Only the target's column of the correlation matrix is computed. Missing values are
+    handled pairwise, like `pd.DataFrame.corr`.
+
+    Parameters:
+    - data (pd.DataFrame): Input data.
+    - target_column (str): Column every other column is correlated with.
+    - columns (list): Columns to score. Defaults to the numeric columns other than the
+      target.
+
+    Returns:
+    - correlations (pd.Series): Correlation with the target, indexed by column.
+    """
+    if columns is None:
+        columns = data.select_dtypes(include=[np.number]).columns.drop(
+            target_column, errors="ignore"
+        )
+    columns = list(columns)
+    values = data[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    target = data[target_column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Rows where both the column and the target are present
+    both = ~np.isnan(values) & ~np.isnan(target)[:, None]
+    n = both.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = np.where(both, values, 0.0)
+        y = np.where(both, target[:, None], 0.0)
+        x -= x.sum(axis=0) / n
+        y -= y.sum(axis=0) / n
+        x[~both] = 0.0
+        y[~both] = 0.0
+        covariance = (x * y).sum(axis=0)
+        variance_x = (x * x).sum(axis=0)
+        variance_y = (y * y).sum(axis=0)
+        correlations = covariance / np.sqrt(variance_x * variance_y)
+    correlations[(n < 2) | (variance_x <= 0) | (variance_y <= 0)] = np.nan
+    return pd.Series(np.clip(correlations, -1.0, 1.0), index=columns)
@@ -1,16 +1,107 @@
+import numpy as np
 import pandas as pd
 
+from mortality_analysis.instrumentation import traced
+
+# Data-quality flag columns in the CDC weekly export; dropped during preprocessing.
+FLAG_COLUMNS = [
+    "flag_allcause",
+    "flag_natcause",
+    "flag_sept",
+    "flag_neopl",
+    "flag_diab",
+    "flag_alz",
+    "flag_inflpn",
+    "flag_clrd",
+    "flag_otherresp",
+    "flag_nephr",
+    "flag_otherunk",
+    "flag_hd",
+    "flag_stroke",
+    "flag_cov19mcod",
+    "flag_cov19ucod",
+]
+
+# Mapping from CDC export column names to the names used throughout the package.
+COLUMN_RENAMES = {
+    "Data As Of": "Date",
+    "Jurisdiction of Occurrence": "Jurisdiction",
+    "MMWR Year": "Year",
+    "MMWR Week": "Week",
+    "Week Ending Date": "Ending Date",
+    "All Cause": "Total Deaths",
+    "Natural Cause": "Natural Deaths",
+    "Septicemia (A40-A41)": "Septicemia",
+    "Malignant neoplasms (C00-C97)": "Malignant Neoplasms",
+    "Diabetes mellitus (E10-E14)": "Diabetes",
+    "Alzheimer disease (G30)": "Alzheimer",
+    "Influenza and pneumonia (J09-J18)": "Influenza and Pneumonia",
+    "Chronic lower respiratory diseases (J40-J47)": "Chronic Respiratory Diseases",
+    "Other diseases of respiratory system (J00-J06,J30-J39,J67,J70-J98)": "Other Respiratory Diseases",
+    "Nephritis, nephrotic syndrome and nephrosis (N00-N07,N17-N19,N25-N27)": "Nephritis",
+    "Symptoms, signs and abnormal clinical and laboratory findings, not elsewhere classified (R00-R99)": "Abnormal Findings",
+    "Diseases of heart (I00-I09,I11,I13,I20-I51)": "Heart Diseases",
+    "Cerebrovascular diseases (I60-I69)": "Cerebrovascular Diseases",
+    "COVID-19 (U071, Multiple Cause of Death)": "COVID-19 (Multiple Cause)",
+    "COVID-19 (U071, Underlying Cause of Death)": "COVID-19 (Underlying Cause)",
+}
+# Cause-of-death count columns after renaming ('Total Deaths' onwards).
+CAUSE_COLUMNS = list(COLUMN_RENAMES.values())[5:]
+
+# Individual diseases, i.e. the cause columns other than the all/natural cause totals.
+DISEASE_COLUMNS = CAUSE_COLUMNS[2:]
+
+AGGREGATION_STRATEGIES = ("first", "sum", "mean")
+
 
 class CDCDataProcessor:
-    def __init__(self, data):
+    def __init__(self, data=None, aggregation="first"):
         """
         Initialize the CDCDataProcessor.
 
         Parameters:
-        - data (pd.DataFrame): The input DataFrame containing CDC data.
+        - data (pd.DataFrame): The input DataFrame containing CDC data. May be None when
+          only `preprocess_chunks` is used.
+        - aggregation (str): How weekly rows are collapsed to quarters. 'first' keeps the
+          first week of each (Jurisdiction, Quarter); 'sum' and 'mean' aggregate every
+          cause-of-death column over all weeks with the vectorized quarterly rollup.
         """
+        if aggregation not in AGGREGATION_STRATEGIES:
+            raise ValueError(
+                f"Invalid aggregation. Please choose one of {AGGREGATION_STRATEGIES}."
+            )
         self.data = data
+        self.aggregation = aggregation
+
+    @staticmethod
+    def clean_frame(data):
+        """
+        Drop flag columns, rename columns, parse 'Ending Date' once and add the 'Quarter' column.
+
+        Parameters:
+        - data (pd.DataFrame): Raw CDC rows, either a full frame or a single chunk.
 
+        Returns:
+        - data (pd.DataFrame): The cleaned rows.
+        """
+        data = data.drop(columns=FLAG_COLUMNS, errors="ignore")
+        data = data.rename(columns=COLUMN_RENAMES)
+
+        # Convert 'Ending Date' to datetime format (no-op if the loader already parsed it)
+        if not pd.api.types.is_datetime64_any_dtype(data["Ending Date"]):
+            data["Ending Date"] = pd.to_datetime(data["Ending Date"], format="%Y-%m-%d")
+        data["Quarter"] = data["Ending Date"].dt.to_period("Q")
+        return data
+
+    @staticmethod
+    def _add_date_parts(data):
+        # Extract year, month, and day into separate columns
+        data["Year"] = data["Ending Date"].dt.year
+        data["Month"] = data["Ending Date"].dt.month
+        data["Day"] = data["Ending Date"].dt.day
+        return data
+
+    @traced(rows_in=lambda self: len(self.data))
     def preprocess_data(self):
         """
         Preprocess the CDC data by performing various transformations.
@@ -18,68 +109,145 @@ class CDCDataProcessor:
         Returns:
         - preprocessed_data (pd.DataFrame): The preprocessed DataFrame.
         """
-        # Convert 'Week Ending Date' to datetime format and add 'Quarter' column
-        self.data["Week Ending Date"] = pd.to_datetime(
-            self.data["Week Ending Date"], format="%Y-%m-%d"
-        )
-        self.data["Quarter"] = self.data["Week Ending Date"].dt.to_period("Q")
+        self.data = self.clean_frame(self.data)
+
+        if self.aggregation == "first":
+            # Drop duplicates based on 'Jurisdiction' and 'Quarter'
+            self.data = self.data.drop_duplicates(subset=["Jurisdiction", "Quarter"])
+        else:
+            from mortality_analysis.quarterly_rollup import rollup_quarters
 
-        # Drop duplicates based on 'Jurisdiction of Occurrence' and 'Quarter'
-        self.data = self.data.drop_duplicates(
-            subset=["Jurisdiction of Occurrence", "Quarter"]
+            columns = self.data.columns
+            self.data = rollup_quarters(self.data, how=self.aggregation)[columns]
+
+        self.data = self._add_date_parts(self.data)
+        return self.data
+
+    @traced()
+    def preprocess_chunks(self, chunks):
+        """
+        Preprocess CDC data supplied as an iterator of raw CSV chunks.
+
+        Each chunk is cleaned on its own and only running per-(Jurisdiction, Quarter)
+        state is retained: the first row seen for 'first', or partial sums and non-null
+        counts for 'sum'/'mean'. The result equals `preprocess_data` on the whole frame,
+        including row order and the categorical 'Jurisdiction', and peak memory is
+        bounded by the chunk size plus one row per pair, not by file size.
+
+        Parameters:
+        - chunks (iterable): Raw CDC DataFrame chunks, e.g. from
+          `pd.read_csv(..., chunksize=n)` or `Loaddata.read_cdc_csv_chunks`.
+
+        Returns:
+        - preprocessed_data (pd.DataFrame): The preprocessed DataFrame.
+        """
+        if self.aggregation != "first":
+            return self._rollup_chunks(chunks)
+
+        from mortality_analysis.quarterly_rollup import period_ordinals
+
+        seen_keys = None
+        kept = []
+        categorical = False
+        for chunk in chunks:
+            chunk = self.clean_frame(chunk)
+            categorical = isinstance(chunk["Jurisdiction"].dtype, pd.CategoricalDtype)
+            chunk = chunk.drop_duplicates(subset=["Jurisdiction", "Quarter"])
+            keys = pd.MultiIndex.from_arrays(
+                [
+                    chunk["Jurisdiction"].astype(str).to_numpy(),
+                    period_ordinals(chunk["Quarter"]),
+                ]
+            )
+            if seen_keys is None:
+                is_new = np.ones(len(keys), dtype=bool)
+                seen_keys = keys
+            else:
+                is_new = ~keys.isin(seen_keys)
+                seen_keys = seen_keys.append(keys[is_new])
+            if is_new.any():
+                kept.append(chunk[is_new])
+
+        if kept:
+            self.data = pd.concat(kept)
+            if categorical:
+                # Chunks carry their own categories; match `preprocess_data`
+                self.data["Jurisdiction"] = self.data["Jurisdiction"].astype("category")
+        else:
+            self.data = self.clean_frame(pd.DataFrame(columns=list(COLUMN_RENAMES)))
+        self.data = self._add_date_parts(self.data)
+        return self.data
+
+    def _rollup_chunks(self, chunks):
+        from mortality_analysis.quarterly_rollup import (
+            CAUSE_COLUMNS,
+            finalize_rollup,
+            grouped_sums,
+            period_ordinals,
         )
 
-        # Drop specified columns
-        columns_to_drop = [
-            "flag_allcause",
-            "flag_natcause",
-            "flag_sept",
-            "flag_neopl",
-            "flag_diab",
-            "flag_alz",
-            "flag_inflpn",
-            "flag_clrd",
-            "flag_otherresp",
-            "flag_nephr",
-            "flag_otherunk",
-            "flag_hd",
-            "flag_stroke",
-            "flag_cov19mcod",
-            "flag_cov19ucod",
-        ]
-        self.data.drop(columns=columns_to_drop, inplace=True)
-
-        # Rename columns
-        new_column_names = {
-            "Data As Of": "Date",
-            "Jurisdiction of Occurrence": "Jurisdiction",
-            "MMWR Year": "Year",
-            "MMWR Week": "Week",
-            "Week Ending Date": "Ending Date",
-            "All Cause": "Total Deaths",
-            "Natural Cause": "Natural Deaths",
-            "Septicemia (A40-A41)": "Septicemia",
-            "Malignant neoplasms (C00-C97)": "Malignant Neoplasms",
-            "Diabetes mellitus (E10-E14)": "Diabetes",
-            "Alzheimer disease (G30)": "Alzheimer",
-            "Influenza and pneumonia (J09-J18)": "Influenza and Pneumonia",
-            "Chronic lower respiratory diseases (J40-J47)": "Chronic Respiratory Diseases",
-            "Other diseases of respiratory system (J00-J06,J30-J39,J67,J70-J98)": "Other Respiratory Diseases",
-            "Nephritis, nephrotic syndrome and nephrosis (N00-N07,N17-N19,N25-N27)": "Nephritis",
-            "Symptoms, signs and abnormal clinical and laboratory findings, not elsewhere classified (R00-R99)": "Abnormal Findings",
-            "Diseases of heart (I00-I09,I11,I13,I20-I51)": "Heart Diseases",
-            "Cerebrovascular diseases (I60-I69)": "Cerebrovascular Diseases",
-            "COVID-19 (U071, Multiple Cause of Death)": "COVID-19 (Multiple Cause)",
-            "COVID-19 (U071, Underlying Cause of Death)": "COVID-19 (Underlying Cause)",
-        }
-        self.data.rename(columns=new_column_names, inplace=True)
-
-        # Convert 'Ending Date' column to datetime format
-        self.data["Ending Date"] = pd.to_datetime(self.data["Ending Date"])
+        keys = ["Jurisdiction", "Quarter"]
+        columns = None
+        state = None
+        # Jurisdictions in order of first appearance, the row order of `rollup_quarters`
+        jurisdictions = pd.Index([], dtype=object)
+        for chunk in chunks:
+            chunk = self.clean_frame(chunk)
+            names = pd.unique(chunk["Jurisdiction"].astype(str))
+            jurisdictions = jurisdictions.append(
+                pd.Index(names[~pd.Index(names).isin(jurisdictions)], dtype=object)
+            )
+            if columns is None:
+                columns = chunk.columns
+                categorical = isinstance(
+                    chunk["Jurisdiction"].dtype, pd.CategoricalDtype
+                )
+                value_columns = [c for c in CAUSE_COLUMNS if c in columns]
+                count_columns = [f"{c} (count)" for c in value_columns]
+            last_rows, sums, counts = grouped_sums(chunk, value_columns)
+            partial = pd.concat(
+                [
+                    last_rows,
+                    pd.DataFrame(sums, columns=value_columns),
+                    pd.DataFrame(counts, columns=count_columns),
+                ],
+                axis=1,
+            )
+            if state is None:
+                state = partial
+                continue
 
-        # Extract year, month, and day into separate columns
-        self.data["Year"] = self.data["Ending Date"].dt.year
-        self.data["Month"] = self.data["Ending Date"].dt.month
-        self.data["Day"] = self.data["Ending Date"].dt.day
+            # Combine running sums and counts; carry columns come from the latest week
+            state = pd.concat([state, partial], ignore_index=True)
+            state = state.sort_values("Ending Date", kind="stable")
+            aggregations = {
+                c: ("sum" if c in value_columns or c in count_columns else "last")
+                for c in state.columns
+                if c not in keys
+            }
+            state = state.groupby(
+                keys, sort=False, observed=True, as_index=False
+            ).agg(aggregations)
 
+        if state is None:
+            self.data = self.clean_frame(pd.DataFrame(columns=list(COLUMN_RENAMES)))
+        else:
+            order = np.lexsort(
+                (
+                    period_ordinals(state["Quarter"]),
+                    jurisdictions.get_indexer(state["Jurisdiction"].astype(str)),
+                )
+            )
+            state = state.iloc[order].reset_index(drop=True)
+            last_rows = state.drop(columns=value_columns + count_columns)
+            self.data = finalize_rollup(
+                last_rows,
+                state[value_columns].to_numpy(),
+                state[count_columns].to_numpy(),
+                value_columns,
+                how=self.aggregation,
+            )[columns]
+            if categorical:
+                self.data["Jurisdiction"] = self.data["Jurisdiction"].astype("category")
+        self.data = self._add_date_parts(self.data)
         return self.data
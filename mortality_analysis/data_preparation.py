@@ -1,23 +1,358 @@
+import json
+import logging
+import os
+
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.impute import SimpleImputer
-from sklearn.feature_selection import SelectKBest, f_classif
-from scipy.stats import zscore
+
+from mortality_analysis.correlation import correlation_with
+from mortality_analysis.instrumentation import traced
+
+logger = logging.getLogger(__name__)
+
+
+OUTLIER_METHODS = ("IQR", "Z-score")
+
+FEATURE_SELECTION_STRATEGIES = ("pearson", "f_regression", "mutual_info")
+
+
+class OutlierFilter:
+    def __init__(self, method="IQR", iqr_factor=1.5, z_threshold=3.0):
+        """
+        Initialize the OutlierFilter.
+
+        `fit` computes per-column bounds for all numerical columns in one vectorized call;
+        `transform` builds one combined row mask and applies it once. The fitted bounds
+        can be reused on new batches without recomputation.
+
+        Parameters:
+        - method (str): 'IQR' keeps values within [Q1 - iqr_factor * IQR,
+          Q3 + iqr_factor * IQR]; 'Z-score' keeps values with |z| < z_threshold.
+        - iqr_factor (float): IQR multiplier.
+        - z_threshold (float): Largest absolute z-score kept.
+        """
+        if method not in OUTLIER_METHODS:
+            raise ValueError("Invalid method. Please choose 'IQR' or 'Z-score'.")
+        self.method = method
+        self.iqr_factor = iqr_factor
+        self.z_threshold = z_threshold
+        self.bounds = None
+
+    def fit(self, data, summary=None):
+        """
+        Compute the outlier bounds of every numerical column.
+
+        Quantiles (or means and standard deviations) are computed on the full data, not
+        on a frame already shrunk by earlier columns.
+
+        Parameters:
+        - data (pd.DataFrame): Data to fit on.
+        - summary (StreamingSummary): With 'IQR', take the bounds of its columns from
+          `summary.iqr_bounds()` instead of exact quantiles of `data`.
+
+        Returns:
+        - self (OutlierFilter): The fitted filter.
+        """
+        numerical_columns = data.select_dtypes(include=[np.number]).columns
+        if self.method == "IQR":
+            if summary is not None:
+                bounds = summary.iqr_bounds(self.iqr_factor)
+                self.bounds = bounds[numerical_columns.intersection(bounds.columns)]
+                return self
+            quartiles = data[numerical_columns].quantile([0.25, 0.75])
+            iqr = quartiles.loc[0.75] - quartiles.loc[0.25]
+            lower = quartiles.loc[0.25] - self.iqr_factor * iqr
+            upper = quartiles.loc[0.75] + self.iqr_factor * iqr
+        else:
+            # Population standard deviation, as in scipy.stats.zscore
+            mean = data[numerical_columns].mean()
+            std = data[numerical_columns].std(ddof=0)
+            lower = mean - self.z_threshold * std
+            upper = mean + self.z_threshold * std
+        self.bounds = pd.DataFrame({"lower": lower, "upper": upper}).T
+        return self
+
+    def mask(self, data):
+        """
+        Boolean mask of the rows kept by the fitted bounds.
+
+        With 'IQR', missing values are kept. With 'Z-score', a row with a missing value is
+        dropped, but the mean and standard deviation skip missing values. This differs
+        from the previous `scipy.stats.zscore` version of `handle_outliers`: there, a
+        single missing value made the whole column's z-scores NaN and so dropped every
+        row.
+
+        Parameters:
+        - data (pd.DataFrame): Data containing every fitted column.
+
+        Returns:
+        - keep (np.ndarray): True for rows without outliers.
+        """
+        if self.bounds is None:
+            raise RuntimeError("OutlierFilter must be fitted before use.")
+        values = data[self.bounds.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        lower = self.bounds.loc["lower"].to_numpy(dtype=np.float64)
+        upper = self.bounds.loc["upper"].to_numpy(dtype=np.float64)
+        if self.method == "IQR":
+            outliers = (values < lower) | (values > upper)
+            return ~outliers.any(axis=1)
+        inside = (values > lower) & (values < upper)
+        return inside.all(axis=1)
+
+    def transform(self, data):
+        """
+        Drop the rows that fall outside the fitted bounds.
+
+        Parameters:
+        - data (pd.DataFrame): Data containing every fitted column.
+
+        Returns:
+        - data (pd.DataFrame): Rows without outliers.
+        """
+        return data[self.mask(data)]
+
+    def fit_transform(self, data, summary=None):
+        """
+        Fit the bounds on `data` and drop its outliers.
+        """
+        return self.fit(data, summary=summary).transform(data)
+
+
+def feature_scores(data, target_column, strategy="pearson", n_jobs=None):
+    """
+    Score every numerical feature by its relevance to the target, in O(rows x features).
+
+    Only feature-target relevance is computed, never the feature-feature matrix.
+
+    Parameters:
+    - data (pd.DataFrame): Data holding the features and the target.
+    - target_column (str): Target column.
+    - strategy (str): 'pearson' (absolute correlation with the target), 'f_regression'
+      (univariate F statistic) or 'mutual_info' (mutual information estimate).
+    - n_jobs (int): Worker count for 'mutual_info'; -1 uses all CPUs.
+
+    Returns:
+    - scores (pd.Series): Score per feature, higher is more relevant. Features that cannot
+      be scored, e.g. constant or with missing values for the sklearn scorers, get NaN.
+    """
+    if strategy not in FEATURE_SELECTION_STRATEGIES:
+        raise ValueError(
+            f"Invalid strategy. Please choose one of {list(FEATURE_SELECTION_STRATEGIES)}."
+        )
+    features = data.select_dtypes(include=[np.number]).columns.drop(
+        target_column, errors="ignore"
+    )
+    if strategy == "pearson":
+        return correlation_with(data, target_column, features).abs()
+
+    from sklearn.feature_selection import f_regression, mutual_info_regression
+
+    scores = pd.Series(np.nan, index=features)
+    target = data[target_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    rows = ~np.isnan(target)
+    values = data[features].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    scorable = ~np.isnan(values).any(axis=0) & (np.ptp(values, axis=0) > 0)
+    if rows.sum() < 3 or not scorable.any():
+        return scores
+    if strategy == "f_regression":
+        statistics, _ = f_regression(values[:, scorable], target[rows])
+    else:
+        statistics = mutual_info_regression(
+            values[:, scorable], target[rows], random_state=0, n_jobs=n_jobs
+        )
+    scores[features[scorable]] = statistics
+    return scores
+
+
+def categorical_columns(data):
+    """
+    Columns holding categories or text: category, object and string dtypes, including
+    pandas 3's default 'str' dtype.
+
+    Parameters:
+    - data (pd.DataFrame): Input data.
+
+    Returns:
+    - columns (pd.Index): The categorical columns, in frame order.
+    """
+    return pd.Index(
+        [
+            column
+            for column, dtype in data.dtypes.items()
+            if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+            or pd.api.types.is_object_dtype(dtype)
+        ]
+    )
+
+
+def _to_builtin(value):
+    """
+    Convert NumPy scalars to Python values, so fitted state serializes to JSON.
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _fill_numeric(data, fill_values):
+    columns = [column for column in fill_values if column in data.columns]
+    if columns:
+        data[columns] = data[columns].astype(np.float64).fillna(
+            {column: fill_values[column] for column in columns}
+        )
+    return data
+
+
+def _fill_categorical(data, fill_values):
+    for column, value in fill_values.items():
+        if column in data.columns:
+            data[column] = data[column].astype(object).fillna(value)
+    return data
+
+
+def _encode_categories(data, mappings):
+    for column, categories in mappings.items():
+        if column in data.columns:
+            # Values missing from the mapping are encoded as -1
+            data[column] = pd.Index(categories).get_indexer(
+                data[column].astype(object)
+            ).astype(np.int64)
+    return data
+
+
+class PreparationArtifact:
+    def __init__(
+        self,
+        target_column,
+        numeric_fill,
+        categorical_fill,
+        category_mappings,
+        selected_features,
+    ):
+        """
+        Initialize the PreparationArtifact, the state fitted by `DataPreparation.fit`.
+
+        Applying it to new batches needs no refitting: missing values are filled with the
+        stored per-column values, categories are encoded with the stored per-column
+        mappings and only the selected features are kept.
+
+        Parameters:
+        - target_column (str): Target column for the machine learning task.
+        - numeric_fill (dict): Mean per numerical column.
+        - categorical_fill (dict): Most frequent value per categorical column.
+        - category_mappings (dict): Sorted categories per categorical column; a value is
+          encoded as its position in the list.
+        - selected_features (list): Features kept, in order.
+        """
+        self.target_column = target_column
+        self.numeric_fill = dict(numeric_fill)
+        self.categorical_fill = dict(categorical_fill)
+        self.category_mappings = {
+            column: list(categories) for column, categories in category_mappings.items()
+        }
+        self.selected_features = list(selected_features)
+
+    def transform(self, data):
+        """
+        Prepare a new batch with the fitted state.
+
+        Parameters:
+        - data (pd.DataFrame): New rows with at least the selected feature columns.
+
+        Returns:
+        - pd.DataFrame: The selected features, followed by the target column when `data`
+          contains it. Unseen categories are encoded as -1.
+        """
+        columns = list(self.selected_features)
+        if self.target_column in data.columns:
+            columns.append(self.target_column)
+        prepared = data[columns].copy()
+        prepared = _fill_numeric(prepared, self.numeric_fill)
+        prepared = _fill_categorical(prepared, self.categorical_fill)
+        return _encode_categories(prepared, self.category_mappings)
+
+    def to_dict(self):
+        """
+        Return the fitted state as a JSON-serializable dict.
+        """
+        return {
+            "target_column": self.target_column,
+            "numeric_fill": self.numeric_fill,
+            "categorical_fill": self.categorical_fill,
+            "category_mappings": self.category_mappings,
+            "selected_features": self.selected_features,
+        }
+
+    def save(self, file_path):
+        """
+        Save the artifact to a JSON file.
+
+        Parameters:
+        - file_path (str): Destination path.
+        """
+        temp_path = f"{file_path}.{os.getpid()}.part"
+        with open(temp_path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+        os.replace(temp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load an artifact saved with `save`.
+
+        Parameters:
+        - file_path (str): Path of the JSON file.
+
+        Returns:
+        - PreparationArtifact: The loaded artifact.
+        """
+        with open(file_path, "r") as file:
+            state = json.load(file)
+        return cls(**state)
 
 
 class DataPreparation:
-    def __init__(self, merged_data, target_column):
+    def __init__(
+        self,
+        merged_data,
+        target_column,
+        k=9,
+        selection="pearson",
+        n_jobs=None,
+        period_column=None,
+    ):
         """
         Initialize the DataPreparer object with input data and target column.
 
         Parameters:
         - merged_data (pd.DataFrame): The input dataset to be prepared.
         - target_column (str): The target column for the machine learning task.
+        - k (int): Number of top features to select.
+        - selection (str): Feature scoring strategy, one of
+          FEATURE_SELECTION_STRATEGIES; see `feature_scores`.
+        - n_jobs (int): Worker count for the 'mutual_info' strategy.
+        - period_column (str): Column carried through unchanged, e.g. 'Quarter', for
+          time-aware splits in `PredictiveModel`. It is not imputed, encoded or scored,
+          so it is never selected as a feature.
         """
+        if selection not in FEATURE_SELECTION_STRATEGIES:
+            raise ValueError(
+                "Invalid selection. Please choose one of "
+                f"{list(FEATURE_SELECTION_STRATEGIES)}."
+            )
         self.merged_data = merged_data
         self.target_column = target_column
+        self.k = k
+        self.selection = selection
+        self.n_jobs = n_jobs
+        self.period_column = period_column
+        self.feature_scores = None
+        self.outlier_filter = None
+        self.numeric_fill = {}
+        self.categorical_fill = {}
+        self.category_mappings = {}
+        self.selected_features = []
+        self.artifact = None
 
+    @traced(rows_in=lambda self: len(self.merged_data))
     def prepare_data(self):
         """
         Prepare the dataset for machine learning tasks by handling missing values, encoding categorical variables,
@@ -26,109 +361,136 @@ class DataPreparation:
         Returns:
         - Prepared dataset ready for machine learning.
         """
-        print("Data Preparation:")
+        logger.info(
+            "Data Preparation: %d rows in the merged dataset", len(self.merged_data)
+        )
+        logger.debug(
+            "Columns in the merged dataset: %s", list(self.merged_data.columns)
+        )
 
-        print("Number of rows in the merged dataset:", len(self.merged_data))
-        print("Columns in the merged dataset:", self.merged_data.columns)
+        self.fit()
+        return self.merged_data
+
+    @traced(rows_in=lambda self, k=None: len(self.merged_data))
+    def fit(self, k=None):
+        """
+        Fit imputation values, category mappings and the top k features on the dataset.
+
+        Parameters:
+        - k (int): Number of top features to select. Defaults to `self.k`.
+
+        Returns:
+        - PreparationArtifact: The fitted preparation, also kept in `self.artifact`.
+        """
+        periods = None
+        if self.period_column is not None:
+            periods = self.merged_data[self.period_column]
+            self.merged_data = self.merged_data.drop(columns=self.period_column)
 
         self.handle_missing_values()
         self.encode_categorical_variables()
-
-        k = 9
         self.select_top_k_features(k)
 
-        return self.merged_data
+        if periods is not None:
+            self.merged_data[self.period_column] = periods
+
+        self.artifact = PreparationArtifact(
+            self.target_column,
+            self.numeric_fill,
+            self.categorical_fill,
+            self.category_mappings,
+            self.selected_features,
+        )
+        return self.artifact
 
     def handle_missing_values(self):
         """
         Handle missing values in the dataset using mean imputation for numerical columns
         and most frequent imputation for categorical columns.
 
+        The fill values are kept per column in `self.numeric_fill` and
+        `self.categorical_fill`.
+
         Note:
         - This function modifies the input dataset in-place.
         """
         # Check if there are numeric columns
         numerical_columns = self.merged_data.select_dtypes(include=["number"]).columns
         if not numerical_columns.empty:
-            print("Handling missing values for numeric columns.")
-            # Filter out columns with all missing values
-            valid_numerical_columns = self.merged_data[numerical_columns].columns[
-                self.merged_data[numerical_columns].notna().any()
-            ]
-            if not valid_numerical_columns.empty:
-                imputer = SimpleImputer(strategy="mean")
-                self.merged_data[valid_numerical_columns] = imputer.fit_transform(
-                    self.merged_data[valid_numerical_columns]
-                )
+            logger.debug("Handling missing values for numeric columns.")
+            # Columns with all missing values are left untouched
+            means = self.merged_data[numerical_columns].mean().dropna()
+            self.numeric_fill = {column: float(value) for column, value in means.items()}
+            self.merged_data = _fill_numeric(self.merged_data, self.numeric_fill)
 
         # Check if there are categorical columns
-        categorical_columns = self.merged_data.select_dtypes(include=["object"]).columns
-        if not categorical_columns.empty:
-            print("Handling missing values for categorical columns.")
-            imputer = SimpleImputer(strategy="most_frequent")
-            self.merged_data[categorical_columns] = imputer.fit_transform(
-                self.merged_data[categorical_columns]
-            )
+        columns = categorical_columns(self.merged_data)
+        if not columns.empty:
+            logger.debug("Handling missing values for categorical columns.")
+            for column in columns:
+                # Ties go to the smallest value, as with SimpleImputer('most_frequent')
+                modes = self.merged_data[column].mode()
+                if len(modes):
+                    self.categorical_fill[column] = _to_builtin(modes.iloc[0])
+            self.merged_data = _fill_categorical(self.merged_data, self.categorical_fill)
 
-    def handle_outliers(self, method="IQR"):
+    @traced(rows_in=lambda self, *args, **kwargs: len(self.merged_data))
+    def handle_outliers(self, method="IQR", summary=None):
         """
         Handle outliers in the DataFrame using the specified method.
 
+        The fitted `OutlierFilter` is kept in `self.outlier_filter`, so the same bounds
+        can be applied to new batches with `self.outlier_filter.transform(batch)`.
+
         Parameters:
         - method: str, method for handling outliers ('IQR' or 'Z-score')
+        - summary: StreamingSummary, optional. With 'IQR', take the bounds of its columns
+          from `summary.iqr_bounds()` (e.g. built chunk by chunk over an archive) instead
+          of exact quantiles of the in-memory data; see `summary.rank_error()`.
 
         Returns:
         - data: pandas DataFrame, with outliers handled
         """
-        numerical_columns = self.merged_data.select_dtypes(include=[np.number]).columns
-
-        if method == "IQR":
-            for col in numerical_columns:
-                Q1 = self.merged_data[col].quantile(0.25)
-                Q3 = self.merged_data[col].quantile(0.75)
-                IQR = Q3 - Q1
-                self.merged_data = self.merged_data[
-                    ~(
-                        (self.merged_data[col] < (Q1 - 1.5 * IQR))
-                        | (self.merged_data[col] > (Q3 + 1.5 * IQR))
-                    )
-                ]
-        elif method == "Z-score":
-            z_scores = np.abs(zscore(self.merged_data[numerical_columns]))
-            self.merged_data = self.merged_data[(z_scores < 3).all(axis=1)]
-        else:
-            raise ValueError("Invalid method. Please choose 'IQR' or 'Z-score'.")
+        self.outlier_filter = OutlierFilter(method).fit(self.merged_data, summary=summary)
+        self.merged_data = self.outlier_filter.transform(self.merged_data)
+        return self.merged_data
 
     def encode_categorical_variables(self):
         """
-        Encode categorical variables in the dataset using LabelEncoder.
+        Encode categorical variables in the dataset as integer codes.
+
+        Each column gets its own mapping, kept in `self.category_mappings`: codes are the
+        positions in the sorted list of the column's values, as with LabelEncoder.
 
         Note:
         - This function modifies the input dataset in-place.
         """
-        label_encoder = LabelEncoder()
-
-        categorical_columns = self.merged_data.select_dtypes(include=["object"]).columns
-        for column in categorical_columns:
-            self.merged_data[column] = label_encoder.fit_transform(
-                self.merged_data[column]
-            )
+        for column in categorical_columns(self.merged_data):
+            values = self.merged_data[column]
+            self.category_mappings[column] = [
+                _to_builtin(value) for value in np.unique(values.to_numpy(dtype=object))
+            ]
+        self.merged_data = _encode_categories(self.merged_data, self.category_mappings)
 
-    def select_top_k_features(self, k):
+    def select_top_k_features(self, k=None):
         """
-        Select the top k features based on their correlation with the target column.
+        Select the top k features based on their relevance to the target column, scored
+        with the `selection` strategy. The scores are kept in `self.feature_scores`.
 
         Parameters:
-        - k (int): Number of top features to select.
+        - k (int): Number of top features to select. Defaults to `self.k`.
 
         Note:
         - This function modifies the input dataset in-place.
         """
-        correlation_matrix = self.merged_data.corr()
-        target_correlation = (
-            correlation_matrix[self.target_column].abs().sort_values(ascending=False)
+        if k is None:
+            k = self.k
+        self.feature_scores = feature_scores(
+            self.merged_data, self.target_column, self.selection, self.n_jobs
         )
-        selected_features = target_correlation[1 : k + 1].index
+        ranking = self.feature_scores.sort_values(ascending=False, kind="stable")
+        selected_features = ranking[:k].index
+        self.selected_features = list(selected_features)
         self.merged_data = pd.concat(
             [self.merged_data[selected_features], self.merged_data[self.target_column]],
             axis=1,
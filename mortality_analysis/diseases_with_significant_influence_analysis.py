@@ -1,6 +1,12 @@
+import logging
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from mortality_analysis.correlation import compute_correlation
+from mortality_analysis.data_cleaning import DISEASE_COLUMNS
+from mortality_analysis.instrumentation import traced
+
+logger = logging.getLogger(__name__)
 
 
 class DiseaseInfluence:
@@ -14,34 +20,35 @@ class DiseaseInfluence:
         """
         self.data = data
 
-    def analyze_and_visualize(self):
+    @traced(rows_in=lambda self: len(self.data))
+    def disease_correlations(self):
+        """
+        Correlation of each disease of interest with 'Total Deaths', without plotting.
+
+        Returns:
+        - pd.Series: Correlation coefficient per disease.
+        """
+        return compute_correlation(
+            self.data, DISEASE_COLUMNS + ["Total Deaths"]
+        )["Total Deaths"].drop("Total Deaths")
+
+    @traced(rows_in=lambda self, *args, **kwargs: len(self.data))
+    def analyze_and_visualize(self, output_path=None):
         """
         Analyze and visualize the correlation between specific diseases and overall death rates.
 
+        Parameters:
+        - output_path (str): If given, save the figure to this file (PNG, SVG, ...) instead
+          of showing it.
+
         Returns:
         - pd.Series: Correlation coefficients between each specified disease and overall death rates.
         """
-        diseases_of_interest = [
-            "Septicemia",
-            "Malignant Neoplasms",
-            "Diabetes",
-            "Alzheimer",
-            "Influenza and Pneumonia",
-            "Chronic Respiratory Diseases",
-            "Other Respiratory Diseases",
-            "Nephritis",
-            "Abnormal Findings",
-            "Heart Diseases",
-            "Cerebrovascular Diseases",
-            "COVID-19 (Multiple Cause)",
-            "COVID-19 (Underlying Cause)",
-        ]
-
-        correlations = (
-            self.data[diseases_of_interest + ["Total Deaths"]]
-            .corr()["Total Deaths"]
-            .drop("Total Deaths")
-        )
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        correlations = self.disease_correlations()
+        logger.info("Correlation Coefficients:\n%s", correlations.to_string())
 
         plt.figure(figsize=(12, 8))
         sns.barplot(x=correlations.index, y=correlations.values, color="skyblue")
@@ -49,9 +56,12 @@ class DiseaseInfluence:
         plt.xlabel("Diseases")
         plt.ylabel("Correlation Coefficient")
         plt.xticks(rotation=45, ha="right")
-        plt.show()
+        if output_path is None:
+            plt.show()
+        else:
+            plt.savefig(output_path, bbox_inches="tight")
+            plt.close()
 
-        print("Correlation Coefficients:")
         return correlations
 
 
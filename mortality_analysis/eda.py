@@ -1,53 +1,95 @@
+import logging
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 
+from mortality_analysis.correlation import compute_correlation
+from mortality_analysis.data_preparation import categorical_columns
+from mortality_analysis.instrumentation import traced
+
+logger = logging.getLogger(__name__)
+
 
 class Eda:
-    def __init__(self, data):
+    def __init__(self, data, profile=False):
         """
         Initialize the DataExplorer object with the input DataFrame.
 
         Parameters:
         - data (pd.DataFrame): The input DataFrame to be explored.
+        - profile (bool): Serve the summary methods from one `DataProfile` computed by
+          `profile_frame`, instead of a separate pass over the data per method.
         """
         self.data = data
+        self.profile_mode = profile
+        self._profile = None
+        self._profile_bins = None
 
-    def display_basic_statistics(self):
+    @traced(rows_in=lambda self, bins=20: len(self.data))
+    def profile(self, bins=20):
         """
-        Display basic statistics of the dataset.
+        Profile the dataset once: counts, nulls, mean, std, min/max, quantiles and
+        histograms of every numerical column, plus missing values and data types.
+
+        Parameters:
+        - bins (int): Number of histogram bins per numerical column.
+
+        Returns:
+        - DataProfile: Structured profile, cached until `bins` changes.
+        """
+        from mortality_analysis.profiling import profile_frame
+
+        if self._profile is None or self._profile_bins != bins:
+            self._profile = profile_frame(self.data, bins=bins)
+            self._profile_bins = bins
+        return self._profile
+
+    def display_basic_statistics(self, summary=None):
+        """
+        Compute basic statistics of the dataset.
+
+        Parameters:
+        - summary (StreamingSummary): Optional online summary, e.g. of an archive fed
+          chunk by chunk; its sketch-based statistics are returned instead.
 
         Returns:
         - pd.DataFrame: Basic statistics of the dataset.
         """
-        stats = self.data.describe()
-        print("Basic Statistics:")
-        print(stats)
+        if summary is not None:
+            stats = summary.describe()
+        elif self.profile_mode:
+            stats = self.profile().describe()
+        else:
+            stats = self.data.describe()
+        logger.info("Basic Statistics:\n%s", stats.to_string())
         return stats
 
     def display_missing_values(self):
         """
-        Display missing values in the dataset.
+        Count missing values in the dataset.
 
         Returns:
         - pd.Series: Missing values count for each column.
         """
-        missing_values = self.data.isnull().sum()
-        print("\nMissing Values:")
-        print(missing_values)
+        if self.profile_mode:
+            missing_values = self.profile().missing_values()
+        else:
+            missing_values = self.data.isnull().sum()
+        logger.info("Missing Values:\n%s", missing_values.to_string())
         return missing_values
 
     def display_data_types(self):
         """
-        Display data types of columns in the dataset.
+        Collect data types of columns in the dataset.
 
         Returns:
         - pd.Series: Data types of each column.
         """
-        data_types = self.data.dtypes
-        print("\nData Types:")
-        print(data_types)
+        if self.profile_mode:
+            data_types = self.profile().dtypes
+        else:
+            data_types = self.data.dtypes
+        logger.info("Data Types:\n%s", data_types.to_string())
         return data_types
 
     def display_correlation_matrix(self):
@@ -57,16 +99,19 @@ class Eda:
         Returns:
         - pd.DataFrame: Correlation matrix for numerical columns.
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         numerical_columns = self.data.select_dtypes(include=[np.number]).columns
         if len(numerical_columns) > 0:
-            correlation_matrix = self.data[numerical_columns].corr()
+            correlation_matrix = compute_correlation(self.data, numerical_columns)
             plt.figure(figsize=(12, 8))
             sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f")
             plt.title("Correlation Matrix")
             plt.show()
             return correlation_matrix
         else:
-            print("No numerical columns for correlation matrix.")
+            logger.warning("No numerical columns for correlation matrix.")
             return None
 
     def display_numerical_distribution(self):
@@ -76,10 +121,17 @@ class Eda:
         Returns:
         - Histogram
         """
+        import matplotlib.pyplot as plt
+
         numerical_columns = self.data.select_dtypes(include=[np.number]).columns
         for col in numerical_columns:
             plt.figure(figsize=(10, 6))
-            self.data[col].hist(bins=20)
+            if self.profile_mode:
+                counts, edges = self.profile().histogram(col)
+                plt.stairs(counts, edges, fill=True)
+                plt.grid(True)
+            else:
+                self.data[col].hist(bins=20)
             plt.title(f"Distribution of {col}")
             plt.xlabel(col)
             plt.ylabel("Frequency")
@@ -92,6 +144,9 @@ class Eda:
         Returns:
         - Histogram of boxplot
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         numerical_columns = self.data.select_dtypes(include=[np.number]).columns
         plt.figure(figsize=(15, 8))
         sns.boxplot(data=self.data[numerical_columns].tail(100))
@@ -105,9 +160,85 @@ class Eda:
         Returns:
         - Histogram of count plot
         """
-        categorical_columns = self.data.select_dtypes(include=["object"]).columns
-        for col in categorical_columns:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        for col in categorical_columns(self.data):
             plt.figure(figsize=(10, 6))
             sns.countplot(x=col, data=self.data.tail(100))
             plt.title(f"Count plot for {col}")
             plt.show()
+
+    @traced(rows_in=lambda self, *args, **kwargs: len(self.data))
+    def render_report(self, output_dir, formats=("png",), max_workers=None):
+        """
+        Render every EDA figure headlessly to files instead of showing them.
+
+        Produces the correlation heatmap, one histogram per numerical column, the outlier
+        boxplot and one count plot per categorical column, rendered in parallel by
+        `FigureRenderer`.
+
+        Parameters:
+        - output_dir (str): Directory the figures are written to.
+        - formats (tuple): Output formats, e.g. ('png', 'svg').
+        - max_workers (int): Number of rendering processes.
+
+        Returns:
+        - manifest (list): One dict per figure with 'name', 'kind' and output 'paths'.
+        """
+        from mortality_analysis.rendering import FigureRenderer, histogram_job
+
+        numerical_columns = self.data.select_dtypes(include=[np.number]).columns
+        text_columns = categorical_columns(self.data)
+
+        profile = self.profile() if self.profile_mode else None
+
+        jobs = []
+        if len(numerical_columns) > 0:
+            jobs.append(
+                {
+                    "name": "correlation_matrix",
+                    "kind": "heatmap",
+                    "figsize": (12, 8),
+                    "title": "Correlation Matrix",
+                    "payload": compute_correlation(self.data, numerical_columns),
+                }
+            )
+            jobs.append(
+                {
+                    "name": "boxplot_outliers",
+                    "kind": "boxplot",
+                    "figsize": (15, 8),
+                    "title": "Boxplot for Outlier Detection",
+                    "payload": self.data[numerical_columns].tail(100),
+                }
+            )
+        for col in numerical_columns:
+            jobs.append(
+                histogram_job(
+                    f"distribution_{col}",
+                    self.data[col],
+                    bins=20,
+                    title=f"Distribution of {col}",
+                    xlabel=col,
+                    histogram=profile.histogram(col) if profile else None,
+                )
+            )
+        for col in text_columns:
+            counts = self.data[col].tail(100).value_counts(sort=False)
+            counts = counts[counts > 0]
+            jobs.append(
+                {
+                    "name": f"counts_{col}",
+                    "kind": "bar",
+                    "figsize": (10, 6),
+                    "title": f"Count plot for {col}",
+                    "xlabel": col,
+                    "ylabel": "count",
+                    "payload": (counts.index.tolist(), counts.to_numpy()),
+                }
+            )
+
+        return FigureRenderer(
+            output_dir, formats=formats, max_workers=max_workers
+        ).render(jobs)
@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+
+import pandas as pd
+
+from mortality_analysis.data_cleaning import COLUMN_RENAMES, CDCDataProcessor
+from mortality_analysis.instrumentation import traced
+
+logger = logging.getLogger(__name__)
+
+# Columns that identify one weekly CDC row after cleaning.
+WEEK_KEY = ["Jurisdiction", "Year", "Week"]
+
+
+class IncrementalStore:
+    def __init__(self, store_dir, revision_weeks=8):
+        """
+        Initialize the IncrementalStore.
+
+        Weekly CDC rows are kept in a local store partitioned by Year and Quarter
+        (`store_dir/year=YYYY/quarter=Q/part.parquet`). A state file records the
+        latest MMWR year/week, week ending date and 'Data As Of' already ingested.
+
+        Parameters:
+        - store_dir (str): Directory holding the partitions and the state file.
+        - revision_weeks (int): Number of weeks before the latest ingested week that the CDC
+          may still revise. Rows in this window are re-ingested when 'Data As Of' advances.
+        """
+        self.store_dir = store_dir
+        self.revision_weeks = revision_weeks
+        self.state_file = os.path.join(store_dir, "state.json")
+        self.state = self._read_state()
+
+    def _read_state(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file, "r") as file:
+            return json.load(file)
+
+    def _write_state(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        temp_path = f"{self.state_file}.part"
+        with open(temp_path, "w") as file:
+            json.dump(self.state, file, indent=2)
+        os.replace(temp_path, self.state_file)
+
+    def partition_path(self, year, quarter):
+        """
+        Return the file path of the partition for a calendar year and quarter.
+        """
+        return os.path.join(
+            self.store_dir, f"year={year}", f"quarter={quarter}", "part.parquet"
+        )
+
+    def partitions(self):
+        """
+        List the (year, quarter) partitions currently in the store.
+
+        Returns:
+        - partitions (list): Sorted list of (year, quarter) tuples.
+        """
+        return sorted(tuple(p) for p in self.state.get("partitions", []))
+
+    def _watermarks(self):
+        """
+        Return the ingested week ending date, the start of the revision window and the
+        ingested 'Data As Of', or None when nothing was ingested yet.
+        """
+        last_ending_date = self.state.get("last_ending_date")
+        if last_ending_date is None:
+            return None
+        last_ending_date = pd.Timestamp(last_ending_date)
+        window_start = last_ending_date - pd.Timedelta(weeks=self.revision_weeks)
+        last_as_of = self.state.get("data_as_of")
+        if last_as_of is not None:
+            last_as_of = pd.Timestamp(last_as_of)
+        return last_ending_date, window_start, last_as_of
+
+    def _select_new_rows(self, chunk):
+        """
+        Keep rows that are newer than the watermark, or inside the revision window when
+        the chunk's 'Data As Of' is newer than the one already ingested.
+        """
+        watermarks = self._watermarks()
+        if watermarks is None:
+            return chunk
+        last_ending_date, window_start, last_as_of = watermarks
+
+        newer = chunk["Ending Date"] > last_ending_date
+        revised = True if last_as_of is None else chunk["Date"] > last_as_of
+        in_window = chunk["Ending Date"] > window_start
+
+        return chunk[newer | (revised & in_window)]
+
+    def _raw_row_filter(self):
+        """
+        Build the `_select_new_rows` test for raw pyarrow batches, so rows that cannot
+        be new are dropped before they are converted to pandas. None keeps every row.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        watermarks = self._watermarks()
+        if watermarks is None:
+            return None
+        last_ending_date, window_start, last_as_of = (
+            None if value is None else pa.scalar(value, pa.timestamp("s"))
+            for value in watermarks
+        )
+
+        def row_filter(batch):
+            ending_date = batch.column("Week Ending Date")
+            keep = pc.greater(ending_date, window_start)
+            if last_as_of is not None:
+                revised = pc.greater(batch.column("Data As Of"), last_as_of)
+                keep = pc.and_(
+                    keep, pc.or_(revised, pc.greater(ending_date, last_ending_date))
+                )
+            return pc.fill_null(keep, False)
+
+        return row_filter
+
+    def _upsert_partition(self, year, quarter, rows):
+        path = self.partition_path(year, quarter)
+        if os.path.exists(path):
+            rows = pd.concat([pd.read_parquet(path), rows], ignore_index=True)
+        rows = rows.drop_duplicates(subset=WEEK_KEY, keep="last")
+        rows = rows.sort_values(["Ending Date", "Jurisdiction"], ignore_index=True)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.part"
+        rows.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+
+    @traced()
+    def ingest_chunks(self, chunks):
+        """
+        Upsert newer or revised weekly rows from raw CDC chunks into the store.
+
+        Parameters:
+        - chunks (iterable): Raw CDC DataFrame chunks, e.g. from `Loaddata.read_cdc_csv_chunks`.
+
+        Returns:
+        - affected (list): Sorted (year, quarter) partitions that received rows.
+        """
+        pending = {}
+        for chunk in chunks:
+            chunk = CDCDataProcessor.clean_frame(chunk)
+            chunk = self._select_new_rows(chunk)
+            if chunk.empty:
+                continue
+            chunk = chunk.assign(Jurisdiction=chunk["Jurisdiction"].astype(str))
+            for (year, quarter), rows in chunk.groupby(
+                [chunk["Quarter"].dt.year, chunk["Quarter"].dt.quarter]
+            ):
+                pending.setdefault((int(year), int(quarter)), []).append(rows)
+
+        if not pending:
+            logger.info("No new or revised CDC weeks to ingest.")
+            return []
+
+        latest = None
+        latest_as_of = None
+        for (year, quarter), frames in pending.items():
+            rows = pd.concat(frames, ignore_index=True)
+            self._upsert_partition(year, quarter, rows)
+            last_row = rows.loc[rows["Ending Date"].idxmax()]
+            if latest is None or last_row["Ending Date"] > latest["Ending Date"]:
+                latest = last_row
+            if latest_as_of is None or rows["Date"].max() > latest_as_of:
+                latest_as_of = rows["Date"].max()
+
+        affected = sorted(pending)
+        known = set(self.partitions())
+        previous_end = self.state.get("last_ending_date")
+        if previous_end is None or latest["Ending Date"] >= pd.Timestamp(previous_end):
+            self.state.update(
+                {
+                    "last_year": int(latest["Year"]),
+                    "last_week": int(latest["Week"]),
+                    "last_ending_date": latest["Ending Date"].isoformat(),
+                }
+            )
+        # Revisions of older weeks advance 'Data As Of' without moving the week watermark
+        previous_as_of = self.state.get("data_as_of")
+        if previous_as_of is None or latest_as_of > pd.Timestamp(previous_as_of):
+            self.state["data_as_of"] = pd.Timestamp(latest_as_of).isoformat()
+        self.state["partitions"] = [list(p) for p in sorted(known | set(affected))]
+        self._write_state()
+
+        logger.info("Upserted CDC weeks into partitions: %s", affected)
+        return affected
+
+    @traced()
+    def refresh(self, loader, chunksize=100_000, engine=None):
+        """
+        Download the CDC export if it changed and ingest only newer or revised weeks.
+
+        The export is a single CSV, so a changed file is still tokenized in full, but
+        rows before the watermark are dropped by `Loaddata.read_cdc_csv_filtered` before
+        they are converted, cleaned or written.
+
+        Parameters:
+        - loader (Loaddata): Loader used for the conditional download and the parse.
+        - chunksize (int): Rows per parsed chunk when pyarrow is not installed.
+        - engine (str): CSV parser engine passed to `pd.read_csv` when pyarrow is not
+          installed.
+
+        Returns:
+        - affected (list): Sorted (year, quarter) partitions that received rows.
+        """
+        file_path = loader.download_cdc_data()
+        if file_path is None:
+            return []
+        if (
+            loader.last_download is not None
+            and loader.last_download["cache_hit"]
+            and self.state.get("source_file") == os.path.abspath(file_path)
+        ):
+            logger.info("CDC export unchanged; store is up to date.")
+            return []
+
+        try:
+            chunks = loader.read_cdc_csv_filtered(file_path, self._raw_row_filter())
+        except ImportError:
+            # Without pyarrow every row is converted and filtered afterwards
+            chunks = loader.read_cdc_csv_chunks(
+                file_path, chunksize=chunksize, engine=engine
+            )
+        affected = self.ingest_chunks(chunks)
+        self.state["source_file"] = os.path.abspath(file_path)
+        self._write_state()
+        return affected
+
+    @traced()
+    def load(self, partitions=None):
+        """
+        Load weekly rows from the store.
+
+        Parameters:
+        - partitions (list): (year, quarter) partitions to load. Defaults to all partitions.
+
+        Returns:
+        - data (pd.DataFrame): Cleaned weekly rows. Run the partitions returned by
+          `refresh` through `CDCDataProcessor.preprocess_data`, then update an earlier
+          merged result with `DataMerge.merge_partitions`.
+        """
+        if partitions is None:
+            partitions = self.partitions()
+        frames = [
+            pd.read_parquet(self.partition_path(year, quarter))
+            for year, quarter in partitions
+            if os.path.exists(self.partition_path(year, quarter))
+        ]
+        if not frames:
+            empty = pd.DataFrame(columns=list(COLUMN_RENAMES))
+            return CDCDataProcessor.clean_frame(empty)
+        return pd.concat(frames, ignore_index=True)
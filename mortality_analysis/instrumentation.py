@@ -0,0 +1,344 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# Tracer that stages report into; None disables recording.
+_active_tracer = None
+
+
+def configure_logging(level="INFO", fmt="%(message)s"):
+    """
+    Send the package's log records to stderr, e.g. from a script or the command line.
+
+    The library itself never configures handlers; without this call only warnings and
+    errors are shown, through Python's last-resort handler.
+
+    Parameters:
+    - level (str or int): Lowest level shown, e.g. 'DEBUG', 'INFO' or 'WARNING'.
+    - fmt (str): Record format passed to `logging.Formatter`.
+    """
+    package_logger = logging.getLogger("mortality_analysis")
+    handlers = package_logger.handlers
+    if not any(getattr(h, "_mortality_analysis", False) for h in handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(fmt))
+        handler._mortality_analysis = True
+        package_logger.addHandler(handler)
+    package_logger.setLevel(level)
+
+
+def _count_rows(value):
+    # DataFrames, Series and arrays; other results have no row count
+    shape = getattr(value, "shape", None)
+    if shape:
+        return int(shape[0])
+    return None
+
+
+class Tracer:
+    def __init__(self, memory=True):
+        """
+        Initialize the Tracer, which records one entry per instrumented stage.
+
+        Use it as a context manager to make it the active tracer; every `traced` method
+        and `stage` block run inside reports wall time, CPU time, peak memory, rows in
+        and out and bytes read into it. Stages nest: a stage's figures include those of
+        the stages it calls. Work done in other processes (process pools) is not seen.
+
+        Parameters:
+        - memory (bool): Track peak memory with tracemalloc. Tracing allocations slows
+          Python-heavy code down; disable it to record timings only.
+        """
+        self.memory = memory
+        self.records = []
+        self._local = threading.local()
+        self._origin = None
+        self._started_tracemalloc = False
+        self._previous = None
+
+    def __enter__(self):
+        global _active_tracer
+        self._previous = _active_tracer
+        _active_tracer = self
+        if self._origin is None:
+            self._origin = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active_tracer
+        _active_tracer = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _begin(self, name, rows_in, bytes_read, attributes):
+        stack = self._stack()
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # The enclosing stage keeps its peak so far; this stage starts a fresh one
+            if stack:
+                stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = None
+        record = {
+            "name": name,
+            "parent": stack[-1]["name"] if stack else None,
+            "depth": len(stack),
+            "thread": threading.get_ident(),
+            "rows_in": rows_in,
+            "rows_out": None,
+            "bytes_read": bytes_read,
+            "attributes": dict(attributes),
+            "_start": time.perf_counter(),
+            "_cpu": time.process_time(),
+            "_memory": current,
+            "_peak": current or 0,
+        }
+        stack.append(record)
+        return record
+
+    def _end(self, record):
+        end = time.perf_counter()
+        cpu = time.process_time()
+        stack = self._stack()
+        stack.pop()
+        peak_memory = None
+        if record["_memory"] is not None and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(record["_peak"], peak)
+            peak_memory = (peak - record["_memory"]) / 2**20
+            if stack:
+                stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+            tracemalloc.reset_peak()
+
+        entry = {
+            key: value for key, value in record.items() if not key.startswith("_")
+        }
+        entry.update(
+            start_seconds=record["_start"] - self._origin,
+            wall_seconds=end - record["_start"],
+            cpu_seconds=cpu - record["_cpu"],
+            peak_memory_mb=peak_memory,
+        )
+        self.records.append(entry)
+        logger.debug(
+            "%s: %.3fs wall, %.3fs CPU, rows %s -> %s",
+            entry["name"],
+            entry["wall_seconds"],
+            entry["cpu_seconds"],
+            entry["rows_in"],
+            entry["rows_out"],
+        )
+        return entry
+
+    def summary(self):
+        """
+        Totals per stage name, slowest first.
+
+        Returns:
+        - summary (pd.DataFrame): 'calls', 'wall_seconds', 'cpu_seconds', the largest
+          'peak_memory_mb', 'rows_in', 'rows_out' and 'bytes_read' per stage.
+        """
+        import pandas as pd
+
+        columns = [
+            "name",
+            "wall_seconds",
+            "cpu_seconds",
+            "peak_memory_mb",
+            "rows_in",
+            "rows_out",
+            "bytes_read",
+        ]
+        records = pd.DataFrame(self.records, columns=columns)
+
+        def total(values):
+            # NaN, not 0, when no call reported the figure
+            return values.sum(min_count=1)
+
+        summary = records.groupby("name").agg(
+            calls=("wall_seconds", "size"),
+            wall_seconds=("wall_seconds", "sum"),
+            cpu_seconds=("cpu_seconds", "sum"),
+            peak_memory_mb=("peak_memory_mb", "max"),
+            rows_in=("rows_in", total),
+            rows_out=("rows_out", total),
+            bytes_read=("bytes_read", total),
+        )
+        return summary.sort_values("wall_seconds", ascending=False)
+
+    def write_json(self, path):
+        """
+        Write the records as structured JSON: {"stages": [record, ...]}.
+
+        Parameters:
+        - path (str): Destination path.
+        """
+        _write_json(path, {"stages": self.records})
+
+    def chrome_trace(self):
+        """
+        The records as Chrome trace events ('X' complete events, microseconds), for
+        chrome://tracing or Perfetto.
+
+        Returns:
+        - trace (dict): {"traceEvents": [...], "displayTimeUnit": "ms"}.
+        """
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args = {
+                key: record[key]
+                for key in (
+                    "cpu_seconds",
+                    "peak_memory_mb",
+                    "rows_in",
+                    "rows_out",
+                    "bytes_read",
+                )
+                if record[key] is not None
+            }
+            args.update(record["attributes"])
+            events.append(
+                {
+                    "name": record["name"],
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": record["start_seconds"] * 1e6,
+                    "dur": record["wall_seconds"] * 1e6,
+                    "pid": pid,
+                    "tid": record["thread"],
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        """
+        Write `chrome_trace()` to a JSON file.
+
+        Parameters:
+        - path (str): Destination path.
+        """
+        _write_json(path, self.chrome_trace())
+
+
+def _write_json(path, payload):
+    temp_path = f"{path}.{os.getpid()}.part"
+    with open(temp_path, "w") as file:
+        json.dump(payload, file, indent=2, default=str)
+    os.replace(temp_path, path)
+
+
+def get_tracer():
+    """
+    Return the active Tracer, or None when nothing is being recorded.
+    """
+    return _active_tracer
+
+
+class stage:
+    def __init__(self, name, rows_in=None, bytes_read=None, **attributes):
+        """
+        Record a block of code as a stage of the active tracer; a no-op without one.
+
+        Use as `with stage("name", rows_in=len(data)) as record:` and set
+        `record["rows_out"]` inside the block. `record` is None when not tracing.
+
+        Parameters:
+        - name (str): Stage name.
+        - rows_in (int): Rows the stage consumes.
+        - bytes_read (int): Bytes the stage reads from disk or the network.
+        - attributes: Extra values stored with the record.
+        """
+        self.name = name
+        self.rows_in = rows_in
+        self.bytes_read = bytes_read
+        self.attributes = attributes
+        self.tracer = None
+        self.record = None
+
+    def __enter__(self):
+        self.tracer = _active_tracer
+        if self.tracer is not None:
+            self.record = self.tracer._begin(
+                self.name, self.rows_in, self.bytes_read, self.attributes
+            )
+        return self.record
+
+    def __exit__(self, *exc_info):
+        if self.record is not None:
+            self.tracer._end(self.record)
+
+
+def annotate(**values):
+    """
+    Set values on the innermost running stage, e.g. `annotate(bytes_read=n)` once a
+    reader knows how much it read. A no-op when not tracing.
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return
+    stack = tracer._stack()
+    if stack:
+        for key, value in values.items():
+            if key in ("rows_in", "rows_out", "bytes_read"):
+                stack[-1][key] = value
+            else:
+                stack[-1]["attributes"][key] = value
+
+
+def traced(name=None, rows_in=None):
+    """
+    Decorator that records every call of a function or method as a stage.
+
+    Rows out are taken from the result's first dimension (DataFrame, Series or array)
+    unless the function sets them with `annotate`. Without an active tracer the wrapped
+    function is called directly.
+
+    Parameters:
+    - name (str): Stage name. Defaults to the function's qualified name, e.g.
+      'DataMerge.merge_dataframes'.
+    - rows_in (callable): Called with the function's arguments to count the rows in.
+    """
+
+    def decorate(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            record = tracer._begin(
+                stage_name,
+                None if rows_in is None else rows_in(*args, **kwargs),
+                None,
+                {},
+            )
+            try:
+                result = func(*args, **kwargs)
+                if record["rows_out"] is None:
+                    record["rows_out"] = _count_rows(result)
+                return result
+            finally:
+                tracer._end(record)
+
+        return wrapper
+
+    return decorate
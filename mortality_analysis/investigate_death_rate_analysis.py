@@ -1,6 +1,10 @@
+import logging
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from mortality_analysis.instrumentation import traced
+
+logger = logging.getLogger(__name__)
 
 
 class DeathRateAnalyze:
@@ -14,18 +18,19 @@ class DeathRateAnalyze:
         """
         self.population_data = population_data
 
-    def analyze_and_visualize_death_rate(self):
+    @traced(rows_in=lambda self, n=10: len(self.population_data))
+    def top_death_rate_states(self, n=10):
         """
-        Analyze and visualize the death rate across different states based on the provided population data.
+        Find the states with the highest average death rate, without plotting.
 
-        Output:
-        - Display a scatter plot showing the relationship between death rate and total population for the top 10 states
-          with the highest death rates. The size and color of the points represent different states.
+        Parameters:
+        - n (int): Number of states to return.
+
+        Returns:
+        - pd.DataFrame: 'Jurisdiction' and average 'Death_Rate' of the top n states.
 
         Note:
         - The function modifies the input DataFrame by adding a 'Death_Rate' column.
-        - The 'Death_Rate' is calculated as the ratio of 'Total Deaths' to 'Total_Population'.
-        - The function prints and returns the top 10 states with the highest average death rates.
         """
         # Calculate death rate
         self.population_data["Death_Rate"] = (
@@ -39,12 +44,34 @@ class DeathRateAnalyze:
             .mean()
             .reset_index()
         )
+        return death_rate_by_state.nlargest(n, "Death_Rate")
 
-        # Get the top 10 states with the highest death rates
-        top_10_states = death_rate_by_state.nlargest(10, "Death_Rate")
+    @traced(rows_in=lambda self, *args, **kwargs: len(self.population_data))
+    def analyze_and_visualize_death_rate(self, output_path=None):
+        """
+        Analyze and visualize the death rate across different states based on the provided population data.
 
-        print("Top 10 States with Highest Death Rates:")
-        print(top_10_states)
+        Parameters:
+        - output_path (str): If given, save the figure to this file (PNG, SVG, ...) instead
+          of showing it.
+
+        Output:
+        - Display a scatter plot showing the relationship between death rate and total population for the top 10 states
+          with the highest death rates. The size and color of the points represent different states.
+
+        Note:
+        - The function modifies the input DataFrame by adding a 'Death_Rate' column.
+        - The 'Death_Rate' is calculated as the ratio of 'Total Deaths' to 'Total_Population'.
+        - The function returns the top 10 states with the highest average death rates.
+        """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # Get the top 10 states with the highest death rates
+        top_10_states = self.top_death_rate_states(10)
+        logger.info(
+            "Top 10 States with Highest Death Rates:\n%s", top_10_states.to_string()
+        )
 
         sns.set(style="whitegrid")
 
@@ -66,6 +93,10 @@ class DeathRateAnalyze:
 
         plt.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
 
-        plt.show()
+        if output_path is None:
+            plt.show()
+        else:
+            plt.savefig(output_path, bbox_inches="tight")
+            plt.close()
 
         return top_10_states
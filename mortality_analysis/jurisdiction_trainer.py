@@ -0,0 +1,286 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from mortality_analysis.instrumentation import traced
+from mortality_analysis.predictive_model import make_estimator, time_holdout_mask
+
+# Shared arrays attached by each worker process, set once by the pool initializer.
+_worker_arrays = None
+
+
+def _attach(name, shape):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _init_worker(x_name, x_shape, y_name, y_shape):
+    global _worker_arrays
+    x_block, X = _attach(x_name, x_shape)
+    y_block, y = _attach(y_name, y_shape)
+    # Blocks are kept referenced so the views stay valid for the worker's lifetime
+    _worker_arrays = (X, y, x_block, y_block)
+
+
+def _train_group(task, X=None, y=None):
+    """
+    Train and evaluate one jurisdiction's model on rows start:stop of the shared arrays.
+    """
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    if X is None:
+        X, y = _worker_arrays[:2]
+    jurisdiction, start, stop, settings = task
+    # Columns past the features only carry the periods
+    X_group, y_group = X[start:stop], y[start:stop]
+    features = X_group[:, : settings["n_features"]]
+    metrics = {"rows": stop - start}
+    try:
+        if stop - start < settings["min_rows"]:
+            raise ValueError(f"Too few rows ({stop - start}) to train and evaluate.")
+        if settings["time_index"] is None:
+            rng = np.random.default_rng(settings["random_state"])
+            test = np.zeros(stop - start, dtype=bool)
+            n_test = max(1, int(round(settings["test_size"] * (stop - start))))
+            test[rng.choice(stop - start, n_test, replace=False)] = True
+        else:
+            test = time_holdout_mask(
+                X_group[:, settings["time_index"]], settings["test_size"]
+            )
+
+        model = make_estimator(settings["backend"], **settings["params"])
+        fit_start = time.perf_counter()
+        model.fit(features[~test], y_group[~test])
+        metrics["fit_seconds"] = time.perf_counter() - fit_start
+        y_pred = model.predict(features[test])
+        metrics.update(
+            train_rows=int((~test).sum()),
+            test_rows=int(test.sum()),
+            mae=mean_absolute_error(y_group[test], y_pred),
+            mse=mean_squared_error(y_group[test], y_pred),
+            r2=r2_score(y_group[test], y_pred) if test.sum() > 1 else np.nan,
+            error=None,
+        )
+    except Exception as exc:
+        model = None
+        metrics["error"] = repr(exc)
+    return jurisdiction, metrics, model
+
+
+class JurisdictionTrainer:
+    def __init__(
+        self,
+        merged_data,
+        target_column="Total Deaths",
+        group_column="Jurisdiction",
+        backend="decision_tree",
+        max_workers=None,
+        test_size=0.2,
+        time_column=None,
+        min_rows=10,
+        random_state=42,
+        **params,
+    ):
+        """
+        Initialize the JurisdictionTrainer, which fits one model per jurisdiction.
+
+        Rows are grouped once: the numeric features and target are sorted by
+        jurisdiction into two float arrays placed in shared memory, and each worker
+        reads its group as a contiguous slice without copying or re-slicing
+        the DataFrame.
+
+        Parameters:
+        - merged_data (pd.DataFrame): Output of `DataMerge.merge_dataframes`, or any
+          frame with the group column, the target and numeric features.
+        - target_column (str): Column to predict.
+        - group_column (str): Column whose values get their own model.
+        - backend (str): Model backend from `MODEL_BACKENDS`; `params` override its
+          defaults.
+        - max_workers (int): Number of worker processes. Defaults to the CPU count; 1
+          trains in this process.
+        - test_size (float): Share of each group's rows held out for evaluation.
+        - time_column (str): Column holding the period, e.g. 'Quarter' or a numeric
+          feature. If given, each group holds out its latest periods instead of a random
+          sample. A column that is not a feature is never used as a predictor.
+        - min_rows (int): Groups with fewer rows are reported with an error.
+        - random_state (int): Seed of the random holdout.
+        """
+        self.merged_data = merged_data
+        self.target_column = target_column
+        self.group_column = group_column
+        self.backend = backend
+        self.max_workers = max_workers
+        self.test_size = test_size
+        self.time_column = time_column
+        self.min_rows = min_rows
+        self.random_state = random_state
+        self.params = params
+        self.feature_names = None
+        self.metrics = None
+        self.registry = {}
+
+    def _group_arrays(self):
+        """
+        Sort the feature matrix and target by group once.
+
+        Returns:
+        - X (np.ndarray): Features, rows sorted by group. If the time column is not a
+          feature, its sorted period codes are appended as a last column.
+        - y (np.ndarray): Target, aligned with X.
+        - groups (list): (group, start, stop) row ranges.
+        """
+        data = self.merged_data[self.merged_data[self.target_column].notna()]
+        self.feature_names = [
+            column
+            for column in data.select_dtypes(include=[np.number]).columns
+            if column not in (self.target_column, self.group_column)
+        ]
+        codes, uniques = pd.factorize(data[self.group_column], sort=True)
+        order = np.argsort(codes, kind="stable")
+        X = data[self.feature_names].to_numpy(dtype=np.float64, na_value=np.nan)
+        if self.time_column is not None and self.time_column not in self.feature_names:
+            periods, _ = pd.factorize(data[self.time_column], sort=True)
+            X = np.column_stack([X, periods.astype(np.float64)])
+        X = X[order]
+        y = data[self.target_column].to_numpy(dtype=np.float64)[order]
+        stops = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))
+        starts = stops - np.bincount(codes[codes >= 0], minlength=len(uniques))
+        # Rows without a group sort first, before every group's range
+        offset = int((codes < 0).sum())
+        groups = [
+            (group, int(start) + offset, int(stop) + offset)
+            for group, start, stop in zip(uniques, starts, stops)
+        ]
+        return X, y, groups
+
+    @traced(rows_in=lambda self: len(self.merged_data))
+    def train(self):
+        """
+        Train and evaluate every jurisdiction's model in a process pool.
+
+        Returns:
+        - metrics (pd.DataFrame): One row per jurisdiction with 'rows', 'train_rows',
+          'test_rows', 'fit_seconds', 'mae', 'mse', 'r2' and 'error' (None on success).
+          The fitted models are in `self.registry`, keyed by jurisdiction.
+        """
+        X, y, groups = self._group_arrays()
+        if self.time_column is None:
+            time_index = None
+        elif self.time_column in self.feature_names:
+            time_index = self.feature_names.index(self.time_column)
+        else:
+            time_index = len(self.feature_names)
+        settings = {
+            "n_features": len(self.feature_names),
+            "backend": self.backend,
+            "params": self.params,
+            "test_size": self.test_size,
+            "min_rows": self.min_rows,
+            "random_state": self.random_state,
+            "time_index": time_index,
+        }
+        tasks = [(group, start, stop, settings) for group, start, stop in groups]
+
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(tasks) or 1)
+        if max_workers <= 1:
+            results = [_train_group(task, X, y) for task in tasks]
+        else:
+            results = self._train_shared(X, y, tasks, max_workers)
+
+        self.registry = {
+            group: model for group, _, model in results if model is not None
+        }
+        self.metrics = pd.DataFrame(
+            [metrics for _, metrics, _ in results],
+            index=pd.Index([group for group, _, _ in results], name=self.group_column),
+        )
+        return self.metrics
+
+    def _train_shared(self, X, y, tasks, max_workers):
+        blocks = []
+        try:
+            arrays = []
+            for array in (X, y):
+                size = max(array.nbytes, 1)
+                block = shared_memory.SharedMemory(create=True, size=size)
+                blocks.append(block)
+                np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)[:] = array
+                arrays.append((block.name, array.shape))
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(*arrays[0], *arrays[1]),
+            ) as executor:
+                return list(executor.map(_train_group, tasks))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    @traced(rows_in=lambda self, data: len(data))
+    def predict(self, data):
+        """
+        Predict each row with its own jurisdiction's model.
+
+        Parameters:
+        - data (pd.DataFrame): Rows with the group column and the feature columns.
+
+        Returns:
+        - predictions (pd.Series): Prediction per row; NaN where the jurisdiction has no
+          model.
+        """
+        predictions = pd.Series(np.nan, index=data.index, name="prediction")
+        for group, rows in data.groupby(self.group_column, sort=False).groups.items():
+            model = self.registry.get(group)
+            if model is not None:
+                X = data.loc[rows, self.feature_names].to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+                predictions[rows] = model.predict(X)
+        return predictions
+
+    def save(self, path):
+        """
+        Save the model registry, feature list and metrics to one joblib file.
+
+        Parameters:
+        - path (str): Destination path.
+        """
+        import joblib
+
+        state = {
+            "registry": self.registry,
+            "feature_names": self.feature_names,
+            "group_column": self.group_column,
+            "backend": self.backend,
+            "metrics": self.metrics,
+        }
+        temp_path = f"{path}.{os.getpid()}.part"
+        joblib.dump(state, temp_path)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a trainer saved with `save`, ready for `predict`.
+
+        Parameters:
+        - path (str): Path of the saved file.
+
+        Returns:
+        - JurisdictionTrainer: Trainer holding the saved registry and metrics.
+        """
+        import joblib
+
+        state = joblib.load(path)
+        trainer = cls(
+            None, group_column=state["group_column"], backend=state["backend"]
+        )
+        trainer.registry = state["registry"]
+        trainer.feature_names = state["feature_names"]
+        trainer.metrics = state["metrics"]
+        return trainer
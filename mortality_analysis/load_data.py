@@ -1,66 +1,331 @@
+import hashlib
+import json
+import logging
 import os
-import requests
+import tempfile
+
 import pandas as pd
 
+from mortality_analysis.data_cleaning import COLUMN_RENAMES
+from mortality_analysis.instrumentation import annotate, traced
+
+logger = logging.getLogger(__name__)
+
+# Columns of the CDC weekly export that survive preprocessing, and their dtypes.
+CDC_USECOLS = list(COLUMN_RENAMES)
+CDC_DATE_COLUMNS = ["Data As Of", "Week Ending Date"]
+CDC_DTYPES = {
+    "Jurisdiction of Occurrence": "category",
+    "MMWR Year": "int16",
+    "MMWR Week": "int8",
+}
+CDC_DTYPES.update(
+    {
+        column: "float64"
+        for column in CDC_USECOLS
+        if column not in CDC_DTYPES and column not in CDC_DATE_COLUMNS
+    }
+)
+
+
+def hash_file(file_path, extra="", chunk_size=1 << 20):
+    """
+    Compute a SHA-256 hex digest of a file's contents, optionally salted with extra text.
+    """
+    digest = hashlib.sha256(extra.encode())
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class Loaddata:
-    def __init__(self, url):
+    def __init__(
+        self,
+        url,
+        file_name="Mortalities_by_different_causes.csv",
+        cache_dir=".mortality_cache",
+    ):
         self.url = url
-        self.file_name = "Mortalities_by_different_causes.csv"
+        self.file_name = file_name
+        self.metadata_file = f"{file_name}.meta.json"
+        self.cache_dir = cache_dir
+        self.last_download = None
+
+    def _read_cache_metadata(self):
+        """
+        Read the validators (ETag / Last-Modified) stored alongside the cached file.
 
-    def download_cdc_data(self):
+        Returns:
+        - metadata (dict): Stored validators, or an empty dict if there is no usable cache.
+        """
+        if not (os.path.exists(self.file_name) and os.path.exists(self.metadata_file)):
+            return {}
+        try:
+            with open(self.metadata_file, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache_metadata(self, response):
+        metadata = {
+            "url": self.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        temp_path = f"{self.metadata_file}.{os.getpid()}.part"
+        with open(temp_path, "w") as file:
+            json.dump(metadata, file)
+        os.replace(temp_path, self.metadata_file)
+
+    @traced()
+    def download_cdc_data(self, chunk_size=1 << 20, timeout=60):
         """
         Download CDC data from the given URL and save it to a CSV file.
 
+        The request is conditional: if a cached copy exists, its ETag and Last-Modified
+        validators are sent and a 304 response reuses the file without any transfer.
+        Otherwise the body is streamed in chunks to a temporary file which is then
+        atomically renamed over the cached copy.
+
+        Parameters:
+        - chunk_size (int): Number of bytes read from the response per chunk.
+        - timeout (float): Request timeout in seconds.
+
         Returns:
-        - file_path (str): Path to the downloaded file.
+        - file_path (str): Path to the downloaded file, or None if the download failed.
+
+        Note:
+        - Details of the last call are stored in `self.last_download` with the keys
+          'cache_hit', 'bytes_transferred' and 'status_code'.
         """
-        # Check if the file already exists
-        if os.path.exists(self.file_name):
-            os.remove(self.file_name)
-            print(f"Deleted existing file: {self.file_name}")
-
-        # Download the data from the URL
-        response = requests.get(self.url)
-
-        if response.status_code == 200:
-            with open(self.file_name, "wb") as file:
-                file.write(response.content)
-            print(f"Downloaded CDC data to: {self.file_name}")
-            return self.file_name
-        else:
-            print(f"Failed to download CDC data. Status code: {response.status_code}")
-            return None
-
-    def load_cdc_data(self):
+        import requests
+
+        headers = {}
+        metadata = self._read_cache_metadata()
+        if metadata.get("url") == self.url:
+            if metadata.get("etag"):
+                headers["If-None-Match"] = metadata["etag"]
+            if metadata.get("last_modified"):
+                headers["If-Modified-Since"] = metadata["last_modified"]
+
+        with requests.get(
+            self.url, headers=headers, stream=True, timeout=timeout
+        ) as response:
+            if response.status_code == 304:
+                self.last_download = {
+                    "cache_hit": True,
+                    "bytes_transferred": 0,
+                    "status_code": response.status_code,
+                }
+                annotate(bytes_read=0)
+                logger.info(
+                    "CDC data not modified, using cached file: %s", self.file_name
+                )
+                return self.file_name
+
+            if response.status_code != 200:
+                self.last_download = {
+                    "cache_hit": False,
+                    "bytes_transferred": 0,
+                    "status_code": response.status_code,
+                }
+                logger.error(
+                    "Failed to download CDC data. Status code: %s", response.status_code
+                )
+                return None
+
+            bytes_transferred = 0
+            directory = os.path.dirname(os.path.abspath(self.file_name))
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        file.write(chunk)
+                        bytes_transferred += len(chunk)
+                os.replace(temp_path, self.file_name)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            self._write_cache_metadata(response)
+
+        self.last_download = {
+            "cache_hit": False,
+            "bytes_transferred": bytes_transferred,
+            "status_code": 200,
+        }
+        annotate(bytes_read=bytes_transferred)
+        logger.info(
+            "Downloaded CDC data to: %s (%d bytes)", self.file_name, bytes_transferred
+        )
+        return self.file_name
+
+    @traced()
+    def load_cdc_data(self, engine=None):
         """
         Load CDC data from the CSV file into a DataFrame.
 
+        Parameters:
+        - engine (str): CSV parser engine passed to `pd.read_csv`, e.g. 'pyarrow'. Defaults to pandas' own.
+
         Returns:
         - cdc_dataset (pd.DataFrame): DataFrame with the downloaded CDC data.
         """
         filename = self.download_cdc_data()
-        if os.path.exists(filename):
-            cdc_dataset = pd.read_csv(filename)
-            print(f"Loaded CDC data from: {filename}")
-        else:
-            print("CDC data file does not exist.")
+        if filename is None or not os.path.exists(filename):
+            logger.error("CDC data file does not exist.")
             return "Error"
-        data = pd.read_csv(self.file_name)
-        return data
+        cdc_dataset = self.read_cdc_csv(filename, engine=engine)
+        logger.info("Loaded CDC data from: %s", filename)
+        return cdc_dataset
+
+    @traced()
+    def read_cdc_csv(self, file_path, engine=None):
+        """
+        Parse a CDC weekly CSV once with an explicit schema, using the Parquet cache when possible.
+
+        Only the columns kept by `CDCDataProcessor` are read, with declared dtypes,
+        categorical jurisdictions and parsed dates. The parsed frame is cached as
+        Parquet under `self.cache_dir`, keyed by a hash of the file contents and the
+        schema, so a later call on the same file skips CSV tokenizing entirely.
+
+        Parameters:
+        - file_path (str): Path to the CDC CSV file.
+        - engine (str): CSV parser engine passed to `pd.read_csv`, e.g. 'pyarrow'.
 
-    def load_population_data(self):
-        second_url = "https://raw.githubusercontent.com/LokeshDondapati/Mortality_Analysis/main/Datasets/BEA%20Population%20Data.csv"
-        data = pd.read_csv(second_url)
+        Returns:
+        - data (pd.DataFrame): The parsed CDC data.
+        """
+        cache_path = None
+        if self.cache_dir is not None:
+            digest = hash_file(file_path, extra=repr((CDC_USECOLS, CDC_DTYPES)))
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            cache_path = os.path.join(self.cache_dir, f"{stem}-{digest[:16]}.parquet")
+            if os.path.exists(cache_path):
+                try:
+                    data = pd.read_parquet(cache_path)
+                    # The CSV is still read once to hash it
+                    annotate(
+                        bytes_read=os.path.getsize(file_path)
+                        + os.path.getsize(cache_path)
+                    )
+                    return data
+                except ImportError:
+                    cache_path = None
+
+        data = pd.read_csv(
+            file_path,
+            usecols=CDC_USECOLS,
+            dtype=CDC_DTYPES,
+            parse_dates=CDC_DATE_COLUMNS,
+            engine=engine,
+        )
+        # Hashing for the cache key reads the file a second time
+        reads = 1 if self.cache_dir is None else 2
+        annotate(bytes_read=reads * os.path.getsize(file_path))
+
+        if cache_path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.{os.getpid()}.part"
+            try:
+                data.to_parquet(temp_path, index=False)
+                os.replace(temp_path, cache_path)
+            except ImportError:
+                # No Parquet engine (pyarrow/fastparquet) installed; skip caching.
+                pass
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
         return data
 
+    def read_cdc_csv_chunks(self, file_path, chunksize=100_000, engine=None):
+        """
+        Iterate over a CDC weekly CSV in chunks using the same schema as `read_cdc_csv`.
+
+        Parameters:
+        - file_path (str): Path to the CDC CSV file.
+        - chunksize (int): Number of rows per chunk.
+        - engine (str): CSV parser engine passed to `pd.read_csv`.
+
+        Returns:
+        - chunks (iterator): Iterator of DataFrame chunks, suitable for
+          `CDCDataProcessor.preprocess_chunks`.
+        """
+        return pd.read_csv(
+            file_path,
+            usecols=CDC_USECOLS,
+            dtype=CDC_DTYPES,
+            parse_dates=CDC_DATE_COLUMNS,
+            engine=engine,
+            chunksize=chunksize,
+        )
+
+    def read_cdc_csv_filtered(self, file_path, row_filter, block_size=1 << 23):
+        """
+        Stream a CDC weekly CSV with pyarrow and keep only the rows selected by a filter.
+
+        Every block is tokenized by pyarrow's CSV reader, but only the selected rows are
+        converted to pandas, so the cost of a mostly discarded file is close to a bare
+        tokenizer pass.
+
+        Parameters:
+        - file_path (str): Path to the CDC CSV file.
+        - row_filter (callable): Takes a `pyarrow.RecordBatch` with the raw column names
+          (dates parsed as timestamps) and returns a boolean mask of rows to keep. None
+          keeps every row.
+        - block_size (int): Bytes of CSV parsed per batch.
 
-# Specify the URL and file name
-cdc_url = "https://data.cdc.gov/api/views/muzy-jte6/rows.csv?accessType=DOWNLOAD"
-file_name = "cdc_data.csv"
+        Returns:
+        - chunks (iterator): DataFrame chunks with the `read_cdc_csv` schema.
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        column_types = {column: pa.timestamp("s") for column in CDC_DATE_COLUMNS}
+        column_types.update(
+            {
+                column: pa.float64()
+                for column, dtype in CDC_DTYPES.items()
+                if dtype == "float64"
+            }
+        )
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(block_size=block_size),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=CDC_USECOLS,
+                column_types=column_types,
+                timestamp_parsers=[pacsv.ISO8601, "%m/%d/%Y"],
+            ),
+        )
+
+        def chunks():
+            for batch in reader:
+                if row_filter is not None:
+                    batch = batch.filter(row_filter(batch))
+                if batch.num_rows:
+                    yield batch.to_pandas().astype(CDC_DTYPES)
+
+        # The reader is opened here, so a missing pyarrow raises on call, not on iteration
+        return chunks()
+
+    @traced()
+    def load_population_data(self, file_path=None):
+        """
+        Load the BEA population data, preferring the bundled package file over the network.
+
+        Parameters:
+        - file_path (str): Explicit path to a BEA CSV.
+
+        Returns:
+        - data (pd.DataFrame): The wide BEA population table.
+        """
+        from mortality_analysis.population import resolve_population_source
+
+        data = pd.read_csv(resolve_population_source(file_path))
+        return data
 
-# Create an instance of the CDCDataDownloader class
-cdc_downloader = Loaddata(cdc_url)
 
-# Download CDC data and read it into a DataFrame
-cdc_dataset = cdc_downloader.load_cdc_data()
+# Default CDC export URL. Nothing is downloaded at import time; call
+# Loaddata(CDC_URL).load_cdc_data() explicitly.
+CDC_URL = "https://data.cdc.gov/api/views/muzy-jte6/rows.csv?accessType=DOWNLOAD"
@@ -1,76 +1,197 @@
+import logging
+
+import numpy as np
 import pandas as pd
 
+from mortality_analysis.instrumentation import traced
+from mortality_analysis.quarterly_rollup import period_ordinals
+
+logger = logging.getLogger(__name__)
+
+# Columns of the merged dataset, in order.
+MERGED_COLUMNS = [
+    "Jurisdiction",
+    "Year",
+    "Quarter",
+    "GeoName",
+    "Total_Population",
+    "Total Deaths",
+    "Natural Deaths",
+    "Septicemia",
+    "Malignant Neoplasms",
+    "Diabetes",
+    "Alzheimer",
+    "Influenza and Pneumonia",
+    "Chronic Respiratory Diseases",
+    "Other Respiratory Diseases",
+    "Nephritis",
+    "Abnormal Findings",
+    "Heart Diseases",
+    "Cerebrovascular Diseases",
+    "COVID-19 (Multiple Cause)",
+    "COVID-19 (Underlying Cause)",
+]
+
+
+class JoinIndex:
+    def __init__(self, population_data):
+        """
+        Build a reusable integer join index over long-form population data.
+
+        GeoNames are mapped to integer codes and quarters to integer ordinals, and a dense
+        (geo code, quarter) array stores the position of each population row. The input
+        frame is not modified.
+
+        Parameters:
+        - population_data (pd.DataFrame): Long-form population data with 'GeoName',
+          'Quaterly' (or 'Quarter') and 'Total_Population' columns.
+        """
+        quarter_column = "Quaterly" if "Quaterly" in population_data else "Quarter"
+        self.population_data = population_data
+        geo_codes, geo_names = pd.factorize(population_data["GeoName"])
+        self.geo_index = pd.Index(geo_names)
+
+        ordinals = period_ordinals(population_data[quarter_column])
+        self.first_quarter = int(ordinals.min()) if len(ordinals) else 0
+        n_quarters = int(ordinals.max()) - self.first_quarter + 1 if len(ordinals) else 0
+
+        self.row_lookup = np.full((len(geo_names), n_quarters), -1, dtype=np.int64)
+        self.row_lookup[geo_codes, ordinals - self.first_quarter] = np.arange(
+            len(population_data)
+        )
+
+    def locate(self, jurisdictions, quarters):
+        """
+        Find the population row matching each (jurisdiction, quarter) pair.
+
+        Parameters:
+        - jurisdictions (array-like): Jurisdiction names.
+        - quarters (array-like): Quarters as Periods or strings.
+
+        Returns:
+        - rows (np.ndarray): Population row positions, -1 where there is no match.
+        """
+        # Look up each distinct name once
+        name_codes, names = pd.factorize(pd.Series(jurisdictions).astype(str))
+        geo_codes = self.geo_index.get_indexer(names)[name_codes]
+        quarter_codes = period_ordinals(quarters) - self.first_quarter
+
+        valid = (
+            (name_codes >= 0)
+            & (geo_codes >= 0)
+            & (quarter_codes >= 0)
+            & (quarter_codes < self.row_lookup.shape[1])
+        )
+        rows = np.full(len(geo_codes), -1, dtype=np.int64)
+        rows[valid] = self.row_lookup[geo_codes[valid], quarter_codes[valid]]
+        return rows
+
 
 class DataMerge:
-    def __init__(self, cdc_data, population_data):
+    def __init__(self, cdc_data, population_data, join_index=None):
         """
         Initialize the DataMerger.
 
         Parameters:
         - cdc_data (pd.DataFrame): The CDC data DataFrame.
         - population_data (pd.DataFrame): The Geo data DataFrame.
+        - join_index (JoinIndex): Prebuilt index over `population_data`, reusable across
+          repeated merges.
         """
         self.cdc_data = cdc_data
         self.population_data = population_data
+        self.join_index = join_index
+        self.unmatched = None
 
-    def merge_dataframes(self):
+    def find_unmatched(self):
         """
-        Merge CDC data and Geo data based on 'Jurisdiction', 'Quarter', 'GeoName', and 'Year'.
+        Find the names present on only one side of the merge, without merging.
 
         Returns:
-        - merged_data (pd.DataFrame): The merged DataFrame.
+        - unmatched (dict): Sets of names under the keys 'jurisdictions_without_population'
+          and 'geo_names_without_cdc', also stored in `self.unmatched`.
         """
+        if self.join_index is None:
+            self.join_index = JoinIndex(self.population_data)
+
         # Check for unique GeoName and Jurisdiction names
-        unique_geo_names = self.population_data["GeoName"].unique()
-        unique_jurisdiction_names = self.cdc_data["Jurisdiction"].unique()
+        unique_geo_names = set(self.join_index.geo_index.astype(str))
+        unique_jurisdiction_names = set(
+            pd.unique(self.cdc_data["Jurisdiction"].astype(str))
+        )
+        self.unmatched = {
+            "jurisdictions_without_population": unique_jurisdiction_names
+            - unique_geo_names,
+            "geo_names_without_cdc": unique_geo_names - unique_jurisdiction_names,
+        }
+
+        logger.info(
+            "Jurisdictions without population data: %s",
+            sorted(self.unmatched["jurisdictions_without_population"]),
+        )
+        logger.info(
+            "GeoNames without CDC data: %s",
+            sorted(self.unmatched["geo_names_without_cdc"]),
+        )
+        return self.unmatched
+
+    @traced(rows_in=lambda self: len(self.cdc_data))
+    def merge_dataframes(self):
+        """
+        Merge CDC data and Geo data based on 'Jurisdiction', 'Quarter', 'GeoName', and 'Year'.
 
-        # Find differences between unique names
-        difference1 = set(unique_jurisdiction_names) - set(unique_geo_names)
-        difference2 = set(unique_geo_names) - set(unique_jurisdiction_names)
+        The join runs on integer keys through a `JoinIndex` and leaves both inputs unchanged.
+        Names present on only one side are stored in `self.unmatched`, see
+        `find_unmatched`.
 
-        print("Elements in array1 but not in array2:", difference1)
-        print("Elements in array2 but not in array1:", difference2)
+        Returns:
+        - merged_data (pd.DataFrame): The merged DataFrame.
+        """
+        self.find_unmatched()
+        join_index = self.join_index
 
-        # Ensure Quarter columns are of the same type
-        self.cdc_data["Quarter"] = self.cdc_data["Quarter"].astype(str)
-        self.population_data["Quaterly"] = (
-            self.population_data["Quaterly"].astype(str).str.replace(":", "")
+        # Perform the merge on integer keys
+        rows = join_index.locate(
+            self.cdc_data["Jurisdiction"], self.cdc_data["Quarter"]
         )
-        self.population_data.rename(columns={"Quaterly": "Quarter"}, inplace=True)
-
-        # Perform the merge
-        merged_data = pd.merge(
-            self.cdc_data,
-            self.population_data,
-            left_on=["Jurisdiction", "Quarter"],
-            right_on=["GeoName", "Quarter"],
-            how="inner",
+        matched = rows >= 0
+        cdc_part = self.cdc_data.loc[
+            matched, [c for c in MERGED_COLUMNS if c in self.cdc_data.columns]
+        ].reset_index(drop=True)
+        population_part = join_index.population_data.iloc[rows[matched]]
+
+        merged_data = cdc_part.assign(
+            Quarter=cdc_part["Quarter"].astype(str),
+            GeoName=population_part["GeoName"].to_numpy(),
+            Total_Population=population_part["Total_Population"].to_numpy(),
         )
 
         # Select relevant columns
-        merged_data = merged_data[
-            [
-                "Jurisdiction",
-                "Year",
-                "Quarter",
-                "GeoName",
-                "Total_Population",
-                "Total Deaths",
-                "Natural Deaths",
-                "Septicemia",
-                "Malignant Neoplasms",
-                "Diabetes",
-                "Alzheimer",
-                "Influenza and Pneumonia",
-                "Chronic Respiratory Diseases",
-                "Other Respiratory Diseases",
-                "Nephritis",
-                "Abnormal Findings",
-                "Heart Diseases",
-                "Cerebrovascular Diseases",
-                "COVID-19 (Multiple Cause)",
-                "COVID-19 (Underlying Cause)",
-            ]
-        ]
+        merged_data = merged_data[MERGED_COLUMNS]
 
         return merged_data
+
+    @traced(rows_in=lambda self, merged_data: len(self.cdc_data))
+    def merge_partitions(self, merged_data):
+        """
+        Recompute only the quarters present in `self.cdc_data` and splice them into an
+        earlier merged result.
+
+        Use it after `IncrementalStore.refresh`: `self.cdc_data` holds the preprocessed
+        rows of the affected partitions only, and every other quarter of `merged_data`
+        is kept as it is.
+
+        Parameters:
+        - merged_data (pd.DataFrame): Earlier output of `merge_dataframes`.
+
+        Returns:
+        - merged_data (pd.DataFrame): `merged_data` with the affected quarters replaced,
+          sorted by 'Quarter' and 'Jurisdiction'.
+        """
+        updated = self.merge_dataframes()
+        affected = pd.unique(self.cdc_data["Quarter"].astype(str))
+        kept = merged_data[~merged_data["Quarter"].isin(affected)]
+        merged_data = pd.concat([kept, updated], ignore_index=True)
+        return merged_data.sort_values(
+            ["Quarter", "Jurisdiction"], kind="stable", ignore_index=True
+        )
@@ -0,0 +1,348 @@
+import functools
+import hashlib
+import logging
+import os
+import pickle
+
+import pandas as pd
+
+from mortality_analysis.instrumentation import stage
+from mortality_analysis.load_data import CDC_URL, Loaddata, hash_file
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(value):
+    """
+    Compute a content fingerprint for a stage input.
+
+    Parameters:
+    - value: A DataFrame or Series (hashed with `pd.util.hash_pandas_object`), a path to an
+      existing file (hashed by content), or any other value with a stable repr.
+
+    Returns:
+    - digest (str): SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+            digest.update(repr(list(value.dtypes.astype(str))).encode())
+    elif isinstance(value, str) and os.path.isfile(value):
+        digest.update(hash_file(value).encode())
+    else:
+        digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint():
+    """
+    Hash the package's source files, so cached stage outputs are invalidated whenever the
+    code that produced them changes.
+
+    Returns:
+    - digest (str): SHA-256 hex digest of every module of the package.
+    """
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            digest.update(hash_file(os.path.join(package_dir, name)).encode())
+    return digest.hexdigest()
+
+
+class StageCache:
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        """
+        Initialize the StageCache.
+
+        Stage outputs are pickled to `cache_dir`, one file per key. When the directory grows
+        beyond `max_bytes`, the least recently used entries are evicted.
+
+        Parameters:
+        - cache_dir (str): Directory holding the cached stage outputs.
+        - max_bytes (int): Maximum total size of the cache in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Return the cached value for a key, or None on a miss.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        with open(path, "rb") as file:
+            value = pickle.load(file)
+        # Mark as recently used for eviction
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value under a key and evict old entries if the cache is over budget.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.part"
+        with open(temp_path, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in `max_bytes`.
+
+        Returns:
+        - removed (list): Keys that were evicted.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+
+        removed = []
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            removed.append(name[: -len(".pkl")])
+        return removed
+
+
+class Pipeline:
+    # Upstream stages of each stage
+    UPSTREAM = {
+        "load": [],
+        "clean": ["load"],
+        "population": [],
+        "merge": ["clean", "population"],
+        "prepare": ["merge"],
+    }
+
+    def __init__(
+        self,
+        url=CDC_URL,
+        cdc_file=None,
+        population_file=None,
+        cache_dir=".mortality_cache",
+        max_cache_bytes=1 << 30,
+        aggregation="first",
+        target_column="Total Deaths",
+        k=9,
+        selection="pearson",
+        period_column="Quarter",
+    ):
+        """
+        Initialize the Pipeline wrapping load -> clean -> merge -> prepare.
+
+        Each stage's cache key is a fingerprint of its inputs plus its parameters. Outputs
+        produced by the pipeline are identified by their stage key, so downstream stages are
+        served from the cache whenever nothing upstream changed.
+
+        Parameters:
+        - url (str): CDC export URL, downloaded conditionally by `Loaddata`.
+        - cdc_file (str): Local CDC CSV to use instead of downloading.
+        - population_file (str): BEA CSV. Defaults to the bundled package file.
+        - cache_dir (str): Root cache directory; stage outputs go to `cache_dir/stages`.
+        - max_cache_bytes (int): Size budget of the stage cache.
+        - aggregation (str): Quarterly aggregation passed to `CDCDataProcessor`; the same
+          default, so pipeline and library outputs are on the same scale.
+        - target_column (str): Target column passed to `DataPreparation`.
+        - k (int): Number of features selected by `DataPreparation`.
+        - selection (str): Feature selection strategy passed to `DataPreparation`.
+        - period_column (str): Column `DataPreparation` carries through the 'prepare'
+          stage for time-aware splits, without using it as a feature.
+        """
+        self.loader = Loaddata(url, cache_dir=cache_dir)
+        self.cache_dir = cache_dir
+        self.cdc_file = cdc_file
+        self.population_file = population_file
+        self.cache = StageCache(os.path.join(cache_dir, "stages"), max_cache_bytes)
+        self.aggregation = aggregation
+        self.target_column = target_column
+        self.k = k
+        self.selection = selection
+        self.period_column = period_column
+        self.results = {}
+        self.keys = {}
+        self._sources = {}
+
+    def _source_fingerprint(self, name):
+        """
+        Fingerprint the source file of the 'load' or 'population' stage.
+        """
+        if name not in self._sources:
+            if name == "load":
+                file_path = self.cdc_file or self.loader.download_cdc_data()
+                if file_path is None:
+                    raise RuntimeError("CDC data could not be downloaded.")
+            else:
+                from mortality_analysis.population import resolve_population_source
+
+                file_path = resolve_population_source(self.population_file)
+            self._sources[name] = (file_path, fingerprint(file_path))
+        return self._sources[name][1]
+
+    def stage_key(self, name):
+        """
+        Compute the cache key of a stage from its inputs' fingerprints and its parameters.
+
+        Source stages are keyed by the content of their file; every other stage by the keys
+        of its upstream stages, so frames produced by the pipeline are never rehashed. Every
+        key includes `code_fingerprint()`, so entries written by other code are not reused.
+
+        Parameters:
+        - name (str): Stage name.
+
+        Returns:
+        - key (str): Cache key for the stage.
+        """
+        if name not in self.keys:
+            if name in ("load", "population"):
+                inputs = [self._source_fingerprint(name)]
+            else:
+                inputs = [self.stage_key(upstream) for upstream in self.UPSTREAM[name]]
+            params = sorted(self._stage_params(name).items())
+            self.keys[name] = fingerprint(
+                (name, code_fingerprint(), tuple(inputs), params)
+            )
+        return self.keys[name]
+
+    def _stage_params(self, name):
+        if name == "clean":
+            return {"aggregation": self.aggregation}
+        if name == "prepare":
+            return {
+                "target_column": self.target_column,
+                "k": self.k,
+                "selection": self.selection,
+                "period_column": self.period_column,
+            }
+        return {}
+
+    def _run_stage(self, name, func, cache=True):
+        """
+        Run a stage, or serve it from the cache if its inputs and parameters are unchanged.
+
+        Upstream stages are only evaluated inside `func`, i.e. on a cache miss.
+        """
+        if name in self.results:
+            return self.results[name]
+
+        key = self.stage_key(name)
+        with stage(f"Pipeline.{name}") as record:
+            value = self.cache.get(key) if cache else None
+            cache_hit = value is not None
+            if not cache_hit:
+                logger.info("Running stage '%s'", name)
+                value = func()
+                if cache:
+                    self.cache.put(key, value)
+            else:
+                logger.info("Stage '%s' served from cache", name)
+            if record is not None:
+                record["rows_out"] = len(value)
+                record["attributes"]["cache_hit"] = cache_hit
+
+        self.results[name] = value
+        return value
+
+    def load(self):
+        """
+        Load the raw CDC data. Keyed by the content hash of the CSV file.
+        """
+        self._source_fingerprint("load")
+        file_path = self._sources["load"][0]
+        # Loaddata keeps its own Parquet cache of the parsed CSV
+        return self._run_stage(
+            "load", lambda: self.loader.read_cdc_csv(file_path), cache=False
+        )
+
+    def clean(self):
+        """
+        Preprocess the CDC data with `CDCDataProcessor`.
+        """
+        from mortality_analysis.data_cleaning import CDCDataProcessor
+
+        return self._run_stage(
+            "clean",
+            lambda: CDCDataProcessor(
+                self.load(), aggregation=self.aggregation
+            ).preprocess_data(),
+        )
+
+    def population(self):
+        """
+        Load the long-form population data with `PopulationProvider`.
+        """
+        from mortality_analysis.population import PopulationProvider
+
+        return self._run_stage(
+            "population",
+            lambda: PopulationProvider(
+                self.population_file, cache_dir=self.cache_dir
+            ).to_long_frame(),
+        )
+
+    def merge(self):
+        """
+        Merge the cleaned CDC data with population data using `DataMerge`.
+        """
+        from mortality_analysis.merge_data import DataMerge
+
+        return self._run_stage(
+            "merge",
+            lambda: DataMerge(self.clean(), self.population()).merge_dataframes(),
+        )
+
+    def prepare(self):
+        """
+        Prepare the merged data for modeling with `DataPreparation`.
+        """
+        from mortality_analysis.data_preparation import DataPreparation
+
+        return self._run_stage(
+            "prepare",
+            lambda: DataPreparation(
+                self.merge().copy(),
+                self.target_column,
+                k=self.k,
+                selection=self.selection,
+                period_column=self.period_column,
+            ).prepare_data(),
+        )
+
+    def run(self, until="prepare"):
+        """
+        Run the pipeline up to and including a stage.
+
+        Parameters:
+        - until (str): Last stage to run: 'load', 'clean', 'population', 'merge' or 'prepare'.
+
+        Returns:
+        - output: The output of the requested stage. Outputs of every stage evaluated so far
+          are kept in `self.results`.
+        """
+        if until not in self.UPSTREAM:
+            raise ValueError(
+                f"Invalid stage. Please choose one of {list(self.UPSTREAM)}."
+            )
+        return getattr(self, until)()
@@ -0,0 +1,177 @@
+import json
+import os
+from importlib import resources
+
+import numpy as np
+import pandas as pd
+
+from mortality_analysis.instrumentation import annotate, traced
+from mortality_analysis.load_data import hash_file
+from mortality_analysis.quarterly_rollup import period_ordinals
+
+BEA_FILE_NAME = "BEA Population Data.csv"
+BEA_URL = "https://raw.githubusercontent.com/LokeshDondapati/Mortality_Analysis/main/mortality_analysis/datasets/BEA%20Population%20Data.csv"
+
+# Location of the BEA file installed with the package (see `package_data` in setup.py).
+BUNDLED_BEA_PATH = str(resources.files("mortality_analysis") / "datasets" / BEA_FILE_NAME)
+
+
+def resolve_population_source(file_path=None):
+    """
+    Resolve the BEA population source, preferring local files over the network.
+
+    Parameters:
+    - file_path (str): Explicit path to a BEA CSV. Used if given and present.
+
+    Returns:
+    - source (str): A local path if one exists, otherwise the remote URL.
+    """
+    for candidate in (file_path, BUNDLED_BEA_PATH):
+        if candidate is not None and os.path.exists(candidate):
+            return candidate
+    return BEA_URL
+
+
+class PopulationProvider:
+    def __init__(self, file_path=None, cache_dir=".mortality_cache"):
+        """
+        Initialize the PopulationProvider.
+
+        The BEA wide file (one row per GeoName, one column per quarter) is parsed once into
+        a dense 2-D array indexed by geography code and quarter ordinal. The array is saved
+        under `cache_dir` and memory-mapped on later runs, so lookups are array indexing.
+
+        Parameters:
+        - file_path (str): Path to a BEA CSV. Defaults to the bundled package file, falling
+          back to the GitHub copy only if no local file exists.
+        - cache_dir (str): Directory for the persisted array. None disables persistence.
+        """
+        self.source = resolve_population_source(file_path)
+        self.cache_dir = cache_dir
+        self.geo_names = None
+        self.first_quarter = None
+        self.values = None
+        self._geo_index = None
+
+    def _cache_paths(self):
+        digest = hash_file(self.source)[:16]
+        stem = os.path.join(self.cache_dir, f"bea_population-{digest}")
+        return f"{stem}.npy", f"{stem}.json"
+
+    @traced()
+    def load(self):
+        """
+        Load the population array, from the memory-mapped cache when available.
+
+        Returns:
+        - self (PopulationProvider): The provider, for chaining.
+        """
+        if self.values is not None:
+            return self
+
+        is_local = os.path.exists(self.source)
+        if is_local and self.cache_dir is not None:
+            array_path, meta_path = self._cache_paths()
+            if os.path.exists(array_path) and os.path.exists(meta_path):
+                with open(meta_path, "r") as file:
+                    meta = json.load(file)
+                self._set(
+                    meta["geo_names"],
+                    meta["first_quarter"],
+                    np.load(array_path, mmap_mode="r"),
+                )
+                # Hashing the source reads it; the array itself is paged in lazily
+                annotate(bytes_read=os.path.getsize(self.source))
+                return self
+
+        data = pd.read_csv(self.source)
+        if is_local:
+            annotate(bytes_read=os.path.getsize(self.source))
+        quarter_columns = [c for c in data.columns if c not in ("GeoFips", "GeoName")]
+        ordinals = [
+            pd.Period(c.replace(":", ""), freq="Q").ordinal for c in quarter_columns
+        ]
+        first_quarter = min(ordinals)
+        values = np.full((len(data), max(ordinals) - first_quarter + 1), np.nan)
+        values[:, np.array(ordinals) - first_quarter] = data[quarter_columns].to_numpy(
+            dtype=np.float64
+        )
+        geo_names = data["GeoName"].astype(str).tolist()
+
+        if is_local and self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            array_path, meta_path = self._cache_paths()
+            # The metadata goes first: a reader that sees the array also sees its
+            # metadata, and both files are replaced atomically
+            temp_path = f"{meta_path}.{os.getpid()}.part"
+            with open(temp_path, "w") as file:
+                json.dump({"geo_names": geo_names, "first_quarter": first_quarter}, file)
+            os.replace(temp_path, meta_path)
+            temp_path = f"{array_path}.{os.getpid()}.part.npy"
+            np.save(temp_path, values)
+            os.replace(temp_path, array_path)
+
+        self._set(geo_names, first_quarter, values)
+        return self
+
+    def _set(self, geo_names, first_quarter, values):
+        self.geo_names = list(geo_names)
+        self.first_quarter = int(first_quarter)
+        self.values = values
+        self._geo_index = pd.Index(self.geo_names)
+
+    def geo_codes(self, geo_names):
+        """
+        Map GeoNames to row codes of the population array (-1 when unknown).
+        """
+        self.load()
+        return self._geo_index.get_indexer(pd.Index(geo_names).astype(str))
+
+    def quarter_codes(self, quarters):
+        """
+        Map quarters (Periods, or strings like '2020Q1' / '2020:Q1') to column codes.
+        """
+        self.load()
+        return period_ordinals(quarters) - self.first_quarter
+
+    def lookup(self, geo_names, quarters):
+        """
+        Vectorized population lookup for pairs of GeoName and quarter.
+
+        Parameters:
+        - geo_names (array-like): Geography names.
+        - quarters (array-like): Quarters, aligned with `geo_names`.
+
+        Returns:
+        - population (np.ndarray): Population per pair, NaN where the pair is unknown.
+        """
+        rows = self.geo_codes(geo_names)
+        columns = self.quarter_codes(quarters)
+        valid = (rows >= 0) & (columns >= 0) & (columns < self.values.shape[1])
+        population = np.full(len(rows), np.nan)
+        population[valid] = self.values[rows[valid], columns[valid]]
+        return population
+
+    @traced()
+    def to_long_frame(self):
+        """
+        Return the population in the long form expected by `DataMerge`.
+
+        Returns:
+        - population_data (pd.DataFrame): Columns 'GeoName', 'Quaterly' (e.g. '2020:Q1')
+          and 'Total_Population'.
+        """
+        self.load()
+        n_geo, n_quarters = self.values.shape
+        periods = pd.PeriodIndex.from_ordinals(
+            self.first_quarter + np.arange(n_quarters), freq="Q"
+        )
+        labels = [f"{p.year}:Q{p.quarter}" for p in periods]
+        data = pd.DataFrame(
+            {
+                "GeoName": np.repeat(self.geo_names, n_quarters),
+                "Quaterly": np.tile(labels, n_geo),
+                "Total_Population": np.asarray(self.values).reshape(-1),
+            }
+        )
+        return data.dropna(subset=["Total_Population"]).reset_index(drop=True)
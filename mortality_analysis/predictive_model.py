@@ -1,13 +1,94 @@
+import logging
+import os
+import time
+
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.tree import DecisionTreeRegressor, plot_tree
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-import matplotlib.pyplot as plt
 
-class DecisionTreeModel:
-    def __init__(self, file_path):
+from mortality_analysis.instrumentation import traced
+
+logger = logging.getLogger(__name__)
+
+# Estimator and default parameters of each model backend. DecisionTreeModel's defaults
+# are those of build_and_evaluate_decision_tree.
+MODEL_BACKENDS = {
+    'decision_tree': ('sklearn.tree', 'DecisionTreeRegressor', {
+        'max_depth': 5, 'min_samples_split': 20, 'min_samples_leaf': 10,
+        'max_features': 'sqrt', 'random_state': 42,
+    }),
+    'hist_gradient_boosting': ('sklearn.ensemble', 'HistGradientBoostingRegressor', {
+        'max_iter': 200, 'random_state': 42,
+    }),
+    'random_forest': ('sklearn.ensemble', 'RandomForestRegressor', {
+        'n_estimators': 200, 'min_samples_leaf': 2, 'n_jobs': -1, 'random_state': 42,
+    }),
+}
+
+# Search space of DecisionTreeModel.tune_decision_tree
+DEFAULT_PARAM_GRID = {
+    'max_depth': [3, 5, 8, 12, None],
+    'min_samples_split': [2, 10, 20, 40],
+    'min_samples_leaf': [1, 5, 10, 20],
+    'max_features': ['sqrt', None],
+}
+
+
+def make_estimator(backend, **params):
+    # Instantiate a backend's estimator, importing only that backend's sklearn module
+    import importlib
+
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(
+            f"Invalid backend. Please choose one of {list(MODEL_BACKENDS)}."
+        )
+    module_name, class_name, defaults = MODEL_BACKENDS[backend]
+    estimator_class = getattr(importlib.import_module(module_name), class_name)
+    return estimator_class(**{**defaults, **params})
+
+
+def time_holdout_mask(time_values, test_size=0.2):
+    # Hold out the latest periods, about test_size of the rows, so no future quarter
+    # leaks into training; at least one period is kept for training
+    periods = np.sort(pd.unique(time_values))
+    if len(periods) < 2:
+        raise ValueError("Need at least 2 distinct periods for a time-aware split.")
+    rows_per_period = pd.Series(time_values).value_counts().reindex(periods)
+    share_from_end = rows_per_period[::-1].cumsum()[::-1] / len(time_values)
+    position = int((share_from_end > test_size).sum())
+    first_test = periods[min(max(1, position), len(periods) - 1)]
+    return np.asarray(time_values) >= first_test
+
+
+def forward_chaining_folds(time_values, n_splits=5):
+    # Consecutive blocks of periods; fold i trains on blocks 0..i and validates on i+1,
+    # so no fold ever trains on a period later than the one it is scored on
+    periods = np.sort(pd.unique(np.asarray(time_values)))
+    if len(periods) < n_splits + 1:
+        raise ValueError(
+            f"Need at least {n_splits + 1} distinct periods for {n_splits} splits, "
+            f"got {len(periods)}."
+        )
+    codes = np.searchsorted(periods, np.asarray(time_values))
+    blocks = np.array_split(np.arange(len(periods)), n_splits + 1)
+    folds = []
+    for i in range(n_splits):
+        train = np.flatnonzero(codes <= blocks[i][-1])
+        validation = np.flatnonzero(np.isin(codes, blocks[i + 1]))
+        folds.append((train, validation))
+    return folds
+
+
+class PredictiveModel:
+    def __init__(self, file_path, backend='decision_tree', **params):
+        # params override the backend's defaults in MODEL_BACKENDS
+        if backend not in MODEL_BACKENDS:
+            raise ValueError(
+                f"Invalid backend. Please choose one of {list(MODEL_BACKENDS)}."
+            )
         self.file_path = file_path
-        self.tree_model = None
+        self.backend = backend
+        self.params = params
+        self.model = None
         self.X_train = None
         self.X_test = None
         self.y_train = None
@@ -15,47 +96,260 @@ class DecisionTreeModel:
         self.mae = None
         self.mse = None
         self.r2 = None
+        self.fit_seconds = None
+        self.folds = None
+        self._folds_key = None
+        self.feature_names = None
+        self.periods = None
 
-    def load_and_prepare_data(self):
+    @traced(rows_in=lambda self, period_column='Quarter': len(self.file_path))
+    def load_and_prepare_data(self, period_column='Quarter'):
+        # The period column, e.g. the one DataPreparation(period_column=...) carries
+        # through, is kept apart in self.periods for time-aware splits and never used as
+        # a feature
         data = self.file_path
+        self.periods = None
+        self.folds = None
+        self._folds_key = None
+        if period_column is not None and period_column in data.columns:
+            self.periods = data[period_column]
+            data = data.drop(columns=period_column)
         self.y = data['Total Deaths']
         self.X = data.drop('Total Deaths', axis=1)
 
-    def split_data(self, test_size=0.2, random_state=42):
-        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-            self.X, self.y, test_size=test_size, random_state=random_state
+    def _period_values(self, time_column, X):
+        # Periods of the rows of X: the loaded period column, or a numeric feature
+        if self.periods is not None and self.periods.name == time_column:
+            return self.periods.loc[X.index].to_numpy()
+        if time_column in X.columns:
+            return X[time_column].to_numpy()
+        raise ValueError(
+            f"Time column '{time_column}' is neither the period column nor a feature."
         )
 
-    def build_and_evaluate_decision_tree(self, max_depth=5, min_samples_split=20, min_samples_leaf=10):
-        self.tree_model = DecisionTreeRegressor(
-            max_depth=max_depth,
-            min_samples_split=min_samples_split,
-            min_samples_leaf=min_samples_leaf,
-            max_features='sqrt',
-            random_state=42
+    def split_data(self, test_size=0.2, random_state=42, time_column=None):
+        from sklearn.model_selection import train_test_split
+
+        # A new split, even one of the same size, invalidates the cached folds
+        self.folds = None
+        self._folds_key = None
+        if time_column is None:
+            self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
+                self.X, self.y, test_size=test_size, random_state=random_state
+            )
+            return
+
+        test = time_holdout_mask(self._period_values(time_column, self.X), test_size)
+        self.X_train, self.X_test = self.X[~test], self.X[test]
+        self.y_train, self.y_test = self.y[~test], self.y[test]
+
+    def time_series_folds(self, n_splits=5, time_column='Quarter'):
+        # Fold indices are computed once per split and (n_splits, time_column), and
+        # reused by every search
+        X = self.X if self.X_train is None else self.X_train
+        key = (len(X), n_splits, time_column)
+        if self._folds_key != key:
+            self.folds = forward_chaining_folds(
+                self._period_values(time_column, X), n_splits
+            )
+            self._folds_key = key
+        return self.folds
+
+    @traced(rows_in=lambda self, **params: len(self.X_train))
+    def build_and_evaluate(self, **params):
+        self._fit_and_evaluate(
+            make_estimator(self.backend, **{**self.params, **params})
         )
-        self.tree_model.fit(self.X_train, self.y_train)
 
-        y_pred = self.tree_model.predict(self.X_test)
+    def _fit_and_evaluate(self, model):
+        from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+        self.model = model
+        start = time.perf_counter()
+        self.model.fit(self.X_train, self.y_train)
+        self.fit_seconds = time.perf_counter() - start
+        self.feature_names = self.X_train.columns.tolist()
+
+        y_pred = self.model.predict(self.X_test)
 
         self.mae = mean_absolute_error(self.y_test, y_pred)
         self.mse = mean_squared_error(self.y_test, y_pred)
         self.r2 = r2_score(self.y_test, y_pred)
 
-    def visualize_decision_tree(self):
+    def print_evaluation_metrics(self):
+        logger.info('Mean Absolute Error: %s', self.mae)
+        logger.info('Mean Squared Error: %s', self.mse)
+        logger.info('Coefficient of Determination (R2 Score): %s', self.r2)
+
+    def save_model(self, path):
+        # The fitted estimator is stored with its backend and the feature list it was
+        # trained on, so scoring never needs the training data
+        import joblib
+
+        if self.model is None:
+            raise RuntimeError("Train the model before saving it.")
+        state = {
+            'model': self.model,
+            'backend': self.backend,
+            'feature_names': self.feature_names,
+            'target': 'Total Deaths',
+            'metrics': {'mae': self.mae, 'mse': self.mse, 'r2': self.r2},
+        }
+        temp_path = f"{path}.{os.getpid()}.part"
+        joblib.dump(state, temp_path)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load_model(cls, path):
+        import joblib
+
+        state = joblib.load(path)
+        model = cls(None)
+        model.backend = state.get('backend', 'decision_tree')
+        model.model = state['model']
+        model.feature_names = list(state['feature_names'])
+        metrics = state.get('metrics', {})
+        model.mae, model.mse, model.r2 = (metrics.get(k) for k in ('mae', 'mse', 'r2'))
+        return model
+
+    @traced()
+    def predict(self, data, batch_size=None):
+        # data is a DataFrame or a path to a Parquet file; only the model's features are
+        # read, and Parquet files are scored batch by batch
+        if self.model is None:
+            raise RuntimeError("Train or load the model before predicting.")
+        if isinstance(data, (str, os.PathLike)):
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(data)
+            predictions = [
+                self._predict_frame(batch.to_pandas())
+                for batch in parquet_file.iter_batches(
+                    batch_size=batch_size or 65536, columns=self.feature_names
+                )
+            ]
+            if not predictions:
+                return pd.Series([], dtype=np.float64, name='prediction')
+            return pd.concat(predictions, ignore_index=True)
+        return self._predict_frame(data)
+
+    def _predict_frame(self, data):
+        missing = [column for column in self.feature_names if column not in data.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+        return pd.Series(
+            self.model.predict(data[self.feature_names]),
+            index=data.index,
+            name='prediction',
+        )
+
+
+class DecisionTreeModel(PredictiveModel):
+    def __init__(self, file_path):
+        super().__init__(file_path, backend='decision_tree')
+        self.best_params = None
+        self.tuning_results = None
+
+    @property
+    def tree_model(self):
+        return self.model
+
+    @tree_model.setter
+    def tree_model(self, model):
+        self.model = model
+
+    @traced(rows_in=lambda self, *args, **kwargs: len(self.X_train))
+    def tune_decision_tree(self, param_grid=None, search='halving', n_splits=5,
+                           time_column='Quarter', n_jobs=-1):
+        # Searches on the training rows (all rows if split_data was not called) with
+        # forward-chaining folds grouped by period, fitting candidates on all cores
+        from sklearn.base import clone
+        from sklearn.model_selection import GridSearchCV
+        from sklearn.tree import DecisionTreeRegressor
+
+        if search not in ('grid', 'halving'):
+            raise ValueError("Invalid search. Please choose 'grid' or 'halving'.")
+        X = self.X if self.X_train is None else self.X_train
+        y = self.y if self.y_train is None else self.y_train
+        folds = self.time_series_folds(n_splits, time_column)
+
+        options = dict(
+            cv=folds,
+            scoring='neg_mean_absolute_error',
+            n_jobs=n_jobs,
+            refit=False,
+        )
+        estimator = DecisionTreeRegressor(random_state=42)
+        if search == 'grid':
+            searcher = GridSearchCV(estimator, param_grid or DEFAULT_PARAM_GRID, **options)
+        else:
+            from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+            from sklearn.model_selection import HalvingGridSearchCV
+
+            # Each round keeps the best third of the candidates on three times the rows
+            searcher = HalvingGridSearchCV(
+                estimator, param_grid or DEFAULT_PARAM_GRID, factor=3,
+                random_state=42, **options
+            )
+
+        start = time.perf_counter()
+        searcher.fit(X, y)
+        elapsed = time.perf_counter() - start
+
+        results = pd.DataFrame(searcher.cv_results_)
+        columns = ['params', 'mean_fit_time', 'std_fit_time', 'mean_test_score',
+                   'rank_test_score']
+        if search == 'halving':
+            columns = ['iter', 'n_resources'] + columns
+        self.tuning_results = results[columns].rename(
+            columns={'mean_test_score': 'mean_test_mae'}
+        )
+        self.tuning_results['mean_test_mae'] *= -1
+        self.best_params = dict(searcher.best_params_)
+
+        # Refit the best candidate on the estimator the search scored, not on
+        # build_and_evaluate_decision_tree's defaults, and score it on the holdout
+        if self.X_test is not None:
+            self._fit_and_evaluate(clone(estimator).set_params(**self.best_params))
+        return {
+            'best_params': self.best_params,
+            'best_mae': -searcher.best_score_,
+            'search_seconds': elapsed,
+            'candidates': self.tuning_results,
+        }
+
+    def build_and_evaluate_decision_tree(self, max_depth=5, min_samples_split=20, min_samples_leaf=10,
+                                         max_features='sqrt'):
+        self.build_and_evaluate(
+            max_depth=max_depth,
+            min_samples_split=min_samples_split,
+            min_samples_leaf=min_samples_leaf,
+            max_features=max_features,
+        )
+
+    def visualize_decision_tree(self, output_path=None):
+        import matplotlib.pyplot as plt
+        from sklearn.tree import plot_tree
+
         plt.figure(figsize=(20, 10))
         plot_tree(
             self.tree_model,
             filled=True,
-            feature_names=self.X.columns.tolist(),  # Convert Index to list
+            feature_names=list(self.feature_names),
             max_depth=3,
             fontsize=10
         )
         plt.title("Decision Tree Visualization")
-        plt.show()
+        if output_path is None:
+            plt.show()
+        else:
+            plt.savefig(output_path, bbox_inches="tight")
+            plt.close()
 
-    def print_evaluation_metrics(self):
-        print(f"Mean Absolute Error: {self.mae}")
-        print(f"Mean Squared Error: {self.mse}")
-        print(f"Coefficient of Determination (R2 Score): {self.r2}")
+    def export_arrays(self, directory):
+        # Flat NumPy export for ArrayTreeScorer, which scores without importing sklearn
+        from mortality_analysis.tree_scorer import export_tree
 
+        if self.tree_model is None:
+            raise RuntimeError("Train or load the model before exporting it.")
+        export_tree(self.tree_model, self.feature_names, directory)
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+
+from mortality_analysis.instrumentation import traced
+
+# Quantiles reported by `DataProfile.describe`, matching `pd.DataFrame.describe`.
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+# Values binned per block when building histograms.
+HISTOGRAM_BLOCK = 1 << 16
+
+
+class DataProfile:
+    def __init__(
+        self,
+        n_rows,
+        dtypes,
+        missing,
+        columns,
+        count,
+        mean,
+        std,
+        minimum,
+        maximum,
+        quantiles,
+        histograms,
+    ):
+        """
+        Initialize the DataProfile, the result of `profile_frame`.
+
+        Parameters:
+        - n_rows (int): Number of rows profiled.
+        - dtypes (pd.Series): Data type of every column.
+        - missing (pd.Series): Missing value count of every column.
+        - columns (list): Numeric columns the statistics below refer to.
+        - count, mean, std, minimum, maximum (np.ndarray): Per-column statistics,
+          aligned with `columns`.
+        - quantiles (dict): Per-column quantile values keyed by quantile.
+        - histograms (dict): Per-column (counts, edges) of fixed-width bins.
+        """
+        self.n_rows = n_rows
+        self.dtypes = dtypes
+        self.missing = missing
+        self.columns = list(columns)
+        self.count = count
+        self.mean = mean
+        self.std = std
+        self.minimum = minimum
+        self.maximum = maximum
+        self.quantiles = quantiles
+        self.histograms = histograms
+
+    def describe(self):
+        """
+        Summary statistics in the layout of `pd.DataFrame.describe`.
+
+        Returns:
+        - stats (pd.DataFrame): count, mean, std, min, quantiles and max per numeric
+          column.
+        """
+        rows = {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.minimum,
+        }
+        for q, values in self.quantiles.items():
+            rows[f"{q * 100:g}%"] = values
+        rows["max"] = self.maximum
+        return pd.DataFrame(rows, index=self.columns).T
+
+    def missing_values(self):
+        """
+        Missing value count for each column.
+
+        Returns:
+        - missing (pd.Series): Missing values per column.
+        """
+        return self.missing.copy()
+
+    def histogram(self, column):
+        """
+        Histogram of a numeric column.
+
+        Returns:
+        - counts (np.ndarray): Rows per bin.
+        - edges (np.ndarray): Bin edges, one more than the counts.
+        """
+        return self.histograms[column]
+
+
+def _histograms(values, present, minimum, maximum, bins):
+    """
+    Fixed-width histograms of every column, one bincount per block of rows.
+
+    `values` holds one column per row. Bin edges and edge handling follow `np.histogram`
+    with `bins` equal-width bins over each column's [min, max].
+    """
+    n_columns, n_rows = values.shape
+    # np.histogram widens a degenerate range by 0.5 on each side
+    low = np.where(minimum == maximum, minimum - 0.5, minimum)
+    high = np.where(minimum == maximum, maximum + 0.5, maximum)
+    edges = low[:, None] + (high - low)[:, None] * np.linspace(0.0, 1.0, bins + 1)
+    edges[:, -1] = high
+    flat_edges = edges.reshape(-1)
+    norm = (bins / (high - low))[:, None]
+    # Offsets into the flattened edges and into the flattened counts
+    edge_offsets = (np.arange(n_columns) * (bins + 1))[:, None]
+    count_offsets = (np.arange(n_columns) * bins)[:, None]
+
+    counts = np.zeros(n_columns * bins, dtype=np.int64)
+    # Blocks small enough for the temporaries to stay in cache
+    block_rows = max(1, HISTOGRAM_BLOCK // max(n_columns, 1))
+    for start in range(0, n_rows, block_rows):
+        block = values[:, start : start + block_rows]
+        scaled = block - low[:, None]
+        scaled *= norm
+        if present is not None:
+            scaled[~present[:, start : start + block_rows]] = 0.0
+        index = scaled.astype(np.intp)
+        np.clip(index, 0, bins - 1, out=index)
+
+        # Correct float rounding against the explicit edges, as np.histogram does
+        position = index + edge_offsets
+        below = block < flat_edges[position]
+        above = block >= flat_edges[position + 1]
+        above &= index != bins - 1
+        index += count_offsets
+        index += above
+        index -= below
+
+        if present is None:
+            index = index.reshape(-1)
+        else:
+            index = index[present[:, start : start + block_rows]]
+        counts += np.bincount(index, minlength=n_columns * bins)
+    return counts.reshape(n_columns, bins), edges
+
+
+def _moments(values, present, count):
+    """
+    Mean, sample std, min and max of every column, accumulated block by block.
+
+    Squares are summed around the first block's means to limit cancellation.
+    """
+    n_columns, n_rows = values.shape
+    sums = np.zeros(n_columns)
+    squares = np.zeros(n_columns)
+    minimum = np.full(n_columns, np.nan)
+    maximum = np.full(n_columns, np.nan)
+    shift = np.zeros(n_columns)
+    block_rows = max(1, HISTOGRAM_BLOCK // max(n_columns, 1))
+    for start in range(0, n_rows, block_rows):
+        block = values[:, start : start + block_rows]
+        # fmin/fmax skip NaNs
+        np.fmin(minimum, np.fmin.reduce(block, axis=1), out=minimum)
+        np.fmax(maximum, np.fmax.reduce(block, axis=1), out=maximum)
+
+        centred = block.copy()
+        if present is not None:
+            absent = ~present[:, start : start + block_rows]
+            centred[absent] = 0.0
+        if start == 0:
+            block_count = (
+                centred.shape[1] if present is None else (~absent).sum(axis=1)
+            )
+            shift = centred.sum(axis=1) / np.maximum(block_count, 1)
+        centred -= shift[:, None]
+        if present is not None:
+            centred[absent] = 0.0
+        sums += centred.sum(axis=1)
+        np.square(centred, out=centred)
+        squares += centred.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centred_mean = sums / count
+        variance = (squares - sums * centred_mean) / (count - 1)
+    std = np.sqrt(np.maximum(variance, 0.0))
+    std[count < 2] = np.nan
+    return shift + centred_mean, std, minimum, maximum
+
+
+@traced(rows_in=lambda data, *args, **kwargs: len(data))
+def profile_frame(data, bins=20, quantiles=DEFAULT_QUANTILES):
+    """
+    Profile a DataFrame with vectorized passes over its numeric block.
+
+    The numeric columns are converted once to a single float array with one row per
+    column. Counts, nulls, mean, std and min/max are accumulated for all columns at once
+    in one blocked scan; the fixed-bin histograms need that range and take a second scan
+    over cache-sized blocks. Quantiles use selection (`np.partition`) rather than a full
+    sort, so the cost grows linearly with the number of rows.
+
+    Parameters:
+    - data (pd.DataFrame): Input data.
+    - bins (int): Number of histogram bins per numeric column.
+    - quantiles (tuple): Quantiles to report, between 0 and 1.
+
+    Returns:
+    - profile (DataProfile): Structured profile of the data.
+    """
+    columns = data.select_dtypes(include=[np.number]).columns
+    # One contiguous row per column, so every reduction below streams through memory
+    values = np.ascontiguousarray(
+        data[columns].to_numpy(dtype=np.float64, na_value=np.nan).T
+    )
+    n_rows = len(data)
+    present = ~np.isnan(values)
+    count = present.sum(axis=1)
+    has_missing = count < n_rows
+    if not has_missing.any():
+        present = None
+
+    missing = pd.Series(0, index=data.columns, dtype=np.int64)
+    missing[columns] = n_rows - count
+    other_columns = data.columns.difference(columns, sort=False)
+    if len(other_columns):
+        missing[other_columns] = data[other_columns].isna().sum()
+
+    mean, std, minimum, maximum = _moments(values, present, count)
+    empty = count == 0
+
+    quantile_values = {q: np.full(len(columns), np.nan) for q in quantiles}
+    complete = ~has_missing
+    if complete.any() and n_rows:
+        block = np.quantile(values[complete], list(quantiles), axis=1)
+        for q, row in zip(quantiles, block):
+            quantile_values[q][complete] = row
+    for i in np.flatnonzero(has_missing & ~empty):
+        column_values = values[i][present[i]]
+        for q, value in zip(quantiles, np.quantile(column_values, list(quantiles))):
+            quantile_values[q][i] = value
+
+    counts, edges = _histograms(
+        values, present, np.nan_to_num(minimum), np.nan_to_num(maximum), bins
+    )
+    histograms = {column: (counts[i], edges[i]) for i, column in enumerate(columns)}
+
+    return DataProfile(
+        n_rows,
+        data.dtypes,
+        missing,
+        columns,
+        count,
+        mean,
+        std,
+        minimum,
+        maximum,
+        quantile_values,
+        histograms,
+    )
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from mortality_analysis.data_cleaning import CAUSE_COLUMNS
+from mortality_analysis.instrumentation import traced
+
+AGGREGATIONS = ("sum", "mean")
+
+
+def quarter_ordinals(dates):
+    """
+    Convert datetimes to integer quarter ordinals (quarters since 1970Q1).
+
+    The ordinals match `pd.Period(..., freq="Q").ordinal`, so they can be turned back
+    into periods with `pd.PeriodIndex.from_ordinals`.
+
+    Parameters:
+    - dates (array-like): Datetime values.
+
+    Returns:
+    - ordinals (np.ndarray): int64 quarter ordinals.
+    """
+    months = np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[M]")
+    return months.astype(np.int64) // 3
+
+
+def period_ordinals(quarters):
+    """
+    Convert quarter labels to integer quarter ordinals.
+
+    Parameters:
+    - quarters (array-like): Quarterly Periods, or strings like '2020Q1' or '2020:Q1'.
+
+    Returns:
+    - ordinals (np.ndarray): int64 quarter ordinals, as returned by `quarter_ordinals`.
+    """
+    if isinstance(quarters, pd.PeriodIndex):
+        return np.asarray(quarters.asi8, dtype=np.int64)
+    quarters = pd.Series(quarters)
+    if isinstance(quarters.dtype, pd.PeriodDtype):
+        return np.asarray(quarters.array.asi8, dtype=np.int64)
+
+    # Parse each distinct label once
+    codes, labels = pd.factorize(quarters.astype(str).str.replace(":", ""))
+    ordinals = pd.PeriodIndex(labels, freq="Q").asi8
+    return np.asarray(ordinals, dtype=np.int64)[codes]
+
+
+def grouped_sums(
+    data,
+    value_columns=None,
+    key_column="Jurisdiction",
+    date_column="Ending Date",
+):
+    """
+    Sum every value column per (key, quarter) in one grouped pass over NumPy arrays.
+
+    Parameters:
+    - data (pd.DataFrame): Weekly rows with a key column, a date column and value columns.
+    - value_columns (list): Columns to aggregate. Defaults to the cause-of-death columns.
+    - key_column (str): Column identifying the jurisdiction.
+    - date_column (str): Week ending date column used to derive the quarter.
+
+    Returns:
+    - last_rows (pd.DataFrame): Latest row of each group (by date) with a 'Quarter' column.
+    - sums (np.ndarray): Group sums, NaNs skipped, shape (groups, columns).
+    - counts (np.ndarray): Non-null counts per group and column, same shape.
+    """
+    if value_columns is None:
+        value_columns = [c for c in CAUSE_COLUMNS if c in data.columns]
+
+    key_codes, _ = pd.factorize(data[key_column], sort=False)
+    quarters = quarter_ordinals(data[date_column])
+    dates = np.asarray(data[date_column], dtype="datetime64[ns]").astype(np.int64)
+
+    # Combine (key, quarter) into one integer group id
+    first_quarter = quarters.min() if len(quarters) else 0
+    span = (quarters.max() - first_quarter + 1) if len(quarters) else 1
+    group_keys = key_codes.astype(np.int64) * span + (quarters - first_quarter)
+    group_ids, unique_keys = pd.factorize(group_keys, sort=True)
+    n_groups = len(unique_keys)
+
+    sums = np.empty((n_groups, len(value_columns)))
+    counts = np.empty((n_groups, len(value_columns)), dtype=np.int64)
+    group_sizes = np.bincount(group_ids, minlength=n_groups)
+    for i, column in enumerate(value_columns):
+        values = data[column].to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        if present.all():
+            sums[:, i] = np.bincount(group_ids, weights=values, minlength=n_groups)
+            counts[:, i] = group_sizes
+        else:
+            sums[:, i] = np.bincount(
+                group_ids, weights=np.where(present, values, 0.0), minlength=n_groups
+            )
+            counts[:, i] = np.bincount(group_ids[present], minlength=n_groups)
+
+    # Latest week of each group: sort by (group, date) and take each run's last row
+    order = np.lexsort((dates, group_ids))
+    sorted_ids = group_ids[order]
+    is_last = np.ones(len(order), dtype=bool)
+    is_last[:-1] = sorted_ids[1:] != sorted_ids[:-1]
+    ends = order[is_last]
+
+    last_rows = data.iloc[ends].drop(columns=value_columns)
+    last_rows["Quarter"] = pd.PeriodIndex.from_ordinals(quarters[ends], freq="Q")
+    return last_rows.reset_index(drop=True), sums, counts
+
+
+@traced(rows_in=lambda data, *args, **kwargs: len(data))
+def rollup_quarters(data, how="sum", value_columns=None, key_column="Jurisdiction"):
+    """
+    Collapse weekly rows to one row per (jurisdiction, quarter).
+
+    Every value column is summed or averaged over all weeks of the quarter, unlike
+    `drop_duplicates`, which keeps a single arbitrary week. Non-value columns such as
+    'Ending Date' and 'Week' are taken from the latest week of the quarter.
+
+    Parameters:
+    - data (pd.DataFrame): Cleaned weekly rows (see `CDCDataProcessor.clean_frame`).
+    - how (str): 'sum' or 'mean'.
+    - value_columns (list): Columns to aggregate. Defaults to the cause-of-death columns.
+    - key_column (str): Column identifying the jurisdiction.
+
+    Returns:
+    - quarterly_data (pd.DataFrame): One row per (jurisdiction, quarter).
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Invalid aggregation. Please choose one of {AGGREGATIONS}.")
+    if value_columns is None:
+        value_columns = [c for c in CAUSE_COLUMNS if c in data.columns]
+
+    last_rows, sums, counts = grouped_sums(
+        data, value_columns=value_columns, key_column=key_column
+    )
+    return finalize_rollup(last_rows, sums, counts, value_columns, how)
+
+
+def finalize_rollup(last_rows, sums, counts, value_columns, how="sum"):
+    """
+    Build the quarterly frame from per-group sums and counts.
+
+    Parameters:
+    - last_rows (pd.DataFrame): One row of non-value columns per group.
+    - sums (np.ndarray): Group sums, shape (groups, columns).
+    - counts (np.ndarray): Non-null counts, same shape.
+    - value_columns (list): Names of the aggregated columns.
+    - how (str): 'sum' or 'mean'.
+
+    Returns:
+    - quarterly_data (pd.DataFrame): One row per group.
+    """
+    if how == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            aggregated = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    else:
+        aggregated = sums
+    values = pd.DataFrame(aggregated, columns=value_columns, index=last_rows.index)
+    return pd.concat([last_rows, values], axis=1)
@@ -0,0 +1,178 @@
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mortality_analysis.instrumentation import traced
+
+# Largest correlation matrix whose cells are annotated with their values.
+MAX_ANNOTATED_HEATMAP = 20
+
+
+def histogram_job(name, values, bins=20, title=None, xlabel=None, histogram=None):
+    """
+    Describe a histogram figure. Bin counts are computed here, so only the counts and edges
+    are shipped to the rendering workers.
+
+    Parameters:
+    - name (str): File stem of the figure.
+    - values (array-like): Values to bin; NaNs are ignored.
+    - bins (int): Number of bins.
+    - title (str): Figure title.
+    - xlabel (str): X axis label.
+    - histogram (tuple): Precomputed (counts, edges), e.g. from a `DataProfile`; `values`
+      and `bins` are then ignored.
+
+    Returns:
+    - job (dict): Figure description for `FigureRenderer.render`.
+    """
+    if histogram is None:
+        values = np.asarray(values, dtype=np.float64)
+        histogram = np.histogram(values[~np.isnan(values)], bins=bins)
+    counts, edges = histogram
+    return {
+        "name": name,
+        "kind": "histogram",
+        "figsize": (10, 6),
+        "title": title or name,
+        "xlabel": xlabel or name,
+        "ylabel": "Frequency",
+        "payload": (counts, edges),
+        # Fixed layout: the labels fit the default margins, and skipping the tight
+        # bounding box avoids a second draw pass
+        "tight": False,
+    }
+
+
+def _file_stem(name):
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")
+
+
+def _draw(fig, job):
+    """
+    Draw one job on a cleared, reused figure.
+    """
+    fig.clear()
+    fig.set_size_inches(*job["figsize"])
+    ax = fig.add_subplot()
+    kind, payload = job["kind"], job["payload"]
+
+    if kind == "histogram":
+        counts, edges = payload
+        # One filled step artist instead of a patch per bin
+        ax.stairs(counts, edges, fill=True)
+        ax.set_axisbelow(True)
+        ax.grid(True)
+    elif kind == "bar":
+        labels, values = payload
+        ax.bar([str(label) for label in labels], values)
+        ax.tick_params(axis="x", labelrotation=45)
+    elif kind == "heatmap":
+        import seaborn as sns
+
+        # Per-cell annotations dominate render time and are unreadable on wide matrices
+        annot = len(payload) <= MAX_ANNOTATED_HEATMAP
+        sns.heatmap(payload, annot=annot, cmap="coolwarm", fmt=".2f", ax=ax)
+    elif kind == "boxplot":
+        import seaborn as sns
+
+        sns.boxplot(data=payload, ax=ax)
+    else:
+        raise ValueError(f"Unknown figure kind: {kind}")
+
+    ax.set_title(job.get("title", ""))
+    if job.get("xlabel"):
+        ax.set_xlabel(job["xlabel"])
+    if job.get("ylabel"):
+        ax.set_ylabel(job["ylabel"])
+
+
+def _render_batch(jobs, output_dir, formats, dpi):
+    """
+    Render a batch of jobs in one process, reusing a single figure object.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    manifest = []
+    for job in jobs:
+        _draw(fig, job)
+        paths = []
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{_file_stem(job['name'])}.{fmt}")
+            bbox_inches = "tight" if job.get("tight", True) else None
+            fig.savefig(path, format=fmt, dpi=dpi, bbox_inches=bbox_inches)
+            paths.append(path)
+        manifest.append({"name": job["name"], "kind": job["kind"], "paths": paths})
+    return manifest
+
+
+class FigureRenderer:
+    def __init__(self, output_dir, formats=("png",), max_workers=None, dpi=100):
+        """
+        Initialize the FigureRenderer.
+
+        Figures are drawn with matplotlib's non-interactive Agg canvas through the
+        object-oriented `Figure` API, so no display is needed and pyplot state is never
+        touched.
+
+        Parameters:
+        - output_dir (str): Directory the figures are written to.
+        - formats (tuple): Output formats, e.g. ('png', 'svg').
+        - max_workers (int): Number of worker processes. Defaults to the CPU count; 1 renders
+          in this process.
+        - dpi (int): Resolution of raster outputs.
+        """
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.max_workers = max_workers
+        self.dpi = dpi
+
+    @traced()
+    def render(self, jobs):
+        """
+        Render figure jobs in parallel worker processes.
+
+        Jobs are split into one batch per worker, and each worker reuses a single figure
+        for its whole batch.
+
+        Parameters:
+        - jobs (list): Figure descriptions with 'name', 'kind', 'figsize', 'title',
+          optional 'xlabel'/'ylabel' and a kind-specific 'payload'.
+
+        Returns:
+        - manifest (list): One dict per figure with 'name', 'kind' and output 'paths',
+          in job order.
+
+        Raises:
+        - ValueError: If two job names map to the same output file.
+        """
+        # Jobs are matched to their output file by name, so names must not collide
+        stems = Counter(_file_stem(job["name"]) for job in jobs)
+        duplicates = sorted(stem for stem, count in stems.items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Figure names map to the same file: {duplicates}")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not jobs:
+            return []
+
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(jobs))
+        if max_workers <= 1:
+            return _render_batch(jobs, self.output_dir, self.formats, self.dpi)
+
+        batches = [jobs[i::max_workers] for i in range(max_workers)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                _render_batch,
+                batches,
+                [self.output_dir] * max_workers,
+                [self.formats] * max_workers,
+                [self.dpi] * max_workers,
+            )
+            by_name = {
+                entry["name"]: entry for batch in results for entry in batch
+            }
+        return [by_name[job["name"]] for job in jobs]
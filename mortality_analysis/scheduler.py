@@ -0,0 +1,176 @@
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from mortality_analysis.data_cleaning import DISEASE_COLUMNS
+from mortality_analysis.instrumentation import traced
+
+# Merged data held by each worker process, set once by the pool initializer.
+_worker_data = None
+
+
+def _init_worker(data):
+    global _worker_data
+    import matplotlib
+
+    # Figures are rendered off-screen; plt.show() becomes a no-op
+    matplotlib.use("Agg")
+    warnings.filterwarnings("ignore", message=".*non-interactive.*")
+    _worker_data = data
+
+
+def run_eda(data):
+    """
+    Summary statistics and correlation matrix from `Eda`.
+    """
+    from mortality_analysis.eda import Eda
+
+    eda = Eda(data, profile=True)
+    return {
+        "basic_statistics": eda.display_basic_statistics(),
+        "missing_values": eda.display_missing_values(),
+        "data_types": eda.display_data_types(),
+        "correlation_matrix": eda.display_correlation_matrix(),
+    }
+
+
+def run_death_rate(data):
+    """
+    Top 10 states by average death rate from `DeathRateAnalyze`.
+    """
+    from mortality_analysis.investigate_death_rate_analysis import DeathRateAnalyze
+
+    return DeathRateAnalyze(data).analyze_and_visualize_death_rate()
+
+
+def run_trends(data):
+    """
+    Quarterly mortality rate trends from `MortalityTrends`.
+    """
+    from mortality_analysis.trends_analysis import MortalityTrends
+
+    return MortalityTrends(data).explore_mortality_trends(DISEASE_COLUMNS)
+
+
+def run_influence(data):
+    """
+    Disease correlations with total deaths from `DiseaseInfluence`.
+    """
+    from mortality_analysis.diseases_with_significant_influence_analysis import (
+        DiseaseInfluence,
+    )
+
+    return DiseaseInfluence(data).analyze_and_visualize()
+
+
+def run_model(data):
+    """
+    Decision tree evaluation metrics from `DecisionTreeModel` on the numeric columns.
+    """
+    from mortality_analysis.predictive_model import DecisionTreeModel
+
+    model = DecisionTreeModel(data.select_dtypes(include=["number"]))
+    model.load_and_prepare_data()
+    model.split_data()
+    model.build_and_evaluate_decision_tree()
+    return {"mae": model.mae, "mse": model.mse, "r2": model.r2}
+
+
+# Post-merge analyses that depend only on the merged data.
+ANALYSES = {
+    "eda": run_eda,
+    "death_rate": run_death_rate,
+    "trends": run_trends,
+    "influence": run_influence,
+    "model": run_model,
+}
+
+
+def _run_task(func, data=None):
+    import matplotlib.pyplot as plt
+
+    # Each analysis gets its own copy, so columns it adds never leak into other tasks
+    data = (_worker_data if data is None else data).copy()
+    open_figures = set(plt.get_fignums())
+    start = time.perf_counter()
+    result, error = None, None
+    try:
+        result = func(data)
+    except Exception as exc:
+        error = repr(exc)
+    finally:
+        # Close only the task's figures; serial runs share the caller's pyplot state
+        for number in set(plt.get_fignums()) - open_figures:
+            plt.close(number)
+    return {"result": result, "error": error, "seconds": time.perf_counter() - start}
+
+
+def _run_serial(analyses, data):
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    # Render off-screen like the workers, unless switching backends would close
+    # figures the caller has open; the caller's backend is restored afterwards
+    backend = matplotlib.get_backend()
+    switch = not plt.get_fignums()
+    if switch:
+        matplotlib.use("Agg")
+    try:
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message=".*non-interactive.*")
+            return {name: _run_task(func, data) for name, func in analyses.items()}
+    finally:
+        if switch:
+            matplotlib.use(backend)
+
+
+class AnalysisScheduler:
+    def __init__(self, merged_data, max_workers=None):
+        """
+        Initialize the AnalysisScheduler.
+
+        Parameters:
+        - merged_data (pd.DataFrame): Output of `DataMerge.merge_dataframes`. It is never
+          modified; every analysis works on its own copy.
+        - max_workers (int): Number of worker processes. Defaults to one per analysis, capped
+          at the CPU count. 1 runs the analyses serially in this process.
+        """
+        self.merged_data = merged_data
+        self.max_workers = max_workers
+
+    @traced(rows_in=lambda self, analyses=None: len(self.merged_data))
+    def run(self, analyses=None):
+        """
+        Run independent analyses concurrently in a process pool and collect their results.
+
+        The merged data is sent to each worker once, so wall-clock time approaches that of
+        the slowest analysis rather than the sum of all of them.
+
+        Parameters:
+        - analyses (dict or list): Mapping of name to a picklable function taking the merged
+          data, or a list of names from `ANALYSES`. Defaults to all of `ANALYSES`.
+
+        Returns:
+        - results (dict): Per analysis, a dict with 'result', 'error' (None on success) and
+          'seconds'.
+        """
+        if analyses is None:
+            analyses = ANALYSES
+        elif not isinstance(analyses, dict):
+            analyses = {name: ANALYSES[name] for name in analyses}
+
+        max_workers = self.max_workers or min(len(analyses), os.cpu_count() or 1)
+        if max_workers <= 1:
+            return _run_serial(analyses, self.merged_data)
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.merged_data,),
+        ) as executor:
+            futures = {
+                name: executor.submit(_run_task, func)
+                for name, func in analyses.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
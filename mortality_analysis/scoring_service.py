@@ -0,0 +1,218 @@
+import json
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from mortality_analysis.instrumentation import traced
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    def __init__(self, predict, max_batch_rows=4096, max_wait=0.005):
+        """
+        Initialize the MicroBatcher.
+
+        Concurrent requests are queued and scored together: a worker thread waits up to
+        `max_wait` seconds after the first queued request for more to arrive, then runs
+        one `predict` call on the concatenated rows and splits the result.
+
+        Parameters:
+        - predict (callable): Takes a DataFrame and returns one prediction per row.
+        - max_batch_rows (int): Rows after which a batch is scored without waiting.
+        - max_wait (float): Longest time, in seconds, a request waits for others.
+        """
+        self.predict = predict
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, frame):
+        """
+        Queue rows for scoring.
+
+        Parameters:
+        - frame (pd.DataFrame): Rows to score.
+
+        Returns:
+        - future (Future): Resolves to a list of predictions, in row order.
+        """
+        future = Future()
+        self._queue.put((frame, future))
+        return future
+
+    def close(self):
+        """
+        Stop the worker thread after the queued requests are scored.
+        """
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            rows = len(item[0])
+            stop = False
+            while rows < self.max_batch_rows:
+                try:
+                    item = self._queue.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                pending.append(item)
+                rows += len(item[0])
+            self._score(pending)
+            if stop:
+                return
+
+    @traced("MicroBatcher.score")
+    def _score(self, pending):
+        self.batches += 1
+        try:
+            frame = pd.concat([frame for frame, _ in pending], ignore_index=True)
+            predictions = list(map(float, self.predict(frame)))
+        except Exception as exc:
+            for _, future in pending:
+                future.set_exception(exc)
+            return
+        start = 0
+        for frame, future in pending:
+            future.set_result(predictions[start : start + len(frame)])
+            start += len(frame)
+
+
+class _ScoringHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "Not found"})
+            return
+        self._send_json(200, {"status": "ok", "features": self.server.features})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            frame = pd.DataFrame(payload["rows"])
+            missing = [c for c in self.server.features if c not in frame.columns]
+            if missing:
+                raise ValueError(f"Missing feature columns: {missing}")
+        except (ValueError, KeyError, TypeError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        try:
+            predictions = self.server.batcher.submit(frame).result()
+        except Exception as exc:
+            self._send_json(500, {"error": str(exc)})
+            return
+        self._send_json(200, {"predictions": predictions})
+
+    def log_message(self, format, *args):
+        # Per-request access logs are too noisy for batch scoring jobs
+        pass
+
+
+class ScoringServer:
+    def __init__(
+        self, model, host="127.0.0.1", port=8000, max_batch_rows=4096, max_wait=0.005
+    ):
+        """
+        Initialize the ScoringServer, a local HTTP endpoint around a warm model.
+
+        Endpoints:
+        - GET /health: {"status": "ok", "features": [...]}.
+        - POST /predict with {"rows": [{feature: value, ...}, ...]}: returns
+          {"predictions": [...]} in row order. Concurrent requests are micro-batched.
+
+        Parameters:
+        - model (DecisionTreeModel): Trained or loaded model, kept in memory.
+        - host (str): Interface to bind; defaults to localhost only.
+        - port (int): Port to bind; 0 picks a free port.
+        - max_batch_rows (int): See `MicroBatcher`.
+        - max_wait (float): See `MicroBatcher`.
+        """
+        self.model = model
+        self.batcher = MicroBatcher(
+            model.predict, max_batch_rows=max_batch_rows, max_wait=max_wait
+        )
+        self.httpd = ThreadingHTTPServer((host, port), _ScoringHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.batcher = self.batcher
+        self.httpd.features = list(model.feature_names)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        """
+        Serve requests in the calling thread until `shutdown` is called.
+        """
+        self.httpd.serve_forever()
+
+    def start(self):
+        """
+        Serve requests in a background thread.
+
+        Returns:
+        - self (ScoringServer): The running server.
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """
+        Stop serving and release the socket.
+        """
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+        self.batcher.close()
+
+
+def serve(model_path, host="127.0.0.1", port=8000):
+    """
+    Load a model saved with `DecisionTreeModel.save_model` and serve it until interrupted.
+
+    Parameters:
+    - model_path (str): Path of the saved model.
+    - host (str): Interface to bind.
+    - port (int): Port to bind.
+    """
+    from mortality_analysis.predictive_model import DecisionTreeModel
+
+    server = ScoringServer(DecisionTreeModel.load_model(model_path), host, port)
+    logger.info("Serving predictions on %s/predict", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
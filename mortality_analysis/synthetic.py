@@ -0,0 +1,328 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from mortality_analysis.data_cleaning import COLUMN_RENAMES, FLAG_COLUMNS
+
+# States and the District of Columbia with their FIPS codes, as in the BEA file.
+STATE_FIPS = {
+    "Alabama": 1,
+    "Alaska": 2,
+    "Arizona": 4,
+    "Arkansas": 5,
+    "California": 6,
+    "Colorado": 8,
+    "Connecticut": 9,
+    "Delaware": 10,
+    "District of Columbia": 11,
+    "Florida": 12,
+    "Georgia": 13,
+    "Hawaii": 15,
+    "Idaho": 16,
+    "Illinois": 17,
+    "Indiana": 18,
+    "Iowa": 19,
+    "Kansas": 20,
+    "Kentucky": 21,
+    "Louisiana": 22,
+    "Maine": 23,
+    "Maryland": 24,
+    "Massachusetts": 25,
+    "Michigan": 26,
+    "Minnesota": 27,
+    "Mississippi": 28,
+    "Missouri": 29,
+    "Montana": 30,
+    "Nebraska": 31,
+    "Nevada": 32,
+    "New Hampshire": 33,
+    "New Jersey": 34,
+    "New Mexico": 35,
+    "New York": 36,
+    "North Carolina": 37,
+    "North Dakota": 38,
+    "Ohio": 39,
+    "Oklahoma": 40,
+    "Oregon": 41,
+    "Pennsylvania": 42,
+    "Rhode Island": 44,
+    "South Carolina": 45,
+    "South Dakota": 46,
+    "Tennessee": 47,
+    "Texas": 48,
+    "Utah": 49,
+    "Vermont": 50,
+    "Virginia": 51,
+    "Washington": 53,
+    "West Virginia": 54,
+    "Wisconsin": 55,
+    "Wyoming": 56,
+}
+
+# Jurisdictions of the CDC weekly export, in file order.
+CDC_JURISDICTIONS = ["United States"] + sorted(
+    list(STATE_FIPS) + ["New York City", "Puerto Rico"]
+)
+
+# BEA regions, listed after the states and without CDC counterparts.
+BEA_REGIONS = {
+    "New England": 91000,
+    "Mideast": 92000,
+    "Great Lakes": 93000,
+    "Plains": 94000,
+    "Southeast": 95000,
+    "Southwest": 96000,
+    "Rocky Mountain": 97000,
+    "Far West": 98000,
+}
+
+# BEA footnotes these GeoNames with an asterisk, so they do not match the CDC names.
+BEA_FOOTNOTED = ("Alaska", "Hawaii")
+
+# Share of all-cause deaths in each CDC cause column, 'All Cause' first. The COVID-19
+# shares are scaled by `covid_wave`.
+CAUSE_SHARES = np.array(
+    [1.0, 0.92, 0.013, 0.2, 0.03, 0.04, 0.017, 0.048, 0.015, 0.017, 0.012, 0.22, 0.053]
+    + [0.12, 0.1]
+)
+
+ANNUAL_DEATH_RATE = 0.0095
+
+SUPPRESSED_FLAG = (
+    "One or more data cells have counts between 1-9 and have been suppressed in "
+    "accordance with NCHS confidentiality standards."
+)
+INCOMPLETE_FLAG = (
+    "Data in recent weeks are incomplete. Only 60% of records are expected to have "
+    "been processed."
+)
+
+# Weeks of history per jurisdiction before more jurisdictions are added instead.
+DEFAULT_MAX_WEEKS = 520
+
+
+def covid_wave(ending_dates):
+    """
+    Relative COVID-19 mortality per week: zero before March 2020, then four waves
+    over an endemic level.
+    """
+    weeks = (pd.DatetimeIndex(ending_dates) - pd.Timestamp("2020-03-01")).days / 7
+    weeks = np.asarray(weeks, dtype=np.float64)
+    wave = 0.15 * np.ones_like(weeks)
+    waves = ((6, 3, 1.0), (45, 5, 1.6), (78, 4, 0.8), (98, 4, 1.1))
+    for centre, width, height in waves:
+        wave += height * np.exp(-0.5 * ((weeks - centre) / width) ** 2)
+    return np.where(weeks < 0, 0.0, wave)
+
+
+class SyntheticDataset:
+    def __init__(
+        self,
+        rows,
+        max_weeks=DEFAULT_MAX_WEEKS,
+        start="2020-01-04",
+        incomplete_weeks=4,
+        seed=0,
+    ):
+        """
+        Initialize the SyntheticDataset, a schema-faithful stand-in for the CDC weekly
+        export and the BEA quarterly population file at any size.
+
+        Every CDC jurisdiction gets up to `max_weeks` consecutive weeks; larger sizes
+        add numbered copies of the jurisdictions (e.g. 'Ohio #2'), so quarters stay in a
+        realistic range while rows scale from thousands to tens of millions. Counts are
+        Poisson draws around a seasonal death rate of each jurisdiction's population,
+        counts of 1-9 are blanked with the NCHS suppression flag and the latest weeks
+        are incomplete and flagged, as in the real export. The BEA file covers the
+        jurisdictions the way the real one does: states and regions, but no 'New York
+        City' or 'Puerto Rico', and footnoted 'Alaska *' and 'Hawaii *'.
+
+        Parameters:
+        - rows (int): Number of weekly CDC rows.
+        - max_weeks (int): Weeks of history per jurisdiction.
+        - start (str): First 'Week Ending Date', a Saturday.
+        - incomplete_weeks (int): Trailing weeks reported as incomplete.
+        - seed (int): Random seed; the data does not depend on the chunk size.
+        """
+        self.rows = int(rows)
+        # Ceiling divisions: weeks per jurisdiction, then jurisdictions and copies
+        weeks_needed = -(-self.rows // len(CDC_JURISDICTIONS))
+        self.n_weeks = int(min(max(1, weeks_needed), max_weeks))
+        n_jurisdictions = max(1, -(-self.rows // self.n_weeks))
+        self.jurisdictions = [
+            name if copy == 0 else f"{name} #{copy + 1}"
+            for copy in range(-(-n_jurisdictions // len(CDC_JURISDICTIONS)))
+            for name in CDC_JURISDICTIONS
+        ][:n_jurisdictions]
+        self.ending_dates = pd.date_range(start, periods=self.n_weeks, freq="7D")
+        self.incomplete_weeks = incomplete_weeks
+        self.seed = seed
+
+        rng = np.random.default_rng([seed, 0])
+        self.population = np.exp(rng.normal(np.log(4e6), 1.0, n_jurisdictions))
+        is_national = [
+            name.partition(" #")[0] == "United States" for name in self.jurisdictions
+        ]
+        self.population[is_national] = 3.3e8
+        # Quarterly growth rate of each jurisdiction's population
+        self.growth = rng.normal(0.002, 0.002, n_jurisdictions)
+
+    def _weekly_expectation(self):
+        dates = self.ending_dates
+        # Deaths peak in early January
+        day = dates.dayofyear.to_numpy()
+        seasonal = 1 + 0.12 * np.cos(2 * np.pi * (day - 10) / 365.25)
+        shares = np.tile(CAUSE_SHARES, (len(dates), 1))
+        shares[:, -2:] *= covid_wave(dates)[:, None]
+        # The latest weeks are only partly reported, down to 60% in the last one
+        completeness = np.ones(len(dates))
+        if self.incomplete_weeks:
+            n = min(self.incomplete_weeks, len(dates))
+            completeness[-n:] = np.linspace(0.95, 0.6, n)
+        weekly_rate = (ANNUAL_DEATH_RATE / 52) * seasonal * completeness
+        return weekly_rate[:, None] * shares
+
+    def cdc_chunks(self, chunk_rows=500_000):
+        """
+        Generate the weekly CDC rows in chunks, with the export's raw column names.
+
+        Parameters:
+        - chunk_rows (int): Approximate rows per chunk; chunks hold whole jurisdictions.
+
+        Returns:
+        - chunks (iterator): DataFrames sorted by jurisdiction and week, like the
+          export.
+        """
+        cause_columns = list(COLUMN_RENAMES)[5:]
+        expectation = self._weekly_expectation()
+        # MMWR weeks end on Saturday and belong to the year of their Wednesday
+        wednesdays = self.ending_dates - pd.Timedelta(days=3)
+        mmwr_year = wednesdays.year.to_numpy().astype(np.int16)
+        mmwr_week = ((wednesdays.dayofyear.to_numpy() - 1) // 7 + 1).astype(np.int8)
+        ending_labels = self.ending_dates.strftime("%Y-%m-%d").to_numpy()
+        incomplete = np.zeros(self.n_weeks, dtype=bool)
+        if self.incomplete_weeks:
+            incomplete[-self.incomplete_weeks :] = True
+        quarters_elapsed = np.arange(self.n_weeks) / 13
+
+        per_chunk = max(1, chunk_rows // self.n_weeks)
+        for first in range(0, len(self.jurisdictions), per_chunk):
+            parts = []
+            for j in range(first, min(first + per_chunk, len(self.jurisdictions))):
+                weeks = min(self.n_weeks, self.rows - j * self.n_weeks)
+                rng = np.random.default_rng([self.seed, j + 1])
+                growth = (1 + self.growth[j]) ** quarters_elapsed[:weeks]
+                population = self.population[j] * growth
+                counts = rng.poisson(expectation[:weeks] * population[:, None])
+                parts.append((j, weeks, counts.astype(np.float64)))
+
+            weeks = np.concatenate([np.arange(w) for _, w, _ in parts])
+            counts = np.concatenate([c for _, _, c in parts])
+            suppressed = (counts >= 1) & (counts <= 9)
+            counts[suppressed] = np.nan
+            chunk = pd.DataFrame(
+                {
+                    "Data As Of": "2023-09-27",
+                    "Jurisdiction of Occurrence": np.repeat(
+                        [self.jurisdictions[j] for j, _, _ in parts],
+                        [w for _, w, _ in parts],
+                    ),
+                    "MMWR Year": mmwr_year[weeks],
+                    "MMWR Week": mmwr_week[weeks],
+                    "Week Ending Date": ending_labels[weeks],
+                }
+            )
+            for i, column in enumerate(cause_columns):
+                chunk[column] = counts[:, i]
+            flagged_week = incomplete[weeks]
+            for i, column in enumerate(FLAG_COLUMNS):
+                flags = np.full(len(chunk), None, dtype=object)
+                flags[flagged_week] = INCOMPLETE_FLAG
+                flags[suppressed[:, i]] = SUPPRESSED_FLAG
+                chunk[column] = flags
+            yield chunk
+
+    def cdc_frame(self):
+        """
+        Generate all weekly CDC rows as one DataFrame.
+        """
+        return pd.concat(list(self.cdc_chunks()), ignore_index=True)
+
+    def population_frame(self):
+        """
+        Generate the BEA-style wide population table: 'GeoFips', 'GeoName' and one
+        column per quarter ('2020:Q1', ...) covering every CDC week.
+
+        Returns:
+        - population (pd.DataFrame): One row per geography, states before regions.
+        """
+        quarters = pd.period_range(
+            self.ending_dates[0].to_period("Q"),
+            self.ending_dates[-1].to_period("Q"),
+            freq="Q",
+        )
+        names, fips, population, growth = [], [], [], []
+        for j, name in enumerate(self.jurisdictions):
+            base, _, copy = name.partition(" #")
+            if base not in STATE_FIPS and base != "United States":
+                continue
+            code = STATE_FIPS.get(base, 0) * 1000 + (int(copy) - 1 if copy else 0)
+            if base in BEA_FOOTNOTED:
+                name = f"{base} *" + (f" #{copy}" if copy else "")
+            names.append(name)
+            fips.append(code)
+            population.append(self.population[j])
+            growth.append(self.growth[j])
+        rng = np.random.default_rng([self.seed, 0, 1])
+        for name, code in BEA_REGIONS.items():
+            names.append(name)
+            fips.append(code)
+            population.append(np.exp(rng.normal(np.log(3e7), 0.5)))
+            growth.append(rng.normal(0.002, 0.001))
+
+        steps = np.arange(len(quarters))
+        growth = (1 + np.array(growth))[:, None] ** steps
+        values = np.array(population)[:, None] * growth
+        data = pd.DataFrame(
+            np.round(values).astype(np.int64),
+            columns=[f"{p.year}:Q{p.quarter}" for p in quarters],
+        )
+        data.insert(0, "GeoName", names)
+        data.insert(0, "GeoFips", fips)
+        return data
+
+    def write(self, directory, chunk_rows=500_000):
+        """
+        Write the CDC CSV and the BEA CSV, streaming the CDC rows chunk by chunk.
+
+        Chunks are written with pyarrow's CSV writer when it is installed, which is
+        several times faster than `DataFrame.to_csv` at these sizes.
+
+        Parameters:
+        - directory (str): Output directory.
+        - chunk_rows (int): Rows generated and written at a time.
+
+        Returns:
+        - cdc_path (str): Path of the weekly CDC CSV.
+        - population_path (str): Path of the BEA population CSV.
+        """
+        os.makedirs(directory, exist_ok=True)
+        cdc_path = os.path.join(directory, f"cdc_weekly_{self.rows}.csv")
+        population_path = os.path.join(directory, f"bea_population_{self.rows}.csv")
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            pa = None
+
+        with open(cdc_path, "wb") as file:
+            for i, chunk in enumerate(self.cdc_chunks(chunk_rows)):
+                if pa is None:
+                    chunk.to_csv(file, header=i == 0, index=False)
+                else:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    options = pa_csv.WriteOptions(include_header=i == 0)
+                    pa_csv.write_csv(table, file, options)
+        self.population_frame().to_csv(population_path, index=False)
+        return cdc_path, population_path
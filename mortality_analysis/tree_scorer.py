@@ -0,0 +1,133 @@
+import json
+import os
+
+import numpy as np
+
+from mortality_analysis.instrumentation import traced
+
+# Arrays written by `export_tree`, one .npy file each.
+TREE_ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "value")
+
+META_FILE_NAME = "tree.json"
+
+# Levels walked between removals of rows that already reached a leaf.
+COMPACT_EVERY = 4
+
+
+def export_tree(tree_model, feature_names, directory):
+    """
+    Flatten a fitted DecisionTreeRegressor into NumPy arrays.
+
+    One .npy file per array is written to `directory`, so every array can be
+    memory-mapped by `ArrayTreeScorer`. Node i tests `x[feature[i]] <= threshold[i]` and
+    continues at `left[i]` or `right[i]`; leaves have `left[i] == -1` and predict
+    `value[i]`. `missing_left[i]` is the branch taken by NaN inputs.
+
+    Parameters:
+    - tree_model (DecisionTreeRegressor): Fitted single-output regression tree.
+    - feature_names (list): Feature names, in the column order the tree was fitted on.
+    - directory (str): Output directory.
+    """
+    tree = tree_model.tree_
+    if tree.n_outputs != 1:
+        raise ValueError("Only single-output trees can be exported.")
+    arrays = {
+        "feature": tree.feature.astype(np.int32),
+        "threshold": tree.threshold.astype(np.float64),
+        "left": tree.children_left.astype(np.int32),
+        "right": tree.children_right.astype(np.int32),
+        "missing_left": np.asarray(
+            getattr(tree, "missing_go_to_left", np.zeros(tree.node_count)), dtype=bool
+        ),
+        "value": tree.value[:, 0, 0].astype(np.float64),
+    }
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), array)
+    meta = {
+        "feature_names": list(feature_names),
+        "node_count": int(tree.node_count),
+        "max_depth": int(tree.max_depth),
+    }
+    with open(os.path.join(directory, META_FILE_NAME), "w") as file:
+        json.dump(meta, file, indent=2)
+
+
+class ArrayTreeScorer:
+    def __init__(self, directory, mmap=True):
+        """
+        Initialize the ArrayTreeScorer from a directory written by `export_tree`.
+
+        Only NumPy is needed: sklearn is never imported and no estimator object is
+        unpickled, so short-lived scoring jobs start quickly.
+
+        Parameters:
+        - directory (str): Directory holding the exported arrays.
+        - mmap (bool): Memory-map the arrays with `np.load(mmap_mode='r')`.
+        """
+        with open(os.path.join(directory, META_FILE_NAME), "r") as file:
+            meta = json.load(file)
+        self.feature_names = meta["feature_names"]
+        self.max_depth = meta["max_depth"]
+        mmap_mode = "r" if mmap else None
+        for name in TREE_ARRAYS:
+            path = os.path.join(directory, f"{name}.npy")
+            setattr(self, name, np.load(path, mmap_mode=mmap_mode))
+        self._walk = None
+
+    def _walk_arrays(self):
+        # Leaves point to themselves and never branch, so rows that reached a leaf can
+        # keep stepping without being removed from the batch on every level
+        if self._walk is None:
+            leaf = np.asarray(self.left) == -1
+            nodes = np.arange(len(leaf))
+            self._walk = (
+                leaf,
+                np.where(leaf, 0, self.feature).astype(np.intp),
+                np.where(leaf, np.inf, self.threshold),
+                np.where(leaf, nodes, self.left).astype(np.intp),
+                np.where(leaf, nodes, self.right).astype(np.intp),
+                np.where(leaf, True, self.missing_left),
+            )
+        return self._walk
+
+    def _as_matrix(self, data):
+        if hasattr(data, "columns"):
+            data = data[self.feature_names].to_numpy(dtype=np.float64, na_value=np.nan)
+        # sklearn compares float32 inputs against float64 thresholds
+        return np.ascontiguousarray(data, dtype=np.float32)
+
+    @traced(rows_in=lambda self, data: len(data))
+    def predict(self, data):
+        """
+        Score rows by walking all of them down the tree together, one level at a time.
+
+        Parameters:
+        - data (pd.DataFrame or np.ndarray): Rows with the exported features; arrays must
+          have the columns in `feature_names` order.
+
+        Returns:
+        - predictions (np.ndarray): One prediction per row, identical to
+          `DecisionTreeRegressor.predict`.
+        """
+        leaf, feature, threshold, left, right, missing_left = self._walk_arrays()
+        X = self._as_matrix(data)
+        n_features = X.shape[1]
+        flat = X.reshape(-1)
+        node = np.zeros(len(X), dtype=np.intp)
+        active = np.arange(len(X))
+        for level in range(self.max_depth):
+            current = node[active]
+            values = flat[active * n_features + feature[current]]
+            go_left = values <= threshold[current]
+            missing = np.isnan(values)
+            if missing.any():
+                go_left[missing] = missing_left[current[missing]]
+            current = np.where(go_left, left[current], right[current])
+            node[active] = current
+            # Drop finished rows every few levels; deep, unbalanced trees shrink fast
+            if level % COMPACT_EVERY == COMPACT_EVERY - 1:
+                active = active[~leaf[current]]
+                if not active.size:
+                    break
+        return np.asarray(self.value[node])
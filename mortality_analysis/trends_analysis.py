@@ -1,6 +1,6 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from mortality_analysis.instrumentation import traced
 
 
 class MortalityTrends:
@@ -14,31 +14,59 @@ class MortalityTrends:
         """
         self.data = data
 
-    def explore_mortality_trends(self, diseases):
+    @traced(rows_in=lambda self, diseases: len(self.data))
+    def quarterly_mortality_rates(self, diseases):
+        """
+        Compute the mean mortality rate of each disease per 'Year' and 'Quarter', without
+        plotting.
+
+        Parameters:
+        - diseases (list): List of strings representing the diseases to analyze.
+
+        Returns:
+        - pd.DataFrame: Mean mortality rates per 'Year' and 'Quarter'.
+
+        Note:
+        - The function modifies the input DataFrame by adding new columns for each disease's mortality rate.
+        """
+        # Calculate and add mortality rate columns for each specified disease
+        for disease in diseases:
+            self.data[f"{disease}_Mortality_Rate"] = (
+                self.data[disease] / self.data["Total_Population"]
+            )
+
+        # Group data by 'Year' and 'Quarter' and calculate mean for each quarter
+        return (
+            self.data.groupby(["Year", "Quarter"]).mean(numeric_only=True).reset_index()
+        )
+
+    @traced(rows_in=lambda self, *args, **kwargs: len(self.data))
+    def explore_mortality_trends(self, diseases, output_path=None):
         """
         Explore and visualize mortality rate trends for specific diseases across states over time.
 
         Parameters:
         - diseases (list): List of strings representing the diseases to analyze.
+        - output_path (str): If given, save the figure to this file (PNG, SVG, ...) instead
+          of showing it.
 
         Output:
         - Display a line plot showing the trends in mortality rates for each specified disease over the years,
           aggregated by quarters.
 
+        Returns:
+        - pd.DataFrame: Mean mortality rates per 'Year' and 'Quarter'.
+
         Notes:
         - The function modifies the input DataFrame by adding new columns for each disease's mortality rate.
         - Mortality rates are calculated as the ratio of the specific disease count to the total population.
         - The function groups the data by 'Year' and 'Quarter' and calculates the mean for each quarter.
         - The line plot depicts the mortality rate trends for each disease across the specified time period.
         """
-        # Calculate and add mortality rate columns for each specified disease
-        for disease in diseases:
-            self.data[f"{disease}_Mortality_Rate"] = (
-                self.data[disease] / self.data["Total_Population"]
-            )
+        import matplotlib.pyplot as plt
+        import seaborn as sns
 
-        # Group data by 'Year' and 'Quarter' and calculate mean for each quarter
-        quarterly_data = self.data.groupby(["Year", "Quarter"]).mean().reset_index()
+        quarterly_data = self.quarterly_mortality_rates(diseases)
 
         # Plot mortality rate trends for each disease
         plt.figure(figsize=(15, 8))
@@ -62,7 +90,13 @@ class MortalityTrends:
         plt.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
 
         # Show the plot
-        plt.show()
+        if output_path is None:
+            plt.show()
+        else:
+            plt.savefig(output_path, bbox_inches="tight")
+            plt.close()
+
+        return quarterly_data
 
 
 # Example Usage:
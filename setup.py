@@ -1,4 +1,4 @@
-from distutils.core import setup
+from setuptools import setup
 
 setup(
     name='Mortality_Analysis',
@@ -9,15 +9,20 @@ setup(
     license='MIT',
     url='https://github.com/LokeshDondapati/Mortality_Analysis',
     packages=['mortality_analysis'],
+    package_data={'mortality_analysis': ['datasets/*.csv']},
     install_requires=[
         'matplotlib>=3.0.2',
         'numpy>=1.15.2',
         'pandas>=0.23.4',
         'seaborn>=0.11.0',
-        'scikit-learn>=1.3.2',
+        'scikit-learn>=1.5',
         'scipy>=1.11.4',
-        'requests>=2.31.0'
+        'requests>=2.31.0',
+        'pyarrow>=14.0.0'
 
 
     ],
+    entry_points={
+        'console_scripts': ['mortality-analysis=mortality_analysis.cli:main'],
+    },
 )
@@ -0,0 +1,33 @@
+import pytest
+
+from mortality_analysis.data_cleaning import CDCDataProcessor
+from mortality_analysis.merge_data import DataMerge
+from mortality_analysis.population import PopulationProvider
+from mortality_analysis.synthetic import CDC_JURISDICTIONS, SyntheticDataset
+
+
+@pytest.fixture(scope="session")
+def merged_data(tmp_path_factory):
+    """
+    Merged CDC and population data for every jurisdiction over 104 synthetic weeks.
+    """
+    dataset = SyntheticDataset(len(CDC_JURISDICTIONS) * 104, max_weeks=104)
+    population_path = tmp_path_factory.mktemp("population") / "population.csv"
+    dataset.population_frame().to_csv(population_path, index=False)
+
+    cdc_data = CDCDataProcessor(
+        dataset.cdc_frame(), aggregation="sum"
+    ).preprocess_data()
+    population = PopulationProvider(
+        str(population_path), cache_dir=None
+    ).to_long_frame()
+    return DataMerge(cdc_data, population).merge_dataframes()
+
+
+@pytest.fixture(scope="session")
+def synthetic_files(tmp_path_factory):
+    """
+    Paths of a synthetic CDC export and matching BEA file, 57 jurisdictions x 30 weeks.
+    """
+    directory = tmp_path_factory.mktemp("synthetic")
+    return SyntheticDataset(57 * 30, max_weeks=30).write(str(directory))
@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mortality_analysis.cli import COMMANDS, main
+
+
+@pytest.fixture(autouse=True)
+def package_logger():
+    # main() configures the package logger; restore it after each run
+    logger = logging.getLogger("mortality_analysis")
+    handlers, level = list(logger.handlers), logger.level
+    yield logger
+    logger.handlers[:] = handlers
+    logger.setLevel(level)
+
+
+@pytest.fixture
+def data_args(synthetic_files, tmp_path):
+    cdc_path, population_path = synthetic_files
+    return [
+        "--cdc-file",
+        cdc_path,
+        "--population-file",
+        population_path,
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        "--output-dir",
+        str(tmp_path / "figures"),
+        "--aggregation",
+        "sum",
+    ]
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        ("ingest", "Jurisdictions: "),
+        ("merge", "Jurisdictions without population: "),
+        ("profile", "Basic Statistics:"),
+        ("trends", "Septicemia_Mortality_Rate"),
+        ("death-rate", "Top 10 States with Highest Death Rates:"),
+        ("influence", "Correlation Coefficients:"),
+        ("train", "Coefficient of Determination (R2 Score): "),
+    ],
+)
+def test_every_command_runs_without_plots(command, expected, data_args, capsys):
+    status = main([command, "--no-plots", *data_args])
+
+    assert status == 0
+    assert expected in capsys.readouterr().out
+
+
+def test_commands_cover_the_parser():
+    assert set(COMMANDS) == {
+        "ingest",
+        "merge",
+        "profile",
+        "trends",
+        "death-rate",
+        "influence",
+        "train",
+    }
+
+
+def test_merge_writes_its_output(data_args, tmp_path, capsys):
+    output = tmp_path / "merged.csv"
+
+    status = main(["merge", "--no-plots", "--output", str(output), *data_args])
+
+    assert status == 0
+    assert output.stat().st_size > 0
+    assert "Puerto Rico" in capsys.readouterr().out
+
+
+def test_plots_are_written_to_the_output_dir(data_args, tmp_path):
+    status = main(["death-rate", "--figure-format", "svg", *data_args])
+
+    assert status == 0
+    assert (tmp_path / "figures" / "death_rate.svg").stat().st_size > 0
+
+
+def test_per_jurisdiction_training(data_args, tmp_path, capsys):
+    model_path = tmp_path / "models.joblib"
+
+    status = main(
+        [
+            "train",
+            "--no-plots",
+            "--by-jurisdiction",
+            "--workers",
+            "1",
+            "--model-out",
+            str(model_path),
+            *data_args,
+        ]
+    )
+
+    assert status == 0
+    assert model_path.exists()
+    assert "Alabama" in capsys.readouterr().out
+
+
+def test_trace_is_written(data_args, tmp_path):
+    trace_path = tmp_path / "trace.json"
+
+    status = main(["ingest", "--no-plots", "--trace", str(trace_path), *data_args])
+
+    assert status == 0
+    assert json.loads(trace_path.read_text())
+
+
+def test_missing_input_file_exits_with_status_1(data_args, tmp_path, capsys):
+    data_args[1] = str(tmp_path / "missing.csv")
+
+    status = main(["ingest", "--no-plots", *data_args])
+
+    assert status == 1
+    assert "ingest failed" in capsys.readouterr().err
+
+
+def test_no_plots_never_imports_matplotlib(data_args):
+    # A fresh interpreter, since this one may already have imported matplotlib
+    script = (
+        "import sys\n"
+        "from mortality_analysis.cli import COMMANDS, main\n"
+        "for command in COMMANDS:\n"
+        "    assert main([command, '--no-plots', *sys.argv[1:]]) == 0, command\n"
+        "    assert 'matplotlib' not in sys.modules, command\n"
+    )
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+
+    result = subprocess.run(
+        [sys.executable, "-c", script, *data_args],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mortality_analysis import correlation
+from mortality_analysis.correlation import (
+    compute_correlation,
+    correlation_with,
+    get_correlation_engine,
+    update_correlation,
+)
+
+
+@pytest.fixture(autouse=True)
+def engines(monkeypatch):
+    # Every test starts without shared engines
+    engines = []
+    monkeypatch.setattr(correlation, "_engines", engines)
+    return engines
+
+
+def _frame(rows=500, seed=0, missing=0.1):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=rows)
+    data = pd.DataFrame(
+        {
+            "a": base + rng.normal(size=rows),
+            "b": 1e6 + base * 1e3 + rng.normal(size=rows),
+            "c": -base + rng.normal(size=rows) * 0.1,
+            "d": rng.normal(size=rows),
+        }
+    )
+    data = data.mask(rng.random(data.shape) < missing)
+    data["label"] = "x"
+    return data
+
+
+def test_matches_pandas_with_missing_values():
+    data = _frame()
+
+    result = compute_correlation(data)
+
+    pd.testing.assert_frame_equal(result, data.corr(numeric_only=True), rtol=1e-9)
+
+
+def test_column_subset_is_served_from_the_same_engine(engines):
+    data = _frame()
+    compute_correlation(data)
+    engine = engines[0]
+
+    result = compute_correlation(data, ["d", "a"])
+
+    assert len(engines) == 1
+    assert (engine.hits, engine.misses) == (1, 1)
+    pd.testing.assert_frame_equal(result, data[["d", "a"]].corr(), rtol=1e-9)
+
+
+def test_renamed_columns_keep_the_requested_names(engines):
+    data = _frame()
+    compute_correlation(data)
+
+    renamed = data.rename(columns={"a": "first"})
+    result = compute_correlation(renamed, ["first", "b"])
+
+    assert len(engines) == 1
+    pd.testing.assert_frame_equal(result, renamed[["first", "b"]].corr(), rtol=1e-9)
+
+
+def test_changed_data_is_a_cache_miss(engines):
+    data = _frame()
+    compute_correlation(data)
+    changed = data.copy()
+    changed.loc[0, "a"] = 100.0
+
+    engine, _ = get_correlation_engine(changed)
+
+    assert len(engines) == 2
+    assert engine is engines[-1]
+    pd.testing.assert_frame_equal(
+        engine.correlation(), changed.corr(numeric_only=True), rtol=1e-9
+    )
+
+
+@pytest.mark.parametrize("columns", [None, ["a", "c"]])
+def test_update_matches_pandas_on_all_rows(engines, columns):
+    history, new_rows = _frame(seed=1), _frame(rows=200, seed=2, missing=0.3)
+    compute_correlation(history)
+    combined = pd.concat([history, new_rows], ignore_index=True)
+
+    result = update_correlation(history, new_rows, columns)
+
+    expected = combined[columns or ["a", "b", "c", "d"]].corr()
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-9)
+    # The updated engine now describes the combined frame
+    engines_before = len(engines)
+    pd.testing.assert_frame_equal(
+        compute_correlation(combined, columns), expected, rtol=1e-9
+    )
+    assert len(engines) == engines_before
+
+
+def test_correlation_with_target_matches_pandas():
+    data = _frame()
+
+    result = correlation_with(data, "a")
+
+    expected = data.corr(numeric_only=True)["a"].drop("a")
+    pd.testing.assert_series_equal(result, expected, rtol=1e-9, check_names=False)
+
+
+def test_constant_columns_have_no_correlation():
+    data = _frame(missing=0.0).assign(d=1.0)
+
+    result = compute_correlation(data, ["a", "d"])
+
+    assert np.isnan(result.loc["a", "d"])
+    assert np.isnan(correlation_with(data, "a", ["d"])["d"])
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from mortality_analysis.data_cleaning import CDCDataProcessor
+from mortality_analysis.load_data import Loaddata
+from mortality_analysis.synthetic import SyntheticDataset
+
+
+@pytest.fixture(scope="module")
+def cdc_path(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("cdc")
+    cdc_path, _ = SyntheticDataset(57 * 30, max_weeks=30).write(str(directory))
+    return cdc_path
+
+
+@pytest.mark.parametrize("aggregation", ["first", "sum", "mean"])
+@pytest.mark.parametrize("chunksize", [50, 300])
+def test_chunked_preprocessing_matches_whole_frame(cdc_path, aggregation, chunksize):
+    loader = Loaddata(None, cache_dir=None)
+    whole = CDCDataProcessor(
+        loader.read_cdc_csv(cdc_path), aggregation=aggregation
+    ).preprocess_data()
+
+    chunked = CDCDataProcessor(aggregation=aggregation).preprocess_chunks(
+        loader.read_cdc_csv_chunks(cdc_path, chunksize=chunksize)
+    )
+
+    assert isinstance(chunked["Jurisdiction"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_no_chunks_give_an_empty_frame():
+    data = CDCDataProcessor().preprocess_chunks(iter([]))
+
+    assert data.empty
+    assert {"Jurisdiction", "Quarter", "Year", "Month", "Day"} <= set(data.columns)
@@ -0,0 +1,165 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mortality_analysis.data_preparation import (
+    DataPreparation,
+    OutlierFilter,
+    PreparationArtifact,
+    categorical_columns,
+    feature_scores,
+)
+
+
+def _numeric_frame(rows=1_000, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(rng.normal(size=(rows, 3)), columns=["a", "b", "c"])
+    data.loc[::97, "a"] = 25.0
+    data.loc[::89, "b"] = -25.0
+    data["label"] = "x"
+    return data
+
+
+def _scoring_frame(rows=2_000):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "noise": rng.normal(size=rows),
+            "weak": rng.normal(size=rows),
+            "strong": rng.normal(size=rows),
+            "constant": np.ones(rows),
+            "gappy": rng.normal(size=rows),
+        }
+    )
+    data["target"] = 5.0 * data["strong"] - 2.5 * data["weak"] + data["gappy"]
+    data["target"] += rng.normal(size=rows)
+    data.loc[::50, "gappy"] = np.nan
+    return data
+
+
+def test_pearson_scores_are_absolute_correlations():
+    data = _scoring_frame()
+    data["strong"] *= -1
+
+    scores = feature_scores(data, "target", "pearson")
+
+    expected = data.corr()["target"].drop("target").abs()
+    pd.testing.assert_series_equal(scores, expected, check_names=False)
+
+
+def test_f_regression_scores_match_sklearn():
+    from sklearn.feature_selection import f_regression
+
+    data = _scoring_frame()
+
+    scores = feature_scores(data, "target", "f_regression")
+
+    expected, _ = f_regression(data[["noise", "weak", "strong"]], data["target"])
+    np.testing.assert_allclose(scores[["noise", "weak", "strong"]], expected)
+    # Constant features and features with missing values cannot be scored
+    assert scores[["constant", "gappy"]].isna().all()
+
+
+def test_mutual_info_ranks_the_informative_features_first():
+    data = _scoring_frame()
+
+    scores = feature_scores(data, "target", "mutual_info")
+
+    assert list(scores.dropna().sort_values(ascending=False).index) == [
+        "strong",
+        "weak",
+        "noise",
+    ]
+
+
+@pytest.mark.parametrize("selection", ["pearson", "f_regression", "mutual_info"])
+def test_top_k_features_are_kept_with_the_target(selection):
+    preparation = DataPreparation(_scoring_frame(), "target", k=2, selection=selection)
+
+    preparation.select_top_k_features()
+
+    assert preparation.selected_features == ["strong", "weak"]
+    assert list(preparation.merged_data.columns) == ["strong", "weak", "target"]
+
+
+def test_invalid_strategy_raises():
+    with pytest.raises(ValueError, match="Invalid strategy"):
+        feature_scores(_scoring_frame(), "target", "chi2")
+
+
+def test_iqr_bounds_fitted_on_one_frame_filter_another():
+    train, batch = _numeric_frame(seed=0), _numeric_frame(seed=1)
+    batch.loc[3, "c"] = np.nan
+
+    kept = OutlierFilter("IQR").fit(train).transform(batch)
+
+    numeric = train[["a", "b", "c"]]
+    q1, q3 = numeric.quantile(0.25), numeric.quantile(0.75)
+    lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    values = batch[["a", "b", "c"]]
+    outliers = ((values < lower) | (values > upper)).any(axis=1)
+    pd.testing.assert_frame_equal(kept, batch[~outliers])
+    # Missing values are kept with 'IQR'
+    assert 3 in kept.index
+
+
+def test_z_score_drops_only_rows_with_missing_values():
+    data = _numeric_frame()
+    data.loc[5, "a"] = np.nan
+
+    keep = OutlierFilter("Z-score").fit(data).mask(data)
+
+    values = data[["a", "b", "c"]].to_numpy()
+    z = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0)
+    expected = (np.abs(z) < 3.0).all(axis=1)
+    np.testing.assert_array_equal(keep, expected)
+    # Unlike scipy.stats.zscore, one missing value does not drop the whole column
+    assert not keep[5]
+    assert keep.sum() > 0.9 * len(data)
+
+
+def test_unfitted_filter_raises():
+    with pytest.raises(RuntimeError, match="fitted"):
+        OutlierFilter().transform(_numeric_frame())
+
+
+def test_string_columns_are_categorical():
+    data = pd.DataFrame(
+        {
+            "text": pd.Series(["a", "b"], dtype="str"),
+            "objects": pd.Series(["a", None], dtype=object),
+            "category": pd.Series(["a", "b"], dtype="category"),
+            "number": [1.0, 2.0],
+        }
+    )
+
+    assert list(categorical_columns(data)) == ["text", "objects", "category"]
+
+
+def test_artifact_round_trip_reproduces_the_preparation(merged_data, tmp_path):
+    halves = merged_data.iloc[::2], merged_data.iloc[1::2].copy()
+    halves[1].loc[halves[1].index[:5], "Septicemia"] = np.nan
+    halves[1].loc[halves[1].index[5], "GeoName"] = "Atlantis"
+    preparation = DataPreparation(halves[0].copy(), "Total Deaths", k=20)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        artifact = preparation.fit()
+    artifact.save(str(tmp_path / "artifact.json"))
+    loaded = PreparationArtifact.load(str(tmp_path / "artifact.json"))
+
+    assert {"Jurisdiction", "GeoName"} <= set(artifact.category_mappings)
+    assert loaded.to_dict() == artifact.to_dict()
+    expected = artifact.transform(halves[1])
+    pd.testing.assert_frame_equal(loaded.transform(halves[1]), expected)
+    assert not expected.isna().any().any()
+    if "GeoName" in expected:
+        assert expected.loc[halves[1].index[5], "GeoName"] == -1
+    # Transforming the fitted frame reproduces the prepared data
+    pd.testing.assert_frame_equal(
+        artifact.transform(halves[0]),
+        preparation.merged_data,
+        check_dtype=False,
+    )
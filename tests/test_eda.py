@@ -0,0 +1,35 @@
+import logging
+
+from mortality_analysis.diseases_with_significant_influence_analysis import (
+    DiseaseInfluence,
+)
+from mortality_analysis.eda import Eda
+
+
+def test_summary_tables_are_logged_not_printed(merged_data, caplog, capsys):
+    eda = Eda(merged_data)
+
+    with caplog.at_level(logging.INFO, logger="mortality_analysis"):
+        stats = eda.display_basic_statistics()
+        eda.display_missing_values()
+        eda.display_data_types()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert [message.split(":")[0] for message in messages] == [
+        "Basic Statistics",
+        "Missing Values",
+        "Data Types",
+    ]
+    assert stats.to_string() in messages[0]
+    assert capsys.readouterr().out == ""
+
+
+def test_disease_correlations_are_logged(merged_data, caplog, tmp_path):
+    influence = DiseaseInfluence(merged_data)
+
+    with caplog.at_level(logging.INFO, logger="mortality_analysis"):
+        correlations = influence.analyze_and_visualize(
+            output_path=str(tmp_path / "influence.png")
+        )
+
+    assert correlations.to_string() in caplog.text
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from mortality_analysis.data_cleaning import CDCDataProcessor
+from mortality_analysis.incremental_store import IncrementalStore
+from mortality_analysis.load_data import Loaddata
+from mortality_analysis.merge_data import DataMerge
+from mortality_analysis.population import PopulationProvider
+from mortality_analysis.synthetic import SyntheticDataset
+
+
+class _LocalLoader(Loaddata):
+    # Serves a local export in place of the conditional download
+    def download_cdc_data(self, chunk_size=1 << 20, timeout=60):
+        self.last_download = {"cache_hit": False, "bytes_transferred": 0}
+        return self.file_name
+
+
+@pytest.fixture
+def exports(tmp_path):
+    dataset = SyntheticDataset(57 * 60, max_weeks=60)
+    population_path = tmp_path / "population.csv"
+    dataset.population_frame().to_csv(population_path, index=False)
+
+    full = dataset.cdc_frame()
+    ending_dates = pd.to_datetime(full["Week Ending Date"])
+    cutoff = ending_dates.max() - pd.Timedelta(weeks=6)
+    old = full[ending_dates <= cutoff]
+    # The newer export revises a week inside the revision window
+    new = full.assign(**{"Data As Of": "2023-10-04"})
+    revised = ending_dates == cutoff - pd.Timedelta(weeks=2)
+    new.loc[revised, "All Cause"] += 100
+
+    old_path, new_path = tmp_path / "old.csv", tmp_path / "new.csv"
+    old.to_csv(old_path, index=False)
+    new.to_csv(new_path, index=False)
+    return str(old_path), str(new_path), str(population_path)
+
+
+def _merge(cdc_rows, population):
+    cdc_data = CDCDataProcessor(cdc_rows, aggregation="sum").preprocess_data()
+    return DataMerge(cdc_data, population)
+
+
+def test_refresh_updates_only_affected_partitions(exports, tmp_path):
+    old_path, new_path, population_path = exports
+    population = PopulationProvider(population_path, cache_dir=None).to_long_frame()
+    store = IncrementalStore(str(tmp_path / "store"), revision_weeks=8)
+
+    store.refresh(_LocalLoader(None, file_name=old_path, cache_dir=None))
+    merged = _merge(store.load(), population).merge_dataframes()
+    affected = store.refresh(_LocalLoader(None, file_name=new_path, cache_dir=None))
+    updated = _merge(store.load(affected), population).merge_partitions(merged)
+
+    assert 0 < len(affected) < len(store.partitions())
+    raw = Loaddata(None, cache_dir=None).read_cdc_csv(new_path)
+    expected = _merge(raw, population).merge_dataframes()
+    expected = expected.sort_values(
+        ["Quarter", "Jurisdiction"], kind="stable", ignore_index=True
+    )
+    pd.testing.assert_frame_equal(
+        updated.astype({"Jurisdiction": str}),
+        expected.astype({"Jurisdiction": str}),
+        check_dtype=False,
+    )
+
+
+def test_unchanged_watermark_reads_no_rows(exports, tmp_path):
+    old_path, _, _ = exports
+    store = IncrementalStore(str(tmp_path / "store"))
+    loader = _LocalLoader(None, file_name=old_path, cache_dir=None)
+    store.refresh(loader)
+
+    chunks = loader.read_cdc_csv_filtered(old_path, store._raw_row_filter())
+
+    assert list(chunks) == []
+
+
+def test_revision_only_ingest_advances_data_as_of(exports, tmp_path):
+    old_path, _, _ = exports
+    old = pd.read_csv(old_path)
+    store = IncrementalStore(str(tmp_path / "store"), revision_weeks=8)
+    store.refresh(_LocalLoader(None, file_name=old_path, cache_dir=None))
+    last_ending_date = store.state["last_ending_date"]
+
+    # Revisions of older weeks only, without the latest week
+    ending_dates = pd.to_datetime(old["Week Ending Date"])
+    revised = old[ending_dates < ending_dates.max()].assign(
+        **{"Data As Of": "2023-10-04"}
+    )
+    revised["All Cause"] += 1
+    revised_path = tmp_path / "revised.csv"
+    revised.to_csv(revised_path, index=False)
+    loader = _LocalLoader(None, file_name=str(revised_path), cache_dir=None)
+
+    assert store.refresh(loader)
+    assert store.state["last_ending_date"] == last_ending_date
+    assert pd.Timestamp(store.state["data_as_of"]) == pd.Timestamp("2023-10-04")
+    # The same revisions are not ingested again
+    assert store.refresh(loader) == []
+    assert IncrementalStore(str(tmp_path / "store")).state == store.state
@@ -0,0 +1,97 @@
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mortality_analysis import jurisdiction_trainer
+from mortality_analysis.jurisdiction_trainer import JurisdictionTrainer
+
+
+@pytest.fixture
+def created_blocks(monkeypatch):
+    # Record the shared memory blocks the trainer creates
+    names = []
+
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, *args, create=False, **kwargs):
+            super().__init__(*args, create=create, **kwargs)
+            if create:
+                names.append(self.name)
+
+    monkeypatch.setattr(
+        jurisdiction_trainer,
+        "shared_memory",
+        SimpleNamespace(SharedMemory=RecordingSharedMemory),
+    )
+    return names
+
+
+def _assert_released(names):
+    assert len(names) == 2
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_pool_training_matches_serial_training(merged_data, created_blocks):
+    serial = JurisdictionTrainer(merged_data, max_workers=1, min_rows=4)
+    pooled = JurisdictionTrainer(merged_data, max_workers=2, min_rows=4)
+
+    expected = serial.train()
+    metrics = pooled.train()
+
+    columns = ["rows", "train_rows", "test_rows", "mae", "mse", "r2", "error"]
+    pd.testing.assert_frame_equal(metrics[columns], expected[columns])
+    assert set(pooled.registry) == set(merged_data["Jurisdiction"].astype(str))
+    pd.testing.assert_series_equal(
+        pooled.predict(merged_data), serial.predict(merged_data)
+    )
+    _assert_released(created_blocks)
+
+
+def test_shared_memory_is_released_when_the_pool_fails(
+    merged_data, created_blocks, monkeypatch
+):
+    def failing_pool(*args, **kwargs):
+        raise RuntimeError("pool failed")
+
+    monkeypatch.setattr(jurisdiction_trainer, "ProcessPoolExecutor", failing_pool)
+    trainer = JurisdictionTrainer(merged_data, max_workers=2)
+
+    with pytest.raises(RuntimeError, match="pool failed"):
+        trainer.train()
+
+    _assert_released(created_blocks)
+
+
+def test_predictions_use_each_jurisdictions_model(merged_data):
+    trainer = JurisdictionTrainer(merged_data, max_workers=1, min_rows=4)
+    trainer.train()
+    data = merged_data.copy()
+    data.loc[data.index[:3], "Jurisdiction"] = "Atlantis"
+
+    predictions = trainer.predict(data)
+
+    assert predictions.iloc[:3].isna().all()
+    rows = data[data["Jurisdiction"] == "Alabama"]
+    expected = trainer.registry["Alabama"].predict(
+        rows[trainer.feature_names].to_numpy(dtype=np.float64)
+    )
+    np.testing.assert_array_equal(predictions[rows.index], expected)
+
+
+def test_saved_trainer_predicts_the_same(merged_data, tmp_path):
+    trainer = JurisdictionTrainer(merged_data, max_workers=1, min_rows=4)
+    trainer.train()
+
+    trainer.save(str(tmp_path / "trainer.joblib"))
+    loaded = JurisdictionTrainer.load(str(tmp_path / "trainer.joblib"))
+
+    assert loaded.feature_names == trainer.feature_names
+    pd.testing.assert_frame_equal(loaded.metrics, trainer.metrics)
+    pd.testing.assert_series_equal(
+        loaded.predict(merged_data), trainer.predict(merged_data)
+    )
+    assert list(tmp_path.iterdir()) == [tmp_path / "trainer.joblib"]
@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mortality_analysis.load_data import Loaddata
+
+
+class _ExportHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def export_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ExportHandler)
+    server.body = b"Jurisdiction of Occurrence,MMWR Year\nAlabama,2020\n"
+    server.etag = '"v1"'
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _loader(server, tmp_path):
+    host, port = server.server_address[:2]
+    return Loaddata(
+        f"http://{host}:{port}/rows.csv",
+        file_name=str(tmp_path / "cdc.csv"),
+        cache_dir=None,
+    )
+
+
+def test_first_download_streams_the_body(export_server, tmp_path):
+    loader = _loader(export_server, tmp_path)
+
+    path = loader.download_cdc_data()
+
+    assert loader.last_download == {
+        "cache_hit": False,
+        "bytes_transferred": len(export_server.body),
+        "status_code": 200,
+    }
+    with open(path, "rb") as file:
+        assert file.read() == export_server.body
+    with open(loader.metadata_file) as file:
+        assert json.load(file)["etag"] == '"v1"'
+    assert "If-None-Match" not in export_server.requests[0]
+
+
+def test_unchanged_export_is_not_transferred_again(export_server, tmp_path):
+    loader = _loader(export_server, tmp_path)
+    loader.download_cdc_data()
+
+    path = loader.download_cdc_data()
+
+    assert export_server.requests[1]["If-None-Match"] == '"v1"'
+    assert loader.last_download == {
+        "cache_hit": True,
+        "bytes_transferred": 0,
+        "status_code": 304,
+    }
+    with open(path, "rb") as file:
+        assert file.read() == export_server.body
+
+
+def test_changed_etag_downloads_again(export_server, tmp_path):
+    loader = _loader(export_server, tmp_path)
+    loader.download_cdc_data()
+    export_server.body = b"Jurisdiction of Occurrence,MMWR Year\nAlaska,2021\n"
+    export_server.etag = '"v2"'
+
+    path = loader.download_cdc_data()
+
+    assert loader.last_download["cache_hit"] is False
+    assert loader.last_download["bytes_transferred"] == len(export_server.body)
+    with open(path, "rb") as file:
+        assert file.read() == export_server.body
+    with open(loader.metadata_file) as file:
+        assert json.load(file)["etag"] == '"v2"'
+    assert not list(tmp_path.glob("*.part"))
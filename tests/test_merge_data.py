@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mortality_analysis.data_cleaning import CDCDataProcessor
+from mortality_analysis.merge_data import MERGED_COLUMNS, DataMerge, JoinIndex
+from mortality_analysis.population import PopulationProvider
+
+
+@pytest.fixture(scope="module")
+def merge_inputs(synthetic_files):
+    cdc_path, population_path = synthetic_files
+    cdc_data = CDCDataProcessor(
+        pd.read_csv(cdc_path), aggregation="sum"
+    ).preprocess_data()
+    population = PopulationProvider(population_path, cache_dir=None).to_long_frame()
+    # A quarter missing for one state, and a state missing from the CDC side
+    population = population[
+        ~((population["GeoName"] == "Alabama") & (population["Quaterly"] == "2020:Q2"))
+    ]
+    population = pd.concat(
+        [
+            population,
+            pd.DataFrame(
+                {
+                    "GeoName": ["Atlantis"],
+                    "Quaterly": ["2020:Q1"],
+                    "Total_Population": [1.0],
+                }
+            ),
+        ],
+        ignore_index=True,
+    )
+    return cdc_data, population
+
+
+def _string_merge(cdc_data, population):
+    # The merge on string keys that the integer join replaces
+    cdc_data = cdc_data.assign(
+        Jurisdiction=cdc_data["Jurisdiction"].astype(str),
+        Quarter=cdc_data["Quarter"].astype(str),
+    )
+    population = population.assign(
+        Quarter=population["Quaterly"].str.replace(":", "")
+    ).drop(columns="Quaterly")
+    merged = pd.merge(
+        cdc_data,
+        population,
+        left_on=["Jurisdiction", "Quarter"],
+        right_on=["GeoName", "Quarter"],
+        how="inner",
+    )
+    return merged[MERGED_COLUMNS]
+
+
+def test_integer_join_matches_string_merge(merge_inputs):
+    cdc_data, population = merge_inputs
+    before = cdc_data.copy()
+
+    merged = DataMerge(cdc_data, population).merge_dataframes()
+
+    pd.testing.assert_frame_equal(
+        merged, _string_merge(cdc_data, population), check_dtype=False
+    )
+    pd.testing.assert_frame_equal(cdc_data, before)
+
+
+def test_unknown_pairs_drop_out(merge_inputs):
+    cdc_data, population = merge_inputs
+    merge = DataMerge(cdc_data, population)
+
+    merged = merge.merge_dataframes()
+
+    pairs = set(zip(merged["Jurisdiction"].astype(str), merged["Quarter"]))
+    assert ("Alabama", "2020Q2") not in pairs
+    assert ("Alabama", "2020Q1") in pairs
+    assert "Puerto Rico" not in set(merged["Jurisdiction"].astype(str))
+    assert "Puerto Rico" in merge.unmatched["jurisdictions_without_population"]
+    assert "Atlantis" in merge.unmatched["geo_names_without_cdc"]
+
+
+def test_locate_returns_minus_one_outside_the_index(merge_inputs):
+    _, population = merge_inputs
+    index = JoinIndex(population)
+
+    rows = index.locate(
+        ["Alabama", "Alabama", "Atlantis", "Nowhere", "Alabama"],
+        ["2020Q1", "2020Q2", "2020Q1", "2020Q1", "2031Q1"],
+    )
+
+    assert rows[0] >= 0 and rows[2] >= 0
+    np.testing.assert_array_equal(rows[[1, 3, 4]], -1)
+    located = population.iloc[rows[[0, 2]]]
+    assert list(located["GeoName"]) == ["Alabama", "Atlantis"]
+    assert list(located["Quaterly"]) == ["2020:Q1", "2020:Q1"]
+
+
+def test_merge_partitions_replaces_only_the_affected_quarters(merge_inputs):
+    cdc_data, population = merge_inputs
+    index = JoinIndex(population)
+    merged = DataMerge(cdc_data, population, join_index=index).merge_dataframes()
+    revised = cdc_data.copy()
+    affected = revised["Quarter"].astype(str) == "2020Q2"
+    revised.loc[affected, "Total Deaths"] += 1
+
+    spliced = DataMerge(
+        revised[affected], population, join_index=index
+    ).merge_partitions(merged)
+
+    expected = DataMerge(revised, population, join_index=index).merge_dataframes()
+    expected = expected.sort_values(
+        ["Quarter", "Jurisdiction"], kind="stable", ignore_index=True
+    )
+    pd.testing.assert_frame_equal(spliced, expected)
+    kept = spliced["Quarter"] != "2020Q2"
+    pd.testing.assert_frame_equal(
+        spliced[kept].reset_index(drop=True),
+        merged[merged["Quarter"] != "2020Q2"]
+        .sort_values(["Quarter", "Jurisdiction"], kind="stable")
+        .reset_index(drop=True),
+    )
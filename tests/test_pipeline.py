@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from mortality_analysis.pipeline import Pipeline, StageCache
+
+
+def _pipeline(synthetic_files, cache_dir, **params):
+    cdc_path, population_path = synthetic_files
+    return Pipeline(
+        cdc_file=cdc_path,
+        population_file=population_path,
+        cache_dir=str(cache_dir),
+        **params,
+    )
+
+
+def test_second_run_is_served_from_the_cache(synthetic_files, tmp_path):
+    first = _pipeline(synthetic_files, tmp_path)
+    merged = first.run("merge")
+    assert first.cache.hits == 0
+
+    second = _pipeline(synthetic_files, tmp_path)
+    cached = second.run("merge")
+
+    # The merge is served directly; its upstream stages are never evaluated
+    assert second.cache.hits == 1
+    assert set(second.results) == {"merge"}
+    pd.testing.assert_frame_equal(cached, merged)
+
+
+def test_parameter_change_invalidates_downstream_keys(synthetic_files, tmp_path):
+    first = _pipeline(synthetic_files, tmp_path, aggregation="first")
+    summed = _pipeline(synthetic_files, tmp_path, aggregation="sum")
+
+    changed = {
+        name
+        for name in Pipeline.UPSTREAM
+        if first.stage_key(name) != summed.stage_key(name)
+    }
+
+    assert changed == {"clean", "merge", "prepare"}
+    assert summed.run("merge")["Total Deaths"].sum() > first.run("merge")[
+        "Total Deaths"
+    ].sum()
+
+
+def test_source_change_invalidates_downstream_keys(synthetic_files, tmp_path):
+    cdc_path, population_path = synthetic_files
+    copy_path = tmp_path / "cdc.csv"
+    shutil.copy(cdc_path, copy_path)
+    original = _pipeline((str(copy_path), population_path), tmp_path)
+    keys = {name: original.stage_key(name) for name in Pipeline.UPSTREAM}
+
+    with open(cdc_path) as file:
+        file.readline()
+        first_row = file.readline()
+    with open(copy_path, "a") as file:
+        file.write(first_row)
+    edited = _pipeline((str(copy_path), population_path), tmp_path)
+
+    changed = {name for name in keys if edited.stage_key(name) != keys[name]}
+    assert changed == {"load", "clean", "merge", "prepare"}
+
+
+def test_invalid_stage_is_rejected(synthetic_files, tmp_path):
+    with pytest.raises(ValueError, match="Invalid stage"):
+        _pipeline(synthetic_files, tmp_path).run("trends")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = StageCache(str(tmp_path), max_bytes=1 << 20)
+    cache.put("a", b"x" * 400_000)
+    cache.put("b", b"x" * 400_000)
+    for age, key in enumerate(("b", "a"), start=1):
+        old = os.path.getmtime(cache._path(key)) - 100 * age
+        os.utime(cache._path(key), (old, old))
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get("a") is not None
+
+    cache.put("c", b"x" * 400_000)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+
+import mortality_analysis
+from mortality_analysis.population import (
+    BEA_URL,
+    PopulationProvider,
+    resolve_population_source,
+)
+
+
+def test_bundled_file_is_part_of_the_package():
+    source = resolve_population_source()
+
+    assert source != BEA_URL
+    package_dir = os.path.dirname(os.path.abspath(mortality_analysis.__file__))
+    assert os.path.commonpath([source, package_dir]) == package_dir
+    assert len(PopulationProvider(cache_dir=None).to_long_frame()) > 0
+
+
+
+def test_cached_array_round_trips(tmp_path):
+    first = PopulationProvider(cache_dir=str(tmp_path)).to_long_frame()
+    cached = PopulationProvider(cache_dir=str(tmp_path))
+
+    second = cached.to_long_frame()
+
+    # Only the finished array and metadata are left, no temp files
+    assert sorted(os.path.splitext(name)[1] for name in os.listdir(tmp_path)) == [
+        ".json",
+        ".npy",
+    ]
+    assert isinstance(cached.values, np.memmap)
+    assert first.equals(second)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from mortality_analysis.data_preparation import DataPreparation
+from mortality_analysis.jurisdiction_trainer import JurisdictionTrainer
+from mortality_analysis.predictive_model import DecisionTreeModel
+
+
+@pytest.fixture
+def prepared_data(merged_data):
+    return DataPreparation(
+        merged_data.copy(), "Total Deaths", period_column="Quarter"
+    ).prepare_data()
+
+
+@pytest.fixture
+def model(prepared_data):
+    model = DecisionTreeModel(prepared_data)
+    model.load_and_prepare_data()
+    model.split_data(time_column="Quarter")
+    return model
+
+
+def test_period_column_is_carried_through_but_not_a_feature(prepared_data, model):
+    assert prepared_data["Quarter"].iloc[0] == "2020Q1"
+    assert "Quarter" not in model.X.columns
+    train_periods = model.periods.loc[model.X_train.index]
+    test_periods = model.periods.loc[model.X_test.index]
+    assert train_periods.max() < test_periods.min()
+
+
+def test_time_series_folds_use_the_period_column(model):
+    folds = model.time_series_folds(n_splits=3, time_column="Quarter")
+    periods = model.periods.loc[model.X_train.index].to_numpy()
+    for train, validation in folds:
+        assert periods[train].max() < periods[validation].min()
+
+
+def test_resplitting_recomputes_the_folds(model):
+    model.split_data(random_state=0)
+    first = model.time_series_folds(n_splits=3, time_column="Quarter")
+
+    model.split_data(random_state=1)
+    second = model.time_series_folds(n_splits=3, time_column="Quarter")
+
+    assert not np.array_equal(first[0][0], second[0][0])
+    periods = model.periods.loc[model.X_train.index].to_numpy()
+    for train, validation in second:
+        assert periods[train].max() < periods[validation].min()
+
+
+def test_unknown_time_column_is_rejected(model):
+    with pytest.raises(ValueError, match="neither the period column nor a feature"):
+        model.split_data(time_column="Week")
+
+
+def test_tuning_refits_the_searched_candidate(model):
+    result = model.tune_decision_tree(
+        param_grid={"max_depth": [3, 6], "min_impurity_decrease": [0.0, 1.0]},
+        search="grid",
+        n_splits=3,
+        n_jobs=1,
+    )
+
+    params = model.tree_model.get_params()
+    assert {key: params[key] for key in result["best_params"]} == result[
+        "best_params"
+    ]
+    # The other parameters are the searched estimator's, not
+    # build_and_evaluate_decision_tree's defaults
+    assert params["min_samples_leaf"] == 1
+    assert params["max_features"] is None
+    assert model.mae is not None
+
+
+def test_jurisdiction_trainer_holds_out_latest_quarters(merged_data):
+    trainer = JurisdictionTrainer(
+        merged_data, time_column="Quarter", max_workers=1, min_rows=4
+    )
+
+    metrics = trainer.train()
+
+    assert "Quarter" not in trainer.feature_names
+    assert metrics["error"].isna().all()
+    assert np.all(metrics["test_rows"] > 0)
+
+
+def test_loaded_model_can_be_visualized(model, tmp_path):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    model.build_and_evaluate_decision_tree()
+    model.save_model(tmp_path / "model.joblib")
+    loaded = DecisionTreeModel.load_model(tmp_path / "model.joblib")
+
+    loaded.visualize_decision_tree(output_path=tmp_path / "tree.png")
+
+    assert (tmp_path / "tree.png").stat().st_size > 0
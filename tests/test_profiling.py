@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mortality_analysis import profiling
+from mortality_analysis.profiling import profile_frame
+
+
+@pytest.fixture
+def mixed_frame():
+    rng = np.random.default_rng(0)
+    rows = 5_000
+    data = pd.DataFrame(
+        {
+            "normal": rng.normal(100.0, 15.0, rows),
+            "counts": rng.poisson(4, rows),
+            "skewed": rng.lognormal(0.0, 2.0, rows),
+            "constant": np.full(rows, 7.0),
+            "gappy": rng.uniform(-1.0, 1.0, rows),
+            "label": rng.choice(["a", "b", None], rows),
+        }
+    )
+    data.loc[rng.random(rows) < 0.1, "gappy"] = np.nan
+    data["empty"] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("block", [profiling.HISTOGRAM_BLOCK, 1_000])
+def test_profile_matches_pandas_and_numpy(mixed_frame, monkeypatch, block):
+    monkeypatch.setattr(profiling, "HISTOGRAM_BLOCK", block)
+
+    profile = profile_frame(mixed_frame, bins=15)
+
+    pd.testing.assert_frame_equal(
+        profile.describe(), mixed_frame.describe(), check_dtype=False, rtol=1e-9
+    )
+    pd.testing.assert_series_equal(
+        profile.missing_values(), mixed_frame.isnull().sum(), check_dtype=False
+    )
+    pd.testing.assert_series_equal(profile.dtypes, mixed_frame.dtypes)
+    for column in ["normal", "counts", "skewed", "constant", "gappy"]:
+        values = mixed_frame[column].dropna().to_numpy(dtype=np.float64)
+        expected_counts, expected_edges = np.histogram(values, bins=15)
+        counts, edges = profile.histogram(column)
+        np.testing.assert_array_equal(counts, expected_counts)
+        np.testing.assert_allclose(edges, expected_edges, rtol=1e-12)
+
+
+def test_histogram_edges_count_values_like_numpy():
+    # Values sitting exactly on bin edges, where float rounding decides the bin
+    data = pd.DataFrame({"x": np.round(np.linspace(0.0, 1.0, 101), 2)})
+
+    counts, _ = profile_frame(data, bins=10).histogram("x")
+
+    np.testing.assert_array_equal(counts, np.histogram(data["x"], bins=10)[0])
+
+
+def test_empty_frame_profiles_to_empty_statistics():
+    data = pd.DataFrame({"x": pd.Series([], dtype=np.float64)})
+
+    profile = profile_frame(data)
+
+    assert profile.describe().loc["count", "x"] == 0
+    assert profile.missing_values()["x"] == 0
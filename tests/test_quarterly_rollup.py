@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mortality_analysis.data_cleaning import CAUSE_COLUMNS, CDCDataProcessor
+from mortality_analysis.load_data import Loaddata
+from mortality_analysis.quarterly_rollup import period_ordinals, rollup_quarters
+from mortality_analysis.synthetic import SyntheticDataset
+
+
+@pytest.fixture(scope="module")
+def weekly_data(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("weekly")
+    cdc_path, _ = SyntheticDataset(57 * 30, max_weeks=30).write(str(directory))
+    data = CDCDataProcessor.clean_frame(Loaddata(None).read_cdc_csv(cdc_path))
+    value_columns = [c for c in CAUSE_COLUMNS if c in data.columns]
+    rng = np.random.default_rng(0)
+    for column in value_columns[:3]:
+        data[column] = data[column].astype(np.float64)
+        data.loc[rng.random(len(data)) < 0.2, column] = np.nan
+    # One group with no values at all in a column
+    first_group = (data["Jurisdiction"] == data["Jurisdiction"].iloc[0]) & (
+        data["Quarter"] == data["Quarter"].iloc[0]
+    )
+    data.loc[first_group, value_columns[0]] = np.nan
+    return data, value_columns
+
+
+def _by_group(data):
+    data = data.assign(Jurisdiction=data["Jurisdiction"].astype(str))
+    return data.set_index(["Jurisdiction", "Quarter"]).sort_index()
+
+
+@pytest.mark.parametrize("how", ["sum", "mean"])
+def test_rollup_matches_groupby(weekly_data, how):
+    data, value_columns = weekly_data
+
+    rolled = rollup_quarters(data, how=how, value_columns=value_columns)
+
+    grouped = data.assign(Jurisdiction=data["Jurisdiction"].astype(str)).groupby(
+        ["Jurisdiction", "Quarter"]
+    )
+    expected = getattr(grouped[value_columns], how)()
+    actual = _by_group(rolled)
+    pd.testing.assert_frame_equal(
+        actual[value_columns], expected.astype(np.float64), check_names=False
+    )
+    # The other columns come from the latest week of each quarter
+    pd.testing.assert_series_equal(
+        actual["Ending Date"],
+        grouped["Ending Date"].max(),
+        check_names=False,
+    )
+
+
+def test_rollup_rows_are_ordered_by_jurisdiction_then_quarter(weekly_data):
+    data, value_columns = weekly_data
+
+    rolled = rollup_quarters(data, value_columns=value_columns)
+
+    first_seen = pd.Index(pd.unique(data["Jurisdiction"].astype(str)))
+    keys = np.lexsort(
+        (
+            period_ordinals(rolled["Quarter"]),
+            first_seen.get_indexer(rolled["Jurisdiction"].astype(str)),
+        )
+    )
+    np.testing.assert_array_equal(keys, np.arange(len(rolled)))
+
+
+def test_invalid_aggregation_raises(weekly_data):
+    data, _ = weekly_data
+
+    with pytest.raises(ValueError, match="Invalid aggregation"):
+        rollup_quarters(data, how="median")
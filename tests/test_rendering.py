@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from mortality_analysis.rendering import FigureRenderer, histogram_job
+
+
+def _jobs(names):
+    rng = np.random.default_rng(0)
+    return [histogram_job(name, rng.normal(size=100)) for name in names]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_manifest_follows_job_order(tmp_path, max_workers):
+    names = [f"figure {i}" for i in range(5)]
+
+    manifest = FigureRenderer(str(tmp_path), max_workers=max_workers).render(
+        _jobs(names)
+    )
+
+    assert [entry["name"] for entry in manifest] == names
+    paths = [path for entry in manifest for path in entry["paths"]]
+    assert len(set(paths)) == len(names)
+    assert all((tmp_path / path).stat().st_size > 0 for path in paths)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize("names", [["a", "b", "a"], ["a b", "a_b"]])
+def test_colliding_names_are_rejected(tmp_path, max_workers, names):
+    renderer = FigureRenderer(str(tmp_path / "figures"), max_workers=max_workers)
+
+    with pytest.raises(ValueError, match="same file"):
+        renderer.render(_jobs(names))
+
+    assert not (tmp_path / "figures").exists()
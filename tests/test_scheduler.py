@@ -0,0 +1,61 @@
+import matplotlib
+import matplotlib.pyplot as plt
+
+from mortality_analysis.scheduler import AnalysisScheduler
+
+
+def plot_rows(data):
+    plt.figure()
+    plt.plot(data["Total Deaths"].to_numpy())
+    plt.show()
+    return matplotlib.get_backend().lower()
+
+
+def count_rows(data):
+    data["Extra"] = 1
+    return len(data)
+
+
+def fail(data):
+    raise ValueError("bad analysis")
+
+
+ANALYSES = {"plot": plot_rows, "count": count_rows, "fail": fail}
+
+
+def test_serial_run_keeps_the_callers_figures(merged_data):
+    figure = plt.figure()
+    try:
+        results = AnalysisScheduler(merged_data, max_workers=1).run(ANALYSES)
+
+        assert plt.get_fignums() == [figure.number]
+    finally:
+        plt.close(figure)
+    assert results["count"]["result"] == len(merged_data)
+    assert "Extra" not in merged_data.columns
+    assert results["fail"] == {
+        "result": None,
+        "error": "ValueError('bad analysis')",
+        "seconds": results["fail"]["seconds"],
+    }
+
+
+def test_serial_run_renders_off_screen(merged_data):
+    backend = matplotlib.get_backend()
+
+    results = AnalysisScheduler(merged_data, max_workers=1).run({"plot": plot_rows})
+
+    assert results["plot"]["result"] == "agg"
+    assert plt.get_fignums() == []
+    assert matplotlib.get_backend() == backend
+
+
+def test_worker_run_matches_serial_run(merged_data):
+    analyses = {"count": count_rows, "fail": fail}
+
+    parallel = AnalysisScheduler(merged_data, max_workers=2).run(analyses)
+    serial = AnalysisScheduler(merged_data, max_workers=1).run(analyses)
+
+    for name in analyses:
+        assert parallel[name]["result"] == serial[name]["result"]
+        assert parallel[name]["error"] == serial[name]["error"]
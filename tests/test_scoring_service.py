@@ -0,0 +1,128 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from mortality_analysis.scoring_service import MicroBatcher, ScoringServer
+
+
+class _SumModel:
+    # Scores each row as the sum of its features and records every call
+    feature_names = ["a", "b"]
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def predict(self, frame):
+        self.calls.append(len(frame))
+        if self.error is not None:
+            raise self.error
+        return frame[self.feature_names].sum(axis=1)
+
+
+def _post(url, body):
+    request = urllib.request.Request(
+        f"{url}/predict", data=body, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+@pytest.fixture
+def server():
+    server = ScoringServer(_SumModel(), port=0).start()
+    yield server
+    server.shutdown()
+
+
+def test_concurrent_requests_are_scored_in_one_batch():
+    model = _SumModel()
+    batcher = MicroBatcher(model.predict, max_batch_rows=3, max_wait=10)
+    frames = [pd.DataFrame({"a": [i], "b": [10 * i]}) for i in range(3)]
+
+    futures = [batcher.submit(frame) for frame in frames]
+    results = [future.result(timeout=10) for future in futures]
+    batcher.close()
+
+    assert results == [[0.0], [11.0], [22.0]]
+    assert batcher.batches == 1
+    assert model.calls == [3]
+
+
+def test_batcher_forwards_model_errors_to_every_request():
+    batcher = MicroBatcher(_SumModel(error=RuntimeError("boom")).predict, max_wait=0)
+
+    future = batcher.submit(pd.DataFrame({"a": [1], "b": [2]}))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        future.result(timeout=10)
+    batcher.close()
+
+
+def test_concurrent_http_requests_keep_row_order(server):
+    results = {}
+
+    def post(i):
+        rows = [{"a": i, "b": j} for j in range(3)]
+        results[i] = _post(server.url, json.dumps({"rows": rows}).encode())
+
+    threads = [threading.Thread(target=post, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i, (status, payload) in results.items():
+        assert status == 200
+        assert payload["predictions"] == [float(i + j) for j in range(3)]
+    assert sum(server.model.calls) == 24
+
+
+def test_health_lists_the_features(server):
+    with urllib.request.urlopen(f"{server.url}/health", timeout=10) as response:
+        assert json.load(response) == {"status": "ok", "features": ["a", "b"]}
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        (b"{not json", "Expecting property name"),
+        (b'{"data": []}', "rows"),
+        (b'{"rows": [{"a": 1}]}', "Missing feature columns"),
+    ],
+)
+def test_bad_requests_are_rejected(server, body, message):
+    status, payload = _post(server.url, body)
+
+    assert status == 400
+    assert message in payload["error"]
+    assert server.model.calls == []
+
+
+def test_model_errors_are_server_errors():
+    server = ScoringServer(_SumModel(error=ValueError("bad model")), port=0).start()
+    try:
+        status, payload = _post(server.url, b'{"rows": [{"a": 1, "b": 2}]}')
+    finally:
+        server.shutdown()
+
+    assert status == 500
+    assert payload == {"error": "bad model"}
+
+
+def test_shutdown_releases_the_port_and_the_batcher():
+    server = ScoringServer(_SumModel(), port=0).start()
+    url = server.url
+
+    server.shutdown()
+
+    assert not server.batcher._worker.is_alive()
+    with pytest.raises(urllib.error.URLError):
+        urllib.request.urlopen(f"{url}/health", timeout=2)
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mortality_analysis.streaming_stats import (
+    KLLSketch,
+    StreamingSummary,
+    kll_rank_error,
+    summarize_chunks,
+)
+
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def _true_ranks(values, estimates):
+    # Fraction of values at or below each estimate
+    return np.searchsorted(np.sort(values), estimates, side="right") / len(values)
+
+
+@pytest.fixture(scope="module")
+def values():
+    rng = np.random.default_rng(0)
+    return np.concatenate([rng.lognormal(size=150_000), rng.normal(size=50_000)])
+
+
+def test_sketch_rank_error_is_within_bound(values):
+    sketch = KLLSketch(k=200, seed=0).update(values)
+
+    ranks = _true_ranks(values, sketch.quantiles(QUANTILES))
+
+    assert not sketch.is_exact
+    assert sketch.rank_error() == kll_rank_error(200)
+    assert np.abs(ranks - QUANTILES).max() <= kll_rank_error(200)
+    # Memory stays around 3·k items
+    assert sum(len(level) for level in sketch.levels) <= 3 * 200
+
+
+def test_merged_sketches_keep_the_rank_error(values):
+    parts = np.array_split(values, 7)
+    sketch = KLLSketch(k=200, seed=0).update(parts[0])
+    for seed, part in enumerate(parts[1:], start=1):
+        sketch.merge(KLLSketch(k=200, seed=seed).update(part))
+
+    ranks = _true_ranks(values, sketch.quantiles(QUANTILES))
+
+    assert sketch.n == len(values)
+    assert np.abs(ranks - QUANTILES).max() <= kll_rank_error(200)
+
+
+def test_small_sketch_is_exact():
+    values = np.array([3.0, np.nan, 1.0, 2.0, 10.0])
+
+    sketch = KLLSketch(k=200).update(values)
+
+    assert sketch.is_exact and sketch.rank_error() == 0.0
+    np.testing.assert_array_equal(
+        sketch.quantiles([0.25, 0.5, 0.9]),
+        pd.Series(values).quantile([0.25, 0.5, 0.9]).to_numpy(),
+    )
+
+
+def _chunks(rows=20_000, chunk_rows=1_500, seed=1):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(
+        {
+            "small": rng.normal(size=rows),
+            "offset": 1e9 + rng.normal(size=rows),
+            "sparse": rng.exponential(size=rows),
+        }
+    )
+    data = data.mask(rng.random(data.shape) < 0.2)
+    data.loc[: chunk_rows * 2, "sparse"] = np.nan
+    data["name"] = "x"
+    return data, [data.iloc[i : i + chunk_rows] for i in range(0, rows, chunk_rows)]
+
+
+def test_moments_match_numpy_over_chunks():
+    data, chunks = _chunks()
+
+    summary = summarize_chunks(chunks, seed=0)
+
+    values = data[summary.columns].to_numpy()
+    stats = summary.describe()
+    assert summary.columns == ["small", "offset", "sparse"]
+    np.testing.assert_array_equal(stats.loc["count"], (~np.isnan(values)).sum(axis=0))
+    np.testing.assert_allclose(
+        stats.loc["mean"], np.nanmean(values, axis=0), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        stats.loc["std"], np.nanstd(values, axis=0, ddof=1), rtol=1e-9
+    )
+    np.testing.assert_array_equal(stats.loc["min"], np.nanmin(values, axis=0))
+    np.testing.assert_array_equal(stats.loc["max"], np.nanmax(values, axis=0))
+
+
+def test_merged_summaries_match_one_pass():
+    data, chunks = _chunks()
+    halves = [chunks[: len(chunks) // 2], chunks[len(chunks) // 2 :]]
+
+    merged = summarize_chunks(halves[0], seed=0).merge(
+        summarize_chunks(halves[1], seed=1)
+    )
+
+    single = summarize_chunks(chunks, seed=0).describe()
+    stats = merged.describe()
+    assert merged.n_rows == len(data)
+    for row in ("count", "mean", "std", "min", "max"):
+        np.testing.assert_allclose(stats.loc[row], single.loc[row], rtol=1e-9)
+
+
+def test_exact_summary_matches_describe():
+    data, chunks = _chunks(rows=150, chunk_rows=40)
+
+    stats = summarize_chunks(chunks).describe()
+
+    expected = data.describe()
+    pd.testing.assert_frame_equal(stats, expected, rtol=1e-9)
+
+
+def test_merging_different_columns_is_rejected():
+    left = StreamingSummary(["a"]).update(pd.DataFrame({"a": [1.0]}))
+    right = StreamingSummary(["b"]).update(pd.DataFrame({"b": [1.0]}))
+
+    with pytest.raises(ValueError, match="same columns"):
+        left.merge(right)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from mortality_analysis.tree_scorer import ArrayTreeScorer, export_tree
+
+FEATURES = ["a", "b", "c"]
+
+
+@pytest.fixture
+def fitted(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, len(FEATURES))) * [1.0, 1e3, 1e-3]
+    y = X[:, 0] + X[:, 1] / 1e3 + np.sin(X[:, 2] * 1e3) + rng.normal(size=len(X))
+    # Missing values in training give every split a learned NaN branch
+    X[rng.random(X.shape) < 0.1] = np.nan
+    tree = DecisionTreeRegressor(max_depth=12, random_state=0).fit(X, y)
+    export_tree(tree, FEATURES, tmp_path)
+    return tree, ArrayTreeScorer(str(tmp_path))
+
+
+def _threshold_rows(tree):
+    # One row per split whose feature sits exactly on, just below and just above the
+    # threshold in float32, the precision sklearn compares in
+    # Splits that only separate missing values have an infinite threshold
+    internal = (tree.tree_.children_left != -1) & np.isfinite(tree.tree_.threshold)
+    features = tree.tree_.feature[internal]
+    thresholds = tree.tree_.threshold[internal]
+    on = thresholds.astype(np.float32)
+    rows = []
+    for values in (
+        on,
+        np.nextafter(on, np.float32(-np.inf)),
+        np.nextafter(on, np.float32(np.inf)),
+        thresholds,
+        np.nextafter(thresholds, np.inf),
+    ):
+        X = np.zeros((len(values), len(FEATURES)))
+        X[np.arange(len(values)), features] = values
+        rows.append(X)
+    return np.vstack(rows)
+
+
+def test_predictions_match_sklearn(fitted):
+    tree, scorer = fitted
+    X = np.random.default_rng(1).normal(size=(5000, len(FEATURES))) * [1, 1e3, 1e-3]
+
+    np.testing.assert_array_equal(scorer.predict(X), tree.predict(X))
+
+
+def test_missing_values_follow_the_learned_branch(fitted):
+    tree, scorer = fitted
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(5000, len(FEATURES))) * [1, 1e3, 1e-3]
+    X[rng.random(X.shape) < 0.3] = np.nan
+    X[:10] = np.nan
+
+    np.testing.assert_array_equal(scorer.predict(X), tree.predict(X))
+
+
+def test_values_at_float32_thresholds_match_sklearn(fitted):
+    tree, scorer = fitted
+    X = _threshold_rows(tree)
+
+    np.testing.assert_array_equal(scorer.predict(X), tree.predict(X))
+
+
+def test_frames_are_scored_by_feature_name(fitted):
+    tree, scorer = fitted
+    X = _threshold_rows(tree)
+    frame = pd.DataFrame(X, columns=FEATURES)[["c", "a", "b"]]
+    frame.loc[::7, "b"] = None
+
+    expected = tree.predict(frame[FEATURES].to_numpy(dtype=np.float64))
+    np.testing.assert_array_equal(scorer.predict(frame), expected)